@@ -0,0 +1,272 @@
+# -*- coding: utf-8 -*-
+
+"""
+Density binning of positions on latitude / longitude grids, for heatmaps.
+
+Two grids are available:
+    LatLonGrid -- rows of equal latitude height (cells shrink towards the poles),
+    EqualAreaGrid -- rows of equal height in sin(latitude), so that all cells have the same area on the sphere
+                     (the grid of the Lambert cylindrical equal-area projection).
+
+Cells are numbered row by row from the south-west corner: index = row * cols + col. Positions are binned
+in a single loop over the coordinates arrays, and DensityGrid accumulators can be fed chunk by chunk and
+merged, eg from parallel workers.
+"""
+
+from array import array
+from math import radians, degrees, sin, asin, fabs
+
+from geodesy.latlon_spherical import EARTH_RADIUS
+from geodesy.latlon_batch import _check_lengths
+
+
+class LatLonGrid(object):
+    """
+    Regular grid of rows x cols cells over a latitude / longitude extent.
+
+    Example:
+        > grid = LatLonGrid(180, 360)       # 1° cells over the whole earth
+        > grid.cellIndex(48.857, 2.351)     # 138 * 360 + 182
+    """
+
+    # whether rows are equally spaced in sin(latitude) rather than in latitude
+    _equal_area = False
+
+    def __init__(self, rows, cols, south=-90, west=-180, north=90, east=180):
+        """
+        Arguments:
+            rows -- {int} -- Number of rows (latitude divisions).
+            cols -- {int} -- Number of columns (longitude divisions).
+            south, west, north, east -- {float} -- Extent of the grid in degrees (default: whole earth).
+                                                   east may exceed 180 for grids across the anti-meridian.
+        """
+
+        if rows < 1 or cols < 1:
+            raise ValueError('rows and cols must be positive')
+        if not -90 <= south < north <= 90:
+            raise ValueError('invalid latitude extent')
+        if not west < east <= west + 360:
+            raise ValueError('invalid longitude extent')
+        self.rows = int(rows)
+        self.cols = int(cols)
+        self.south = float(south)
+        self.west = float(west)
+        self.north = float(north)
+        self.east = float(east)
+
+    def __eq__(self, other):
+        return type(self) is type(other) and \
+            (self.rows, self.cols, self.south, self.west, self.north, self.east) == \
+            (other.rows, other.cols, other.south, other.west, other.north, other.east)
+
+    def __len__(self):
+        return self.rows * self.cols
+
+    # latitude of a row boundary, from its position (0 to 1) between south and north
+    def _rowLatitude(self, position):
+        return self.south + position * (self.north - self.south)
+
+    def cellIndex(self, lat, lon):
+        """
+        Return the index of the cell containing a position.
+
+        Arguments:
+            lat -- {float} -- Latitude in degrees.
+            lon -- {float} -- Longitude in degrees.
+        Return:
+            {int | None} -- Cell index (row * cols + col), or None if the position is outside the grid.
+        """
+
+        index = self.indices((lat,), (lon,))[0]
+        return None if index < 0 else index
+
+    def indices(self, lats, lons):
+        """
+        Return the cell index of each position (-1 for positions outside the grid).
+
+        Arguments:
+            lats -- {sequence} -- Latitudes in degrees.
+            lons -- {sequence} -- Longitudes in degrees.
+        Return:
+            {array} -- Cell indices.
+        """
+
+        n = _check_lengths(lats, lons)
+        rows, cols = self.rows, self.cols
+        south, north, west = self.south, self.north, self.west
+        span = self.east - west
+        col_scale = cols / span
+        equal_area = self._equal_area
+        # rows are equally spaced in y = latitude, or y = sin(latitude)
+        if equal_area:
+            y_south = sin(radians(south))
+            row_scale = rows / (sin(radians(north)) - y_south)
+        else:
+            y_south = south
+            row_scale = rows / (north - south)
+        result = array('q', bytes(8 * n))
+        for k in range(n):
+            lat = lats[k]
+            x = (lons[k] - west) % 360
+            if not south <= lat <= north or x > span:
+                result[k] = -1
+                continue
+            y = sin(radians(lat)) if equal_area else lat
+            row = min(int((y - y_south) * row_scale), rows - 1)
+            result[k] = row * cols + min(int(x * col_scale), cols - 1)
+        return result
+
+    def cellBounds(self, index):
+        """
+        Return the extent of a cell.
+
+        Return:
+            {tuple} -- (south, west, north, east) in degrees.
+        """
+
+        if not 0 <= index < len(self):
+            raise IndexError('cell index out of range')
+        row, col = divmod(index, self.cols)
+        width = (self.east - self.west) / self.cols
+        return self._rowLatitude(row / self.rows), self.west + col * width, \
+            self._rowLatitude((row + 1) / self.rows), self.west + (col + 1) * width
+
+    def cellArea(self, index, radius=None):
+        """
+        Return the area of a cell on the sphere: R² ⋅ Δλ ⋅ (sin φn − sin φs).
+
+        Arguments:
+            index -- {int} -- Cell index.
+            radius -- {int | float} -- (Mean) radius of earth (defaults to EARTH_RADIUS in kilometres).
+        Return:
+            {float} -- Area, in square units of radius.
+        """
+
+        if radius is None:
+            radius = EARTH_RADIUS
+        else:
+            radius = float(radius)
+
+        south, west, north, east = self.cellBounds(index)
+        return radius * radius * radians(east - west) * fabs(sin(radians(north)) - sin(radians(south)))
+
+
+class EqualAreaGrid(LatLonGrid):
+    """
+    Grid of rows x cols cells of equal area: rows are equally spaced in sin(latitude).
+
+    Example:
+        > grid = EqualAreaGrid(1000, 2000)
+        > grid.cellArea(0)      # 255.0 km², for every cell
+    """
+
+    _equal_area = True
+
+    def __init__(self, rows, cols, south=-90, west=-180, north=90, east=180):
+        LatLonGrid.__init__(self, rows, cols, south, west, north, east)
+        self._sin_south = sin(radians(self.south))
+        self._sin_north = sin(radians(self.north))
+
+    def _rowLatitude(self, position):
+        return degrees(asin(min(1.0, max(-1.0, self._sin_south + position * (self._sin_north - self._sin_south)))))
+
+
+class DensityGrid(object):
+    """
+    Accumulator of position counts and weights over the cells of a grid.
+
+    Attributes:
+        grid -- {LatLonGrid} -- Grid of the accumulator.
+        counts -- {array} -- Number of positions per cell.
+        weights -- {array} -- Sum of the weights of the positions per cell.
+        outside -- {int} -- Number of positions outside the grid.
+
+    Example:
+        > density = DensityGrid(EqualAreaGrid(1000, 2000))
+        > for batch in nmea.iterParse(stream):
+        >     density.add(batch.lats, batch.lons)
+    """
+
+    def __init__(self, grid):
+        if not isinstance(grid, LatLonGrid):
+            raise TypeError('grid is not LatLonGrid object')
+        self.grid = grid
+        self.counts = array('q', bytes(8 * len(grid)))
+        self.weights = array('d', bytes(8 * len(grid)))
+        self.outside = 0
+
+    def add(self, lats, lons, weights=None):
+        """
+        Bin positions.
+
+        Arguments:
+            lats -- {sequence} -- Latitudes in degrees.
+            lons -- {sequence} -- Longitudes in degrees.
+            weights -- {sequence} -- Weight of each position (default: 1).
+        Return:
+            {int} -- Number of positions binned (positions outside the grid are only counted in 'outside').
+        """
+
+        indices = self.grid.indices(lats, lons)
+        if weights is not None and len(weights) != len(indices):
+            raise ValueError('weights and coordinate sequences must have the same length')
+        counts = self.counts
+        sums = self.weights
+        binned = 0
+        if weights is None:
+            for index in indices:
+                if index >= 0:
+                    counts[index] += 1
+                    sums[index] += 1.0
+                    binned += 1
+        else:
+            for index, weight in zip(indices, weights):
+                if index >= 0:
+                    counts[index] += 1
+                    sums[index] += weight
+                    binned += 1
+        self.outside += len(indices) - binned
+        return binned
+
+    def merge(self, other):
+        """
+        Add the counts and weights of another accumulator over the same grid.
+
+        Arguments:
+            other -- {DensityGrid} -- Accumulator to merge.
+        Return:
+            {DensityGrid} -- 'self', updated.
+        """
+
+        if not isinstance(other, DensityGrid):
+            raise TypeError('other is not DensityGrid object')
+        if other.grid != self.grid:
+            raise ValueError('density grids use different grids')
+        counts = self.counts
+        sums = self.weights
+        for index, count in enumerate(other.counts):
+            if count:
+                counts[index] += count
+                sums[index] += other.weights[index]
+        self.outside += other.outside
+        return self
+
+    def densities(self, radius=None):
+        """
+        Return the number of positions per unit of area of each cell.
+
+        Arguments:
+            radius -- {int | float} -- (Mean) radius of earth (defaults to EARTH_RADIUS in kilometres).
+        Return:
+            {array} -- Densities, in positions per square unit of radius.
+        """
+
+        grid = self.grid
+        result = array('d', bytes(8 * len(grid)))
+        # cells of a row have the same area
+        for row in range(grid.rows):
+            area = grid.cellArea(row * grid.cols, radius)
+            for index in range(row * grid.cols, (row + 1) * grid.cols):
+                if self.counts[index]:
+                    result[index] = self.counts[index] / area
+        return result
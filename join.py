@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+
+"""
+Distance join: all pairs of points, taken from two coordinate sets, within a given distance of each other.
+
+The second set is indexed in a grid of latitude bands of height δ (the angular distance), each band being
+split in longitude cells at least δ wide at the band's highest latitude. For each point of the first set,
+only the cells of the neighbouring bands within its longitude reach
+    Δλ = asin( sin δ / cos φ )
+are visited, wrapping across the anti-meridian (all cells are visited around the poles). Candidates are
+tested in haversine space, and the distance only computed for matches.
+
+The index of the second set is held in flat arrays (compressed rows: point numbers sorted by cell, plus
+the sorted cell keys and their start offsets, cells being found by binary search), about 56 bytes per
+point at most; building it temporarily takes about 50 more bytes per point. The first set is streamed,
+and results are held one chunk at a time.
+"""
+
+from array import array
+from bisect import bisect_left, bisect_right
+from math import radians, degrees, sin, cos, asin, atan2, sqrt, floor, pi
+
+from geodesy.latlon_spherical import EARTH_RADIUS
+from geodesy.latlon_batch import FLOAT64, _check_typecode, _check_lengths
+
+# margin, in degrees, against rounding of cell boundaries
+_CELL_MARGIN = 1e-9
+# minimum band height in degrees, about 10 cm
+_MIN_BAND_HEIGHT = 1e-6
+
+
+def distanceJoin(lats1, lons1, lats2, lons2, distance, radius=None, chunk_size=65536, typecode=FLOAT64):
+    """
+    Return all pairs (i, j) such that point i of the first set and point j of the second set are within
+    'distance' of each other (as LatLon.distanceTo), streamed as chunks of parallel arrays.
+
+    Index the smaller set as the second one: it is held in memory, while the first set is only iterated.
+
+    Arguments:
+        lats1, lons1 -- {sequence} -- Latitudes/longitudes of the first set in degrees.
+        lats2, lons2 -- {sequence} -- Latitudes/longitudes of the second set in degrees.
+        distance -- {int | float} -- Maximum distance, in same units as radius.
+        radius -- {int | float} -- (Mean) radius of earth (defaults to EARTH_RADIUS in kilometres).
+        chunk_size -- {int} -- Maximum number of pairs per chunk (default: 65536).
+        typecode -- {string} -- Storage type of the distances, FLOAT64 ('d') or FLOAT32 ('f').
+    Return:
+        {generator} -- (i, j, distances) tuples of arrays, i being in increasing order.
+
+    Example:
+        > for i, j, d in distanceJoin(ping_lats, ping_lons, store_lats, store_lons, 0.5):
+        >     ...
+    """
+
+    _check_typecode(typecode)
+    _check_lengths(lats1, lons1)
+    _check_lengths(lats2, lons2)
+
+    if radius is None:
+        radius = EARTH_RADIUS
+    else:
+        radius = float(radius)
+    if distance < 0:
+        raise ValueError('distance must not be negative')
+    if chunk_size < 1:
+        raise ValueError('chunk_size must be positive')
+
+    return _join(lats1, lons1, lats2, lons2, distance / radius, radius, chunk_size, typecode)
+
+
+def _join(lats1, lons1, lats2, lons2, delta, radius, chunk_size, typecode):
+    delta = min(delta, pi)
+    delta_deg = degrees(delta)
+    a_max = sin(delta/2) * sin(delta/2)
+    height = max(delta_deg, _MIN_BAND_HEIGHT)
+    band_count = max(1, int(180 // height))
+    height = 180.0 / band_count
+
+    # number of longitude cells of each band: cells are at least δ wide at the band's highest latitude
+    width = max(delta_deg, _MIN_BAND_HEIGHT)
+    key_base = max(1, int(360 / width))
+    n = len(lats2)
+
+    def cell_count_of(band):
+        cos_lat = cos(radians(max(abs(-90 + band * height), abs(-90 + (band + 1) * height))))
+        if cos_lat <= 0 or delta_deg >= 180:
+            return 1
+        return max(1, min(int(360 * cos_lat / width), key_base))
+
+    # stored when bands are not more numerous than points (memory stays bounded by the index size)
+    if band_count <= max(n, 1024):
+        cell_count_of = array('q', map(cell_count_of, range(band_count))).__getitem__
+
+    # index of the second set, in compressed rows: point numbers sorted by cell key, the points of cell
+    # cell_keys[c] being members[starts[c]:starts[c+1]], with their coordinates stored in the same order
+    keys = array('q', bytes(8 * n))
+    for j in range(n):
+        band = min(int((lats2[j] + 90) / height), band_count - 1)
+        cell_count = cell_count_of(band)
+        cell = min(int((lons2[j] + 180) % 360 * cell_count / 360), cell_count - 1)
+        keys[j] = band * key_base + cell
+    members = array('q', sorted(range(n), key=keys.__getitem__))
+    cell_keys = array('q')
+    starts = array('q')
+    lat_rad = array('d', bytes(8 * n))
+    lon_rad = array('d', bytes(8 * n))
+    cos_lat = array('d', bytes(8 * n))
+    for p in range(n):
+        j = members[p]
+        if not cell_keys or keys[j] != cell_keys[-1]:
+            cell_keys.append(keys[j])
+            starts.append(p)
+        lat_rad[p] = phi = radians(lats2[j])
+        lon_rad[p] = radians((lons2[j] + 180) % 360)
+        cos_lat[p] = cos(phi)
+    starts.append(n)
+    del keys
+
+    chunk_i = array('q')
+    chunk_j = array('q')
+    chunk_d = array(typecode)
+    for i in range(len(lats1)):
+        lat = lats1[i]
+        lon = (lons1[i] + 180) % 360
+        phi = radians(lat)
+        lam = radians(lon)
+        cos_phi = cos(phi)
+
+        # longitude reach of the spherical cap of radius δ
+        if abs(phi) + delta >= pi/2 - 1e-12:
+            reach = 360.0
+        else:
+            reach = degrees(asin(min(1.0, sin(delta) / cos_phi))) + _CELL_MARGIN
+        band_start = max(0, int((lat - delta_deg - _CELL_MARGIN + 90) / height))
+        band_end = min(band_count - 1, int((lat + delta_deg + _CELL_MARGIN + 90) / height))
+
+        for band in range(band_start, band_end + 1):
+            cell_count = cell_count_of(band)
+            cell_start = int(floor((lon - reach) * cell_count / 360))
+            cell_end = int(floor((lon + reach) * cell_count / 360))
+            # cells of a band are consecutive in the index: visit the points of one or two (across the
+            # anti-meridian) cell intervals
+            if cell_end - cell_start + 1 >= cell_count:
+                intervals = ((0, cell_count - 1),)
+            elif cell_start % cell_count <= cell_end % cell_count:
+                intervals = ((cell_start % cell_count, cell_end % cell_count),)
+            else:
+                intervals = ((cell_start % cell_count, cell_count - 1), (0, cell_end % cell_count))
+            for first, last in intervals:
+                c1 = bisect_left(cell_keys, band * key_base + first)
+                c2 = bisect_right(cell_keys, band * key_base + last, c1)
+                for p in range(starts[c1], starts[c2]):
+                    sin_delta_lat = sin((lat_rad[p] - phi)/2)
+                    sin_delta_lon = sin((lon_rad[p] - lam)/2)
+                    a = sin_delta_lat * sin_delta_lat + cos_phi * cos_lat[p] * sin_delta_lon * sin_delta_lon
+                    if a <= a_max:
+                        chunk_i.append(i)
+                        chunk_j.append(members[p])
+                        chunk_d.append(radius * 2 * atan2(sqrt(a), sqrt(1-a)))
+                        if len(chunk_i) >= chunk_size:
+                            yield chunk_i, chunk_j, chunk_d
+                            chunk_i = array('q')
+                            chunk_j = array('q')
+                            chunk_d = array(typecode)
+
+    if chunk_i:
+        yield chunk_i, chunk_j, chunk_d
@@ -0,0 +1,257 @@
+# -*- coding: utf-8 -*-
+
+"""
+Compact collection of points, backed by a single array.array of interleaved (lat, lon) values,
+for deployments where NumPy is not available.
+
+A point takes 16 bytes (8 bytes as float32) instead of the 150+ bytes of a LatLon object.
+The interleaved layout is the one of serialization.pack: on little-endian machines, the raw buffer
+can be written or sent as is.
+"""
+
+from array import array
+from math import radians, sin, cos, asin, atan2, sqrt, pi, fabs
+
+from geodesy.latlon_spherical import LatLon, EARTH_RADIUS
+from geodesy.latlon_batch import FLOAT64, _check_typecode, _check_lengths
+
+
+class LatLonArray(object):
+    """
+    Sequence of points stored as interleaved latitudes / longitudes in degrees.
+
+    Indexing returns (lat, lon) tuples, slicing returns a new LatLonArray, and iteration yields
+    (lat, lon) tuples, without creating LatLon objects. lats and lons are exposed as strided
+    memoryviews, usable with the latlon_batch functions without copy.
+
+    While a memoryview on the collection (lats, lons, memoryview(), or any view derived from them)
+    is alive, the collection cannot be resized: append and extend raise BufferError. Release views
+    (del, memoryview.release, or a with block) before adding points.
+
+    Example:
+        > points = LatLonArray([52.205, 48.857], [0.119, 2.351])
+        > points.append(45.764, 4.836)
+        > points.pathLength()     # 404.3 + 391.6 (kms)
+    """
+
+    def __init__(self, lats=(), lons=(), typecode=FLOAT64):
+        """
+        Arguments:
+            lats -- {sequence} -- Latitudes in degrees.
+            lons -- {sequence} -- Longitudes in degrees.
+            typecode -- {string} -- Storage type, FLOAT64 ('d') or FLOAT32 ('f') (default: FLOAT64).
+        """
+
+        _check_typecode(typecode)
+        self._data = array(typecode)
+        self.extend(lats, lons)
+
+    @classmethod
+    def fromLatLons(cls, points, typecode=FLOAT64):
+        """
+        Return a LatLonArray holding the coordinates of LatLon points.
+        """
+
+        collection = cls(typecode=typecode)
+        for point in points:
+            if not isinstance(point, LatLon):
+                raise TypeError('point is not LatLon object')
+            collection._data.append(point.lat)
+            collection._data.append(point.lon)
+        return collection
+
+    @classmethod
+    def fromBuffer(cls, buffer, typecode=FLOAT64):
+        """
+        Return a LatLonArray holding a copy of interleaved (lat, lon) values in native byte order
+        (as given by memoryview or tobytes).
+        """
+
+        collection = cls(typecode=typecode)
+        collection._data.frombytes(memoryview(buffer).cast('B'))
+        if len(collection._data) % 2:
+            raise ValueError('buffer holds an odd number of values')
+        return collection
+
+    @property
+    def typecode(self):
+        return self._data.typecode
+
+    @property
+    def lats(self):
+        """
+        Latitudes in degrees, as a (read-write) strided memoryview on the collection.
+        The collection cannot be resized while the view is alive.
+        """
+
+        return memoryview(self._data)[0::2]
+
+    @property
+    def lons(self):
+        """
+        Longitudes in degrees, as a (read-write) strided memoryview on the collection.
+        The collection cannot be resized while the view is alive.
+        """
+
+        return memoryview(self._data)[1::2]
+
+    def append(self, lat, lon):
+        self._data.append(lat)
+        self._data.append(lon)
+
+    def extend(self, lats, lons):
+        """
+        Append points from latitudes and longitudes sequences.
+        """
+
+        n = _check_lengths(lats, lons)
+        data = self._data
+        start = len(data)
+        data.extend(array(data.typecode, bytes(2 * n * data.itemsize)))
+        data[start::2] = array(data.typecode, lats)
+        data[start+1::2] = array(data.typecode, lons)
+
+    def __len__(self):
+        return len(self._data) // 2
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            collection = LatLonArray(typecode=self.typecode)
+            if step == 1:
+                collection._data = self._data[2*start:2*stop]
+            else:
+                indices = range(start, stop, step)
+                collection.extend([self._data[2*i] for i in indices], [self._data[2*i+1] for i in indices])
+            return collection
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('LatLonArray index out of range')
+        return self._data[2*index], self._data[2*index+1]
+
+    def __iter__(self):
+        data = self._data
+        return zip(data[0::2], data[1::2])
+
+    def __eq__(self, other):
+        return isinstance(other, LatLonArray) and self._data == other._data
+
+    def __buffer__(self, flags):
+        # buffer protocol for Python classes (Python 3.12+); use memoryview() on older versions
+        return memoryview(self._data)
+
+    def memoryview(self):
+        """
+        Return a memoryview on the interleaved (lat, lon) values.
+        The collection cannot be resized while the view is alive.
+        """
+
+        return memoryview(self._data)
+
+    def tobytes(self):
+        return self._data.tobytes()
+
+    def latLon(self, index):
+        """
+        Return the point at given index as a LatLon object.
+        """
+
+        lat, lon = self[index]
+        return LatLon(lat, lon)
+
+    def toLatLons(self):
+        return [LatLon(lat, lon) for lat, lon in self]
+
+    def pathLength(self, radius=None):
+        """
+        Return the distance along the sequence of points (sum of LatLon.distanceTo between consecutive
+        points), each point being converted to radians and its latitude cosine computed once.
+
+        Arguments:
+            radius -- {int | float} -- (Mean) radius of earth (defaults to EARTH_RADIUS in kilometres).
+        Return:
+            {float} -- Length, in same units as radius.
+        """
+
+        if radius is None:
+            radius = EARTH_RADIUS
+        else:
+            radius = float(radius)
+
+        data = self._data
+        if len(data) < 4:
+            return 0.0
+        total = 0.0
+        lat2 = radians(data[0])
+        lon2 = radians(data[1])
+        cos_lat2 = cos(lat2)
+        for i in range(2, len(data), 2):
+            lat1, lon1, cos_lat1 = lat2, lon2, cos_lat2
+            lat2 = radians(data[i])
+            lon2 = radians(data[i+1])
+            cos_lat2 = cos(lat2)
+            sin_delta_lat = sin((lat2 - lat1)/2)
+            sin_delta_lon = sin((lon2 - lon1)/2)
+            a = sin_delta_lat * sin_delta_lat + cos_lat1 * cos_lat2 * sin_delta_lon * sin_delta_lon
+            total += atan2(sqrt(a), sqrt(1-a))
+        return 2 * total * radius
+
+    def nearest(self, lat, lon, radius=None):
+        """
+        Return the index of the point nearest to given position, and its distance.
+
+        Points whose latitude difference alone exceeds the best distance found so far are skipped
+        without further computation.
+
+        Arguments:
+            lat -- {float} -- Latitude of the position in degrees.
+            lon -- {float} -- Longitude of the position in degrees.
+            radius -- {int | float} -- (Mean) radius of earth (defaults to EARTH_RADIUS in kilometres).
+        Return:
+            {tuple | None} -- (index, distance), or None if the collection is empty.
+        """
+
+        if radius is None:
+            radius = EARTH_RADIUS
+        else:
+            radius = float(radius)
+
+        data = self._data
+        if not data:
+            return None
+        lat0 = radians(lat)
+        lon0 = radians(lon)
+        cos_lat0 = cos(lat0)
+        best_a = 2.0
+        best_angle = pi
+        best = 0
+        for i in range(0, len(data), 2):
+            lat1 = radians(data[i])
+            delta_lat = lat1 - lat0
+            if fabs(delta_lat) > best_angle:
+                continue
+            delta_lon = radians(data[i+1]) - lon0
+            a = sin(delta_lat/2) * sin(delta_lat/2) + \
+                   cos_lat0 * cos(lat1) * \
+                   sin(delta_lon/2) * sin(delta_lon/2)
+            if a < best_a:
+                best_a = a
+                best_angle = 2 * asin(sqrt(min(1.0, a)))
+                best = i // 2
+        return best, radius * 2 * atan2(sqrt(best_a), sqrt(1-best_a))
+
+    def bounds(self):
+        """
+        Return the bounding extent of the points (longitudes taken as given, without wrapping
+        across the anti-meridian).
+
+        Return:
+            {tuple | None} -- (min lat, min lon, max lat, max lon) in degrees, or None if empty.
+        """
+
+        if not self._data:
+            return None
+        lats = self.lats
+        lons = self.lons
+        return min(lats), min(lons), max(lats), max(lons)
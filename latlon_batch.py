@@ -0,0 +1,659 @@
+# -*- coding: utf-8 -*-
+
+"""
+Batch versions of the LatLon (spherical earth model) operations.
+
+Coordinates are handled as parallel sequences of latitudes and longitudes in degrees,
+normally stored in array.array buffers, so that large collections of points can be
+processed without creating a LatLon object per point.
+
+Storage precision:
+    Arrays can be stored as float64 (FLOAT64, typecode 'd') or float32 (FLOAT32, typecode 'f').
+    Whatever the storage type, every computation is done in double precision (Python floats),
+    values being widened on read. Only the storage is rounded.
+
+    Storing degrees as float32 rounds each coordinate by at most half a unit in the last place:
+        latitude  (|φ| < 128°) -- 2^-18° = 3.8e-6° -- 0.42 m
+        longitude (|λ| < 256°) -- 2^-17° = 7.6e-6° -- 0.85 m (at the equator)
+    so a stored point is displaced by less than 0.95 m, and:
+        distance error -- < 1.9 m (plus 2^-25 relative error, < 1 m, if results are stored as float32)
+        bearing error  -- < asin(1.9 m / d) for points d apart, eg 0.011° at 10 km, 0.0011° at 100 km
+"""
+
+from array import array
+from itertools import repeat
+from math import radians, degrees, sin, cos, asin, acos, atan2, sqrt, pi, fabs, ceil
+import struct
+import sys
+
+from geodesy.latlon_spherical import LatLon, EARTH_RADIUS, _inverse, _projectedLatitude
+
+FLOAT64 = 'd'
+FLOAT32 = 'f'
+
+# On-disk format: header followed by latitudes then longitudes, little-endian
+FILE_MAGIC = b'GEOB'
+FILE_VERSION = 1
+_FILE_HEADER = struct.Struct('<4sBc2xQ')
+
+# Bounds of the number of vertices of adaptive range rings
+MIN_RING_VERTICES = 8
+MAX_RING_VERTICES = 4096
+
+
+def _check_typecode(typecode):
+    if typecode not in (FLOAT64, FLOAT32):
+        raise ValueError("typecode must be 'd' (float64) or 'f' (float32)")
+
+
+def _check_lengths(*sequences):
+    n = len(sequences[0])
+    for seq in sequences[1:]:
+        if len(seq) != n:
+            raise ValueError('coordinate sequences must have the same length')
+    return n
+
+
+def _zeros(typecode, n):
+    return array(typecode, bytes(n * array(typecode).itemsize))
+
+
+def toArray(values, typecode=FLOAT64):
+    """
+    Return values as an array of given typecode. An array already of the right type is returned as is.
+
+    Arguments:
+        values -- {iterable} -- Numeric values.
+        typecode -- {string} -- FLOAT64 ('d') or FLOAT32 ('f') (default: FLOAT64).
+    Return:
+        {array} -- Array of values.
+    """
+
+    _check_typecode(typecode)
+    if isinstance(values, array) and values.typecode == typecode:
+        return values
+    return array(typecode, values)
+
+
+def fromLatLons(points, typecode=FLOAT64):
+    """
+    Return the latitudes and longitudes of a sequence of LatLon points as two arrays.
+
+    Arguments:
+        points -- {iterable} -- LatLon points.
+        typecode -- {string} -- FLOAT64 ('d') or FLOAT32 ('f') (default: FLOAT64).
+    Return:
+        {tuple} -- (lats, lons) arrays, in degrees.
+
+    Example:
+        > lats, lons = fromLatLons([LatLon(52.205, 0.119), LatLon(48.857, 2.351)], FLOAT32)
+    """
+
+    _check_typecode(typecode)
+    lats = array(typecode)
+    lons = array(typecode)
+    for point in points:
+        if not isinstance(point, LatLon):
+            raise TypeError('point is not LatLon object')
+        lats.append(point.lat)
+        lons.append(point.lon)
+    return lats, lons
+
+
+def toLatLons(lats, lons):
+    """
+    Return a list of LatLon points built from latitudes and longitudes sequences.
+
+    Arguments:
+        lats -- {sequence} -- Latitudes in degrees.
+        lons -- {sequence} -- Longitudes in degrees.
+    Return:
+        {list} -- LatLon points.
+    """
+
+    _check_lengths(lats, lons)
+    return [LatLon(lat, lon) for lat, lon in zip(lats, lons)]
+
+
+def distances(lats1, lons1, lats2, lons2, radius=None, typecode=FLOAT64):
+    """
+    Return the distances between each pair of points (using haversine formula).
+    Results are the same as LatLon.distanceTo for float64 inputs.
+
+    Arguments:
+        lats1, lons1 -- {sequence} -- Latitudes/longitudes of start points in degrees.
+        lats2, lons2 -- {sequence} -- Latitudes/longitudes of destination points in degrees.
+        radius -- {int | float} -- (Mean) radius of earth (defaults to EARTH_RADIUS in kilometres).
+        typecode -- {string} -- Storage type of the result, FLOAT64 ('d') or FLOAT32 ('f').
+    Return:
+        {array} -- Distances, in same units as radius.
+
+    Example:
+        > distances([52.205], [0.119], [48.857], [2.351])     # array('d', [404.279...])
+    """
+
+    _check_typecode(typecode)
+    n = _check_lengths(lats1, lons1, lats2, lons2)
+
+    if radius is None:
+        radius = EARTH_RADIUS
+    else:
+        radius = float(radius)
+
+    R = radius
+    result = _zeros(typecode, n)
+    for i in range(n):
+        lat1 = radians(lats1[i])
+        lon1 = radians(lons1[i])
+        lat2 = radians(lats2[i])
+        lon2 = radians(lons2[i])
+
+        delta_lat = lat2 - lat1
+        delta_lon = lon2 - lon1
+
+        # 'a' is kept in double precision even for float32 storage, as it is ill-conditioned near 0
+        a = sin(delta_lat/2) * sin(delta_lat/2) + \
+               cos(lat1) * cos(lat2) * \
+               sin(delta_lon/2) * sin(delta_lon/2)
+
+        c = 2 * atan2(sqrt(a), sqrt(1-a))
+        result[i] = R * c
+    return result
+
+
+def bearings(lats1, lons1, lats2, lons2, typecode=FLOAT64):
+    """
+    Return the initial bearings from each start point to its destination point.
+    Results are the same as LatLon.bearingTo for float64 inputs.
+
+    Arguments:
+        lats1, lons1 -- {sequence} -- Latitudes/longitudes of start points in degrees.
+        lats2, lons2 -- {sequence} -- Latitudes/longitudes of destination points in degrees.
+        typecode -- {string} -- Storage type of the result, FLOAT64 ('d') or FLOAT32 ('f').
+    Return:
+        {array} -- Bearings in degrees from north (0..360).
+    """
+
+    _check_typecode(typecode)
+    n = _check_lengths(lats1, lons1, lats2, lons2)
+
+    result = _zeros(typecode, n)
+    for i in range(n):
+        lat1 = radians(lats1[i])
+        lat2 = radians(lats2[i])
+        delta_lon = radians(lons2[i] - lons1[i])
+
+        y = sin(delta_lon) * cos(lat2)
+        x = cos(lat1) * sin(lat2) - \
+              sin(lat1) * cos(lat2) * cos(delta_lon)
+        b = atan2(y, x)
+        result[i] = (degrees(b) + 360) % 360
+    return result
+
+
+def finalBearings(lats1, lons1, lats2, lons2, typecode=FLOAT64):
+    """
+    Return the final bearings arriving at each destination point from its start point.
+    Results are the same as LatLon.finalBearingTo for float64 inputs.
+
+    Arguments:
+        lats1, lons1 -- {sequence} -- Latitudes/longitudes of start points in degrees.
+        lats2, lons2 -- {sequence} -- Latitudes/longitudes of destination points in degrees.
+        typecode -- {string} -- Storage type of the result, FLOAT64 ('d') or FLOAT32 ('f').
+    Return:
+        {array} -- Bearings in degrees from north (0..360).
+    """
+
+    result = bearings(lats2, lons2, lats1, lons1, FLOAT64)
+    for i in range(len(result)):
+        result[i] = (result[i] + 180) % 360
+    return toArray(result, typecode)
+
+
+def inverse(lats1, lons1, lats2, lons2, radius=None, midpoint=False, typecode=FLOAT64):
+    """
+    Return distances, initial bearings and final bearings (and optionally midpoints) between each
+    pair of points, sharing the trigonometric evaluations between them.
+    Results are the same as LatLon.inverse for float64 inputs.
+
+    Arguments:
+        lats1, lons1 -- {sequence} -- Latitudes/longitudes of start points in degrees.
+        lats2, lons2 -- {sequence} -- Latitudes/longitudes of destination points in degrees.
+        radius -- {int | float} -- (Mean) radius of earth (defaults to EARTH_RADIUS in kilometres).
+        midpoint -- {bool} -- Whether to compute the midpoints too (default: False).
+        typecode -- {string} -- Storage type of the results, FLOAT64 ('d') or FLOAT32 ('f').
+    Return:
+        {dictionary} -- Dictionary of arrays: distance, initialBearing, finalBearing
+                        (and midpointLat, midpointLon if asked).
+    """
+
+    _check_typecode(typecode)
+    n = _check_lengths(lats1, lons1, lats2, lons2)
+
+    if radius is None:
+        radius = EARTH_RADIUS
+    else:
+        radius = float(radius)
+
+    keys = ["distance", "initialBearing", "finalBearing"]
+    if midpoint:
+        keys += ["midpointLat", "midpointLon"]
+    columns = [_zeros(typecode, n) for _ in keys]
+
+    for i in range(n):
+        result = _inverse(lats1[i], lons1[i], lats2[i], lons2[i], radius, midpoint)
+        for column, value in zip(columns, result):
+            column[i] = value
+    return dict(zip(keys, columns))
+
+
+def ringVertexCount(distance, max_error, radius=None):
+    """
+    Return the number of vertices needed for a range ring polygon so that its edges (chords) deviate
+    from the true circle by at most max_error.
+
+    The circle of angular radius δ = d/R is a small circle of radius r = R ⋅ sin δ; a regular polygon of
+    n vertices inscribed in it deviates from it by r ⋅ (1 − cos(π/n)) at the middle of its edges.
+
+    Arguments:
+        distance -- {int | float} -- Radius of the ring, in same units as earth radius (default: kilometres).
+        max_error -- {int | float} -- Maximum chord error, in same units as earth radius.
+        radius -- {int | float} -- (Mean) radius of earth (defaults to EARTH_RADIUS in kilometres).
+    Return:
+        {int} -- Number of vertices, between MIN_RING_VERTICES and MAX_RING_VERTICES.
+
+    Example:
+        > ringVertexCount(10, 0.001)    # 223 vertices for a 10 km ring with 1 m error
+    """
+
+    if radius is None:
+        radius = EARTH_RADIUS
+    else:
+        radius = float(radius)
+
+    max_error = float(max_error)
+    if max_error <= 0:
+        raise ValueError('max_error must be positive')
+
+    r = radius * fabs(sin(float(distance) / radius))
+    if max_error >= r:
+        return MIN_RING_VERTICES
+    n = int(ceil(pi / acos(1 - max_error / r)))
+    return min(max(n, MIN_RING_VERTICES), MAX_RING_VERTICES)
+
+
+def rangeRings(lats, lons, distances, vertices=360, max_error=None, radius=None, typecode=FLOAT64):
+    """
+    Return range ring polygons (circles of given distances) around one or many centre points,
+    as LatLon.destinationPoint would give for evenly spaced bearings.
+
+    Trigonometric terms are computed once per centre, once per distance and once per bearing;
+    a ring is generated for each centre and each distance (for centre i, ring i*len(distances)+j
+    has distance j). Vertices start at bearing 0 (north) and go clockwise; rings are not closed
+    (first vertex is not repeated).
+
+    Arguments:
+        lats, lons -- {sequence} -- Latitudes/longitudes of centre points in degrees.
+        distances -- {sequence | int | float} -- Ring radii, in same units as earth radius (default: kilometres).
+        vertices -- {int} -- Number of vertices of each ring (default: 360), ignored if max_error is given.
+        max_error -- {int | float} -- If given, maximum chord error used to choose the number of vertices
+                                      of each ring (see ringVertexCount), in same units as earth radius.
+        radius -- {int | float} -- (Mean) radius of earth (defaults to EARTH_RADIUS in kilometres).
+        typecode -- {string} -- Storage type of the results, FLOAT64 ('d') or FLOAT32 ('f').
+    Return:
+        {tuple} -- (lats, lons, offsets): vertices of all rings, and offsets such that ring k has
+                   vertices offsets[k] to offsets[k+1]-1.
+
+    Example:
+        > ring_lats, ring_lons, offsets = rangeRings([51.4778], [-0.0015], [5, 10], vertices=72)
+    """
+
+    _check_typecode(typecode)
+    n = _check_lengths(lats, lons)
+
+    if radius is None:
+        radius = EARTH_RADIUS
+    else:
+        radius = float(radius)
+
+    if isinstance(distances, (int, float)):
+        distances = (distances,)
+
+    # Per distance terms
+    sin_distances = []
+    cos_distances = []
+    vertex_counts = []
+    for distance in distances:
+        angular_distance = float(distance) / radius
+        sin_distances.append(sin(angular_distance))
+        cos_distances.append(cos(angular_distance))
+        if max_error is None:
+            vertex_counts.append(int(vertices))
+        else:
+            vertex_counts.append(ringVertexCount(distance, max_error, radius))
+    if min(vertex_counts, default=1) < 1:
+        raise ValueError('vertices must be positive')
+
+    # Per bearing terms, shared by all rings with the same number of vertices
+    bearing_tables = {}
+    for count in vertex_counts:
+        if count not in bearing_tables:
+            bearings = [2*pi * v / count for v in range(count)]
+            bearing_tables[count] = ([sin(b) for b in bearings], [cos(b) for b in bearings])
+
+    total = n * sum(vertex_counts)
+    ring_lats = _zeros(typecode, total)
+    ring_lons = _zeros(typecode, total)
+    offsets = _zeros('q', n * len(vertex_counts) + 1)
+
+    k = 0
+    ring = 0
+    for i in range(n):
+        lat1 = radians(lats[i])
+        lon1 = radians(lons[i])
+        sin_lat1 = sin(lat1)
+        cos_lat1 = cos(lat1)
+
+        for sin_distance, cos_distance, count in zip(sin_distances, cos_distances, vertex_counts):
+            sin_bearings, cos_bearings = bearing_tables[count]
+            a = sin_lat1 * cos_distance
+            b = cos_lat1 * sin_distance
+            for v in range(count):
+                sin_lat2 = a + b * cos_bearings[v]
+                lat2 = asin(max(-1.0, min(1.0, sin_lat2)))
+                x = cos_distance - sin_lat1 * sin_lat2
+                y = sin_bearings[v] * b
+                lon2 = lon1 + atan2(y, x)
+                ring_lats[k] = degrees(lat2)
+                ring_lons[k] = (degrees(lon2) + 540) % 360 - 180     # normalise to −180..+180°
+                k += 1
+            ring += 1
+            offsets[ring] = k
+
+    return ring_lats, ring_lons, offsets
+
+
+def propagate(lats, lons, speeds, headings, dt, mode='greatcircle', radius=None, final_headings=None):
+    """
+    Move points in place, each one travelling at its speed on its heading for a time step, as
+    LatLon.destinationPoint (mode 'greatcircle') or LatLon.rhumbDestinationPoint (mode 'rhumb') would,
+    but writing the destinations back into lats and lons instead of creating LatLon objects.
+
+    Nothing proportional to the number of points is allocated: lats, lons and final_headings are
+    preallocated mutable sequences (array, list, or memoryview such as LatLonArray.lats), and speeds
+    and headings may be scalars shared by all points.
+
+    Final headings are the bearings at the destinations: along a great circle,
+        θ2 = atan2( sin θ ⋅ cos φ1, cos φ1 ⋅ cos δ ⋅ cos θ − sin φ1 ⋅ sin δ )
+    and the (constant) heading along a rhumb line. final_headings may be headings itself, so that
+    points keep following their great circles from step to step.
+
+    Arguments:
+        lats, lons -- {sequence} -- Latitudes/longitudes of the points in degrees, updated in place.
+        speeds -- {sequence | int | float} -- Speeds, in units of earth radius per unit of time.
+        headings -- {sequence | int | float} -- Headings in degrees from north.
+        dt -- {int | float} -- Time step.
+        mode -- {string} -- 'greatcircle' (default) or 'rhumb'.
+        radius -- {int | float} -- (Mean) radius of earth (defaults to EARTH_RADIUS in kilometres).
+        final_headings -- {sequence} -- If given, receives the headings at the destinations, in degrees.
+
+    Example:
+        > lats, lons = array('d', [51.4778]), array('d', [-0.0015])
+        > headings = array('d', [300.7])
+        > for tick in range(3600):
+        >     propagate(lats, lons, 7794 / 3600, headings, 1, final_headings=headings)
+    """
+
+    n = _check_lengths(lats, lons)
+    if mode not in ('greatcircle', 'rhumb'):
+        raise ValueError('unknown mode {!r}'.format(mode))
+    if isinstance(speeds, (int, float)):
+        speeds = repeat(speeds, n)
+    elif len(speeds) != n:
+        raise ValueError('speeds and coordinate sequences must have the same length')
+    if isinstance(headings, (int, float)):
+        headings = repeat(headings, n)
+    elif len(headings) != n:
+        raise ValueError('headings and coordinate sequences must have the same length')
+    if final_headings is not None and len(final_headings) != n:
+        raise ValueError('final_headings and coordinate sequences must have the same length')
+
+    if radius is None:
+        radius = EARTH_RADIUS
+    else:
+        radius = float(radius)
+    dt = float(dt)
+
+    if mode == 'greatcircle':
+        for i, speed, heading in zip(range(n), speeds, headings):
+            angular_distance = speed * dt / radius
+            bearing = radians(float(heading))
+            lat1 = radians(lats[i])
+            sin_lat1 = sin(lat1)
+            cos_lat1 = cos(lat1)
+            sin_distance = sin(angular_distance)
+            cos_distance = cos(angular_distance)
+            sin_bearing = sin(bearing)
+            cos_bearing = cos(bearing)
+
+            lat2 = asin(sin_lat1 * cos_distance + cos_lat1 * sin_distance * cos_bearing)
+            x = cos_distance - sin_lat1 * sin(lat2)
+            y = sin_bearing * sin_distance * cos_lat1
+            lats[i] = degrees(lat2)
+            lons[i] = (degrees(radians(lons[i]) + atan2(y, x)) + 540) % 360 - 180     # normalise to −180..+180°
+            if final_headings is not None:
+                final_headings[i] = (degrees(atan2(sin_bearing * cos_lat1,
+                                                   cos_lat1 * cos_distance * cos_bearing - sin_lat1 * sin_distance))
+                                     + 360) % 360
+        return
+
+    for i, speed, heading in zip(range(n), speeds, headings):
+        angular_distance = speed * dt / radius
+        bearing = radians(heading)
+        lat1 = radians(lats[i])
+        delta_lat = angular_distance * cos(bearing)
+        lat2 = lat1 + delta_lat
+        # past the pole, normalise latitude
+        if fabs(lat2) > pi/2:
+            if lat2 > 0:
+                lat2 = pi-lat2
+            else:
+                lat2 = -pi-lat2
+
+        delta_mercator_distance = _projectedLatitude(lat2) - _projectedLatitude(lat1)
+        # E-W course becomes ill-conditioned with 0/0
+        if fabs(delta_mercator_distance) > 10e-12:
+            q = delta_lat / delta_mercator_distance
+        else:
+            q = cos(lat1)
+        lats[i] = degrees(lat2)
+        # to the south pole (where LatLon.rhumbDestinationPoint fails), longitude is left unchanged
+        if q != 0:
+            lons[i] = (degrees(radians(lons[i]) + angular_distance * sin(bearing) / q) + 540) % 360 - 180
+        if final_headings is not None:
+            final_headings[i] = heading % 360
+
+
+def routeCrossings(lats, lons, parallels=(), meridians=(), typecode=FLOAT64):
+    """
+    Return all the points where a route (polyline of great circle segments) crosses given parallels
+    and meridians, sorted along the route.
+
+    Each segment is handled once: its start point vector and direction are computed, then for each
+    parallel or meridian the crossings are found by solving z(t) = sin φ or (−sin λ, cos λ, 0) ⋅ p(t) = 0
+    along p(t) = p1 ⋅ cos t + u ⋅ sin t, t being the angular distance from the segment start point.
+    Unlike LatLon.crossingParallels, only the crossings within the segments are returned.
+
+    A crossing exactly at a route point is reported for the segment starting there. Degenerate
+    segments (coincident or antipodal points) and segments lying along a meridian are skipped.
+
+    Arguments:
+        lats, lons -- {sequence} -- Latitudes/longitudes of the route points in degrees.
+        parallels -- {sequence} -- Latitudes of the parallels, in degrees.
+        meridians -- {sequence} -- Longitudes of the meridians, in degrees.
+        typecode -- {string} -- Storage type of crossing coordinates, FLOAT64 ('d') or FLOAT32 ('f').
+    Return:
+        {dictionary} -- Dictionary of arrays, one item per crossing:
+                        lat, lon -- crossing point, in degrees (the parallel latitude or meridian
+                                    longitude as given),
+                        segment -- index of the segment (from point segment to point segment+1),
+                        fraction -- fraction of the segment length from its start point,
+                        kind -- 0 for a parallel, 1 for a meridian,
+                        line -- index of the crossed parallel or meridian.
+
+    Example:
+        > c = routeCrossings([51.5, 48.9, 45.8], [-0.1, 2.4, 4.8], parallels=[50, 47], meridians=[0, 2, 4])
+        > list(c["lon"])    # [0, 1.3816, 2, 3.9086, 4]
+    """
+
+    _check_typecode(typecode)
+    n = _check_lengths(lats, lons)
+
+    sin_parallels = [sin(radians(lat)) for lat in parallels]
+    meridian_terms = []
+    for lon in meridians:
+        lon = radians(lon)
+        meridian_terms.append((sin(lon), cos(lon)))
+
+    result = {
+        "lat": array(typecode),
+        "lon": array(typecode),
+        "segment": array('q'),
+        "fraction": array('d'),
+        "kind": array('b'),
+        "line": array('q'),
+    }
+
+    if n == 0:
+        return result
+    lat = radians(lats[0])
+    lon = radians(lons[0])
+    x2 = cos(lat) * cos(lon)
+    y2 = cos(lat) * sin(lon)
+    z2 = sin(lat)
+    for k in range(n - 1):
+        x1, y1, z1 = x2, y2, z2
+        lat = radians(lats[k+1])
+        lon = radians(lons[k+1])
+        x2 = cos(lat) * cos(lon)
+        y2 = cos(lat) * sin(lon)
+        z2 = sin(lat)
+
+        # angular length of the segment, and unit direction u at its start point
+        cx = y1 * z2 - z1 * y2
+        cy = z1 * x2 - x1 * z2
+        cz = x1 * y2 - y1 * x2
+        sin_delta = sqrt(cx*cx + cy*cy + cz*cz)
+        cos_delta = x1 * x2 + y1 * y2 + z1 * z2
+        if sin_delta < 1e-15:
+            continue
+        delta = atan2(sin_delta, cos_delta)
+        ux = (x2 - x1 * cos_delta) / sin_delta
+        uy = (y2 - y1 * cos_delta) / sin_delta
+        uz = (z2 - z1 * cos_delta) / sin_delta
+
+        crossings = []
+
+        # parallels: z1 ⋅ cos t + uz ⋅ sin t = sin φ
+        rho = sqrt(z1*z1 + uz*uz)
+        if rho > 0:
+            t_max = atan2(uz, z1)
+            for index, sin_lat in enumerate(sin_parallels):
+                if fabs(sin_lat) > rho:
+                    continue
+                spread = acos(sin_lat / rho)
+                for t in ((t_max - spread) % (2*pi), (t_max + spread) % (2*pi)):
+                    if t < delta and not (crossings and crossings[-1][:3] == (t, 0, index)):
+                        x = x1 * cos(t) + ux * sin(t)
+                        y = y1 * cos(t) + uy * sin(t)
+                        crossings.append((t, 0, index, parallels[index], degrees(atan2(y, x))))
+
+        # meridians: (−sin λ, cos λ, 0) ⋅ p(t) = 0, on the λ side of the earth axis
+        for index, (sin_lon, cos_lon) in enumerate(meridian_terms):
+            c = y1 * cos_lon - x1 * sin_lon
+            d = uy * cos_lon - ux * sin_lon
+            if c == 0 and d == 0:
+                continue
+            t0 = atan2(-c, d) % pi
+            for t in (t0, t0 + pi):
+                if t >= delta:
+                    break
+                x = x1 * cos(t) + ux * sin(t)
+                y = y1 * cos(t) + uy * sin(t)
+                if x * cos_lon + y * sin_lon > 0:
+                    z = z1 * cos(t) + uz * sin(t)
+                    crossings.append((t, 1, index, degrees(atan2(z, sqrt(x*x + y*y))), meridians[index]))
+
+        crossings.sort()
+        for t, kind, index, lat, lon in crossings:
+            result["lat"].append(lat)
+            result["lon"].append(lon)
+            result["segment"].append(k)
+            result["fraction"].append(t / delta)
+            result["kind"].append(kind)
+            result["line"].append(index)
+
+    return result
+
+
+def dump(fileobj, lats, lons, typecode=None):
+    """
+    Write latitudes and longitudes to a binary file object.
+
+    The format is a 16 bytes header (magic b'GEOB', version, typecode, count) followed by all the
+    latitudes then all the longitudes, as little-endian float64 or float32 values.
+
+    Arguments:
+        fileobj -- {file} -- File object opened in binary write mode.
+        lats -- {sequence} -- Latitudes in degrees.
+        lons -- {sequence} -- Longitudes in degrees.
+        typecode -- {string} -- Storage type, FLOAT64 ('d') or FLOAT32 ('f')
+                                (default: typecode of lats if it is an array, else FLOAT64).
+    """
+
+    if typecode is None:
+        typecode = lats.typecode if isinstance(lats, array) else FLOAT64
+    _check_typecode(typecode)
+    n = _check_lengths(lats, lons)
+
+    fileobj.write(_FILE_HEADER.pack(FILE_MAGIC, FILE_VERSION, typecode.encode('ascii'), n))
+    for values in (lats, lons):
+        values = toArray(values, typecode)
+        if sys.byteorder != 'little':
+            values = array(typecode, values)
+            values.byteswap()
+        fileobj.write(values.tobytes())
+
+
+def load(fileobj):
+    """
+    Read latitudes and longitudes written by dump() from a binary file object.
+
+    Arguments:
+        fileobj -- {file} -- File object opened in binary read mode.
+    Return:
+        {tuple} -- (lats, lons) arrays, with the typecode they were stored with.
+    """
+
+    header = fileobj.read(_FILE_HEADER.size)
+    if len(header) != _FILE_HEADER.size:
+        raise ValueError('truncated header')
+    magic, version, typecode, n = _FILE_HEADER.unpack(header)
+    if magic != FILE_MAGIC:
+        raise ValueError('not a geodesy batch file')
+    if version != FILE_VERSION:
+        raise ValueError('unsupported file version {}'.format(version))
+    typecode = typecode.decode('ascii')
+    _check_typecode(typecode)
+
+    result = []
+    for _ in range(2):
+        values = array(typecode)
+        data = fileobj.read(n * values.itemsize)
+        if len(data) != n * values.itemsize:
+            raise ValueError('truncated data')
+        values.frombytes(data)
+        if sys.byteorder != 'little':
+            values.byteswap()
+        result.append(values)
+    return result[0], result[1]
@@ -1,7 +1,9 @@
 # -*- coding: utf-8 -*-
 
 from math import radians, degrees, sin, cos, tan, atan2, asin, acos
-from math import sqrt, pi, fabs, log, isnan, isfinite
+from math import sqrt, pi, fabs, log, isnan, isfinite, inf
+from array import array
+from itertools import repeat
 import geodesy.dms as dms
 
 EARTH_RADIUS = 6371.009 # In KM
@@ -72,7 +74,62 @@ class LatLon(object):
     def finalBearingTo(self, point):
         # Get initial bearing from destination point to this point & reverse it by adding 180°
         return (point.bearingTo(self) + 180) % 360
-    
+
+    def inverse(self, point, radius=None, midpoint=False):
+        """
+        Return distance, initial bearing and final bearing (and optionally midpoint) from 'self' point
+        to destination point, sharing the trigonometric evaluations between them.
+        Results are identical to distanceTo, bearingTo, finalBearingTo and midpointTo.
+
+        Arguments:
+            point -- {LatLon} -- Latitude/longitude of destination point.
+            radius -- {int | float} -- (Mean) radius of earth (defaults to EARTH_RADIUS in kilometres).
+            midpoint -- {bool} -- Whether to compute the midpoint too (default: False).
+        Return:
+            {dictionary} -- Dictionary containing distance, initialBearing, finalBearing
+                            (and midpoint as a LatLon if asked).
+
+        Example:
+            > p1 = LatLon(52.205, 0.119)
+            > p2 = LatLon(48.857, 2.351)
+            > inv = p1.inverse(p2)     # {'distance': 404.3, 'initialBearing': 156.2, 'finalBearing': 157.9}
+        """
+
+        if not isinstance(point, LatLon):
+            raise TypeError('point is not LatLon object')
+
+        if radius is None:
+            radius = EARTH_RADIUS
+        else:
+            radius = float(radius)
+
+        result = _inverse(self.lat, self.lon, point.lat, point.lon, radius, midpoint)
+        inv = {
+            "distance": result[0],
+            "initialBearing": result[1],
+            "finalBearing": result[2]
+        }
+        if midpoint:
+            inv["midpoint"] = LatLon(result[3], result[4])
+        return inv
+
+    def prepare(self, radius=None):
+        """
+        Return a PreparedLatLon for ‘self’ point, caching its trigonometric terms for one-to-many
+        distances, bearings, cross-track distances and destinations.
+
+        Arguments:
+            radius -- {int | float} -- (Mean) radius of earth (defaults to EARTH_RADIUS in kilometres).
+        Return:
+            {PreparedLatLon} -- Prepared origin.
+
+        Example:
+            > site = LatLon(52.205, 0.119).prepare()
+            > site.distanceTo(LatLon(48.857, 2.351))     # 404.3 (km)
+        """
+
+        return PreparedLatLon(self, radius)
+
     
     def midpointTo(self, point):
         """
@@ -434,13 +491,9 @@ class LatLon(object):
 
         # on Mercator projection, longitude distances shrink by latitude; q is the 'stretch factor'
         # q becomes ill-conditioned along E-W line (0/0); use empirical tolerance to avoid it
-        z = tan(lat2/2 + pi/4) / tan(lat1/2 + pi/4)
-        if ( z > 0):
-            delta_mercator_distance = log( z )
-            if fabs(delta_mercator_distance) > 10e-12:
-                q = delta_lat/delta_mercator_distance
-            else:
-                q = cos(lat1)
+        delta_mercator_distance = _projectedLatitude(lat2) - _projectedLatitude(lat1)
+        if fabs(delta_mercator_distance) > 10e-12:
+            q = delta_lat/delta_mercator_distance
         else:
             q = cos(lat1)
 
@@ -487,7 +540,7 @@ class LatLon(object):
             else:
                 delta_lon = 2*pi + delta_lon
         
-        delta_mercator_dist = log( tan(lat2/2 + pi/4) / tan(lat1/2 + pi/4) )
+        delta_mercator_dist = _projectedLatitude(lat2) - _projectedLatitude(lat1)
         bearing = atan2(delta_lon, delta_mercator_dist)
         
         return (degrees(bearing)+360) % 360   # Normalise 0..+360
@@ -509,7 +562,7 @@ class LatLon(object):
             > p = LatLon(51.127, 1.338)
             > distance = 40.31    # In kilometres
             > bearing = 116.7     # In degrees
-            > p.rhumbDestinationPoint(distance, bearing)    # 50.9641°N, 1.8540°E
+            > p.rhumbDestinationPoint(distance, bearing)    # 50.9641°N, 1.8531°E
         """
 
         if radius is None:
@@ -533,9 +586,9 @@ class LatLon(object):
             else:
                 lat2 = -pi-lat2
 
-        delta_mercator_distance = log( tan(lat2/2 + pi/4) / tan(lat1/2 + pi/4) ) 
+        delta_mercator_distance = _projectedLatitude(lat2) - _projectedLatitude(lat1)
         # E-W course becomes ill-conditioned with 0/0
-        if fabs(delta_mercator_distance > 10e-12):
+        if fabs(delta_mercator_distance) > 10e-12:
             q = delta_lat / delta_mercator_distance
         else:
             q = cos(lat1)
@@ -576,14 +629,287 @@ class LatLon(object):
         
         lat3 = (lat1+lat2) / 2
         
-        f1 = tan(pi/4 + lat1/2)
-        f2 = tan(pi/4 + lat2/2)
-        f3 = tan(pi/4 + lat3/2)            
-        lon3 = (  delta_lon*log(f3) + lon1*log(f2) - lon2*log(f1) ) / log(f2/f1)
+        psi1 = _projectedLatitude(lat1)
+        psi2 = _projectedLatitude(lat2)
+        psi3 = _projectedLatitude(lat3)
+        if psi2 != psi1:
+            lon3 = (  delta_lon*psi3 + lon1*psi2 - lon2*psi1 ) / (psi2 - psi1)
+        else:
+            lon3 = inf
         
         # parallel of latitude
-        if isfinite(lon3):
+        if not isfinite(lon3):
             lon3 = (lon1+lon2)/2
             
         return LatLon(degrees(lat3), (degrees(lon3)+540)%360-180)   # normalise to −180..+180°
-        
\ No newline at end of file
+        
+
+class PreparedLatLon(object):
+    """
+    Origin point whose radians, sine and cosine of latitude are computed once, for one-to-many queries.
+    Results are identical to the LatLon methods of the origin point.
+
+    Methods take a single LatLon (returning a value) or an iterable of LatLon (returning a list);
+    the array methods take latitudes and longitudes sequences and return array('d') results.
+
+    Example:
+        > site = PreparedLatLon(LatLon(52.205, 0.119))
+        > site.distances(lats, lons)
+    """
+
+    def __init__(self, point, radius=None):
+        """
+        Arguments:
+            point -- {LatLon} -- Origin point.
+            radius -- {int | float} -- (Mean) radius of earth (defaults to EARTH_RADIUS in kilometres).
+        """
+
+        if not isinstance(point, LatLon):
+            raise TypeError('point is not LatLon object')
+
+        if radius is None:
+            radius = EARTH_RADIUS
+        else:
+            radius = float(radius)
+
+        self.point = point
+        self.radius = radius
+        self._lat = radians(point.lat)
+        self._lon = radians(point.lon)
+        self._sin_lat = sin(self._lat)
+        self._cos_lat = cos(self._lat)
+
+    def _distance(self, lat, lon):
+        lat2 = radians(lat)
+        sin_half_delta_lat = sin((lat2 - self._lat)/2)
+        sin_half_delta_lon = sin((radians(lon) - self._lon)/2)
+        a = sin_half_delta_lat * sin_half_delta_lat + \
+               self._cos_lat * cos(lat2) * \
+               sin_half_delta_lon * sin_half_delta_lon
+        return self.radius * (2 * atan2(sqrt(a), sqrt(1-a)))
+
+    def _bearing(self, lat, lon):
+        lat2 = radians(lat)
+        delta_lon = radians(lon - self.point.lon)
+        cos_lat2 = cos(lat2)
+        y = sin(delta_lon) * cos_lat2
+        x = self._cos_lat * sin(lat2) - \
+              self._sin_lat * cos_lat2 * cos(delta_lon)
+        return (degrees(atan2(y, x)) + 360) % 360
+
+    def _destination(self, distance, bearing):
+        angular_distance = float(distance) / self.radius
+        bearing = radians(float(bearing))
+        sin_distance = sin(angular_distance)
+        cos_distance = cos(angular_distance)
+        lat2 = asin(self._sin_lat * cos_distance + self._cos_lat * sin_distance * cos(bearing))
+        x = cos_distance - self._sin_lat * sin(lat2)
+        y = sin(bearing) * sin_distance * self._cos_lat
+        lon2 = self._lon + atan2(y, x)
+        return degrees(lat2), (degrees(lon2) + 540)%360-180   #normalise to −180..+180°
+
+    def _apply(self, function, points):
+        # one LatLon point, or iterable of LatLon points
+        if isinstance(points, LatLon):
+            return function(points.lat, points.lon)
+        result = []
+        for point in points:
+            if not isinstance(point, LatLon):
+                raise TypeError('point is not LatLon object')
+            result.append(function(point.lat, point.lon))
+        return result
+
+    def _destinations(self, distances, bearings):
+        # (distance, bearing) pairs, a scalar distance or bearing being repeated along the other sequence
+        if isinstance(distances, (int, float)):
+            if isinstance(bearings, (int, float)):
+                return ((distances, bearings),)
+            distances = repeat(distances)
+        elif isinstance(bearings, (int, float)):
+            bearings = repeat(bearings)
+        return zip(distances, bearings)
+
+    def distanceTo(self, point):
+        """
+        Return the distance from the origin to a point (see LatLon.distanceTo).
+
+        Arguments:
+            point -- {LatLon | iterable} -- Destination point, or iterable of points.
+        Return:
+            {float | list} -- Distance(s), in same units as radius.
+        """
+
+        return self._apply(self._distance, point)
+
+    def bearingTo(self, point):
+        """
+        Return the initial bearing from the origin to a point (see LatLon.bearingTo).
+
+        Arguments:
+            point -- {LatLon | iterable} -- Destination point, or iterable of points.
+        Return:
+            {float | list} -- Bearing(s) in degrees from north.
+        """
+
+        return self._apply(self._bearing, point)
+
+    def _crossTrack(self, path_end):
+        # cross-track distance function of points to the great circle from the origin to path_end
+        if not isinstance(path_end, LatLon):
+            raise TypeError('path_end is not LatLon object')
+        bearing_12 = radians(self._bearing(path_end.lat, path_end.lon))
+        radius = self.radius
+
+        def crossTrack(lat, lon):
+            adist_13 = self._distance(lat, lon) / radius
+            bearing_13 = radians(self._bearing(lat, lon))
+            return asin( sin(adist_13) * sin(bearing_13-bearing_12) ) * radius
+        return crossTrack
+
+    def crossTrackDistanceTo(self, point, path_end):
+        """
+        Return the (signed) distance from a point to the great circle path from the origin to path_end,
+        as point.crossTrackDistanceTo(origin, path_end); the path bearing is computed once per call.
+
+        Arguments:
+            point -- {LatLon | iterable} -- Point, or iterable of points.
+            path_end -- {LatLon} -- End point of great circle path.
+        Return:
+            {float | list} -- Distance(s) to great circle (-ve if to left, +ve if to right of path).
+        """
+
+        return self._apply(self._crossTrack(path_end), point)
+
+    def destinationPoint(self, distance, bearing):
+        """
+        Return the destination point from the origin having travelled the given distance on the
+        given initial bearing (see LatLon.destinationPoint).
+
+        Arguments:
+            distance -- {int | float | iterable} -- Distance(s) travelled, in same units as radius.
+            bearing -- {int | float | iterable} -- Initial bearing(s) in degrees from north.
+        Return:
+            {LatLon | list} -- Destination point, or list of points if distance or bearing is an iterable
+                               (a scalar distance or bearing applying to all points).
+
+        Example:
+            > ring = site.destinationPoint(10, range(0, 360, 10))
+        """
+
+        if isinstance(distance, (int, float)) and isinstance(bearing, (int, float)):
+            return LatLon(*self._destination(distance, bearing))
+        return [LatLon(*self._destination(d, b)) for d, b in self._destinations(distance, bearing)]
+
+    def distances(self, lats, lons):
+        """
+        Return the distances from the origin to points given as latitudes and longitudes sequences.
+
+        Return:
+            {array} -- Distances, in same units as radius.
+        """
+
+        return array('d', map(self._distance, lats, lons))
+
+    def bearings(self, lats, lons):
+        """
+        Return the initial bearings from the origin to points given as latitudes and longitudes sequences.
+
+        Return:
+            {array} -- Bearings in degrees from north.
+        """
+
+        return array('d', map(self._bearing, lats, lons))
+
+    def crossTrackDistances(self, lats, lons, path_end):
+        """
+        Return the cross-track distances of points given as latitudes and longitudes sequences, to the
+        great circle path from the origin to path_end.
+
+        Return:
+            {array} -- Distances to great circle (-ve if to left, +ve if to right of path).
+        """
+
+        return array('d', map(self._crossTrack(path_end), lats, lons))
+
+    def destinationPoints(self, distances, bearings):
+        """
+        Return the destination points from the origin for distances and bearings sequences
+        (either may be a scalar, applying to all points).
+
+        Return:
+            {tuple} -- (lats, lons) arrays of destination points, in degrees.
+        """
+
+        lats = array('d')
+        lons = array('d')
+        for distance, bearing in self._destinations(distances, bearings):
+            lat, lon = self._destination(distance, bearing)
+            lats.append(lat)
+            lons.append(lon)
+        return lats, lons
+
+
+def _projectedLatitude(lat):
+    """
+    Return the Mercator projected latitude ψ = ln( tan(π/4 + φ/2) ) of a latitude φ in radians
+    (−inf at the south pole), shared by the rhumb line methods and the mercator module.
+    """
+
+    t = tan(pi/4 + lat/2)
+    return log(t) if t > 0 else -inf
+
+
+def _inverse(lat1, lon1, lat2, lon2, radius, midpoint):
+    """
+    Shared computation of LatLon.inverse and latlon_batch.inverse (coordinates in degrees).
+    Operations are carried out in the same order as in distanceTo, bearingTo, finalBearingTo
+    and midpointTo, so that results are identical.
+    
+    Return:
+        {tuple} -- (distance, initial bearing, final bearing) 
+                   or (distance, initial bearing, final bearing, midpoint lat, midpoint lon).
+    """
+    
+    delta_lon_deg = lon2 - lon1
+    lat1 = radians(lat1)
+    lon1 = radians(lon1)
+    lat2 = radians(lat2)
+    lon2 = radians(lon2)
+    
+    sin_lat1 = sin(lat1)
+    cos_lat1 = cos(lat1)
+    sin_lat2 = sin(lat2)
+    cos_lat2 = cos(lat2)
+    
+    # Distance (haversine)
+    sin_half_delta_lat = sin((lat2 - lat1)/2)
+    sin_half_delta_lon = sin((lon2 - lon1)/2)
+    a = sin_half_delta_lat * sin_half_delta_lat + \
+           cos_lat1 * cos_lat2 * \
+           sin_half_delta_lon * sin_half_delta_lon
+    distance = radius * (2 * atan2(sqrt(a), sqrt(1-a)))
+    
+    # Initial bearing, and final bearing as reversed initial bearing from destination point
+    delta_lon = radians(delta_lon_deg)
+    sin_delta_lon = sin(delta_lon)
+    cos_delta_lon = cos(delta_lon)
+    
+    y = sin_delta_lon * cos_lat2
+    x = cos_lat1 * sin_lat2 - sin_lat1 * cos_lat2 * cos_delta_lon
+    initial_bearing = (degrees(atan2(y, x)) + 360) % 360
+    
+    y = -sin_delta_lon * cos_lat1
+    x = cos_lat2 * sin_lat1 - sin_lat2 * cos_lat1 * cos_delta_lon
+    final_bearing = ((degrees(atan2(y, x)) + 360) % 360 + 180) % 360
+    
+    if not midpoint:
+        return distance, initial_bearing, final_bearing
+    
+    Bx = cos_lat2 * cos_delta_lon
+    By = cos_lat2 * sin_delta_lon
+    x = sqrt( (cos_lat1 + Bx) * (cos_lat1 + Bx) + By*By)
+    y = sin_lat1 + sin_lat2
+    lat3 = atan2(y, x)
+    lon3 = lon1 + atan2( By, cos_lat1 + Bx )
+    
+    return distance, initial_bearing, final_bearing, degrees(lat3), (degrees(lon3)+540)%360-180
@@ -0,0 +1,229 @@
+# -*- coding: utf-8 -*-
+
+"""
+Batch spherical (Web) Mercator projection, to metres and to tile pixel coordinates, and its inverse.
+
+    x = R ⋅ λ
+    y = R ⋅ ψ,  ψ = ln( tan(π/4 + φ/2) )    (the projected latitude of the rhumb line methods)
+
+Tile pixel coordinates are the global pixel coordinates of the XYZ tiling scheme: at zoom level z the world
+is a square of tile_size ⋅ 2^z pixels, with origin at the north-west corner (180°W, MAX_LATITUDE) and y
+pointing south; the tile of a pixel is (x // tile_size, y // tile_size). Latitudes are clamped to
+±MAX_LATITUDE, where the world becomes square.
+
+The projected latitude can also be interpolated from a MercatorTable, trading the logarithm and tangent
+of each point for a table lookup, with a bounded error. In CPython both cost about the same, interpreter
+overhead dominating: the table is meant for runtimes where the transcendental functions are the bottleneck.
+"""
+
+from array import array
+from math import radians, degrees, atan, sinh, sqrt, pi, ceil, cos, tan
+
+from geodesy.latlon_spherical import _projectedLatitude
+from geodesy.latlon_batch import FLOAT64, _check_typecode, _check_lengths, _zeros
+
+# Sphere of the Web Mercator projection (EPSG:3857): WGS 84 semi-major axis
+WEB_MERCATOR_RADIUS = 6378137.0     # metres
+# Latitude where the projected world is square: atan(sinh(π))
+MAX_LATITUDE = degrees(atan(sinh(pi)))
+TILE_SIZE = 256
+
+# Largest number of intervals of a MercatorTable (16 bytes each)
+MAX_TABLE_SIZE = 1 << 22
+
+
+class MercatorTable(object):
+    """
+    Piecewise linear interpolation table of the projected latitude ψ(φ) over ±MAX_LATITUDE.
+
+    With intervals of h degrees, the interpolation error is at most h²/8 ⋅ max |ψ''|, with
+        ψ''(φ) = sec φ ⋅ tan φ ⋅ (π/180)²     (per degree²)
+    largest at MAX_LATITUDE; the interval is chosen from the requested error. The error on y is
+    R ⋅ max_error metres, or tile_size ⋅ 2^z / 2π ⋅ max_error pixels at zoom z.
+
+    Example:
+        > table = MercatorTable(1e-9)      # 0.04 pixel at zoom 20, 6 mm on the Web Mercator sphere
+        > xs, ys = toPixels(lats, lons, 20, table=table)
+    """
+
+    def __init__(self, max_error=1e-9):
+        """
+        Arguments:
+            max_error -- {float} -- Maximum interpolation error on ψ (radians of projected latitude).
+        """
+
+        if not max_error > 0:
+            raise ValueError('max_error must be positive')
+        phi = radians(MAX_LATITUDE)
+        curvature = tan(phi) / cos(phi) * radians(1) * radians(1)
+        size = int(ceil(2 * MAX_LATITUDE / sqrt(8 * max_error / curvature)))
+        if size > MAX_TABLE_SIZE:
+            raise ValueError('max_error too small, table would have {} intervals'.format(size))
+
+        self.size = size
+        self.start = -MAX_LATITUDE
+        self.step = 2 * MAX_LATITUDE / size
+        self.max_error = self.step * self.step / 8 * curvature
+
+        # ψ ≈ intercept + slope ⋅ φ on each interval, φ in degrees
+        self._intercepts = array('d', bytes(8 * size))
+        self._slopes = array('d', bytes(8 * size))
+        lat1 = self.start
+        psi1 = _projectedLatitude(radians(lat1))
+        for i in range(size):
+            lat2 = self.start + (i + 1) * self.step
+            psi2 = _projectedLatitude(radians(lat2))
+            slope = (psi2 - psi1) / (lat2 - lat1)
+            self._slopes[i] = slope
+            self._intercepts[i] = psi1 - slope * lat1
+            lat1, psi1 = lat2, psi2
+
+    def projectedLatitude(self, lat):
+        """
+        Return the interpolated projected latitude ψ of a latitude in degrees (clamped to ±MAX_LATITUDE).
+        """
+
+        lat = max(-MAX_LATITUDE, min(MAX_LATITUDE, lat))
+        i = min(int((lat - self.start) / self.step), self.size - 1)
+        return self._intercepts[i] + self._slopes[i] * lat
+
+
+def _project(lats, lons, scale, offset, y_sign, table, typecode):
+    # x = offset + scale ⋅ λ, y = offset + y_sign ⋅ scale ⋅ ψ
+    _check_typecode(typecode)
+    n = _check_lengths(lats, lons)
+    if table is not None and not isinstance(table, MercatorTable):
+        raise TypeError('table is not MercatorTable object')
+
+    xs = _zeros(typecode, n)
+    ys = _zeros(typecode, n)
+    max_lat = MAX_LATITUDE
+    x_scale = radians(scale)
+    y_scale = y_sign * scale
+
+    if table is None:
+        for k in range(n):
+            lat = lats[k]
+            if lat > max_lat:
+                lat = max_lat
+            elif lat < -max_lat:
+                lat = -max_lat
+            xs[k] = offset + x_scale * lons[k]
+            ys[k] = offset + y_scale * _projectedLatitude(radians(lat))
+        return xs, ys
+
+    intercepts = table._intercepts
+    slopes = table._slopes
+    start = table.start
+    inverse_step = 1 / table.step
+    last = table.size - 1
+    for k in range(n):
+        lat = lats[k]
+        if lat > max_lat:
+            lat = max_lat
+        elif lat < -max_lat:
+            lat = -max_lat
+        i = int((lat - start) * inverse_step)
+        if i > last:
+            i = last
+        xs[k] = offset + x_scale * lons[k]
+        ys[k] = offset + y_scale * (intercepts[i] + slopes[i] * lat)
+    return xs, ys
+
+
+def _unproject(xs, ys, scale, offset, y_sign, typecode):
+    _check_typecode(typecode)
+    n = _check_lengths(xs, ys)
+    lats = _zeros(typecode, n)
+    lons = _zeros(typecode, n)
+    for k in range(n):
+        lons[k] = degrees((xs[k] - offset) / scale)
+        lats[k] = degrees(atan(sinh(y_sign * (ys[k] - offset) / scale)))
+    return lats, lons
+
+
+def project(lats, lons, radius=None, table=None, typecode=FLOAT64):
+    """
+    Project points to (spherical) Mercator coordinates.
+
+    Arguments:
+        lats, lons -- {sequence} -- Latitudes/longitudes in degrees (latitudes clamped to ±MAX_LATITUDE).
+        radius -- {int | float} -- Radius of the sphere (defaults to WEB_MERCATOR_RADIUS in metres).
+        table -- {MercatorTable} -- If given, interpolate the projected latitudes from this table.
+        typecode -- {string} -- Storage type of the results, FLOAT64 ('d') or FLOAT32 ('f').
+    Return:
+        {tuple} -- (xs, ys) arrays, eastings and northings in same units as radius.
+
+    Example:
+        > xs, ys = project([48.857], [2.351])     # 261712.1, 6250632.0 (metres)
+    """
+
+    if radius is None:
+        radius = WEB_MERCATOR_RADIUS
+    else:
+        radius = float(radius)
+    return _project(lats, lons, radius, 0.0, 1, table, typecode)
+
+
+def unproject(xs, ys, radius=None, typecode=FLOAT64):
+    """
+    Return the points of (spherical) Mercator coordinates: φ = atan( sinh(y / R) ), λ = x / R.
+
+    Arguments:
+        xs, ys -- {sequence} -- Eastings and northings, in same units as radius.
+        radius -- {int | float} -- Radius of the sphere (defaults to WEB_MERCATOR_RADIUS in metres).
+        typecode -- {string} -- Storage type of the results, FLOAT64 ('d') or FLOAT32 ('f').
+    Return:
+        {tuple} -- (lats, lons) arrays, in degrees.
+    """
+
+    if radius is None:
+        radius = WEB_MERCATOR_RADIUS
+    else:
+        radius = float(radius)
+    return _unproject(xs, ys, radius, 0.0, 1, typecode)
+
+
+def _pixel_scale(zoom, tile_size):
+    if zoom < 0 or tile_size <= 0:
+        raise ValueError('zoom must not be negative and tile_size must be positive')
+    size = tile_size * 2.0 ** zoom
+    return size / (2*pi), size / 2
+
+
+def toPixels(lats, lons, zoom, tile_size=TILE_SIZE, table=None, typecode=FLOAT64):
+    """
+    Project points to global pixel coordinates at a zoom level (origin at the north-west corner, y pointing south).
+
+    Arguments:
+        lats, lons -- {sequence} -- Latitudes/longitudes in degrees (latitudes clamped to ±MAX_LATITUDE).
+        zoom -- {int} -- Zoom level.
+        tile_size -- {int} -- Tile width and height in pixels (default: 256).
+        table -- {MercatorTable} -- If given, interpolate the projected latitudes from this table.
+        typecode -- {string} -- Storage type of the results, FLOAT64 ('d') or FLOAT32 ('f').
+    Return:
+        {tuple} -- (xs, ys) arrays of pixel coordinates; tiles are (x // tile_size, y // tile_size).
+
+    Example:
+        > xs, ys = toPixels([48.857], [2.351], 10)     # 132783.9, 90184.5: tile (518, 352)
+    """
+
+    scale, offset = _pixel_scale(zoom, tile_size)
+    return _project(lats, lons, scale, offset, -1, table, typecode)
+
+
+def fromPixels(xs, ys, zoom, tile_size=TILE_SIZE, typecode=FLOAT64):
+    """
+    Return the points of global pixel coordinates at a zoom level (see toPixels).
+
+    Arguments:
+        xs, ys -- {sequence} -- Pixel coordinates.
+        zoom -- {int} -- Zoom level.
+        tile_size -- {int} -- Tile width and height in pixels (default: 256).
+        typecode -- {string} -- Storage type of the results, FLOAT64 ('d') or FLOAT32 ('f').
+    Return:
+        {tuple} -- (lats, lons) arrays, in degrees.
+    """
+
+    scale, offset = _pixel_scale(zoom, tile_size)
+    return _unproject(xs, ys, scale, offset, -1, typecode)
@@ -0,0 +1,207 @@
+# -*- coding: utf-8 -*-
+
+"""
+Spherical polygon metrics (area, perimeter, centroid) on the spherical earth model, for whole
+collections of polygons.
+
+Polygons are given in a ragged layout: all vertices flattened in latitudes and longitudes sequences,
+plus offsets such that polygon k has vertices offsets[k] to offsets[k+1]-1 (the layout returned by
+latlon_batch.rangeRings). Polygons are implicitly closed; a last vertex equal to the first one is ignored.
+Edges are great circle segments.
+
+Each vertex is converted to radians and its trigonometric terms computed once, and reused by both edges
+it belongs to.
+"""
+
+from math import radians, degrees, sin, cos, tan, atan, atan2, sqrt, pi, fabs, nan
+
+from geodesy.latlon_spherical import EARTH_RADIUS
+from geodesy.latlon_batch import FLOAT64, _check_typecode, _check_lengths, _zeros
+
+
+def polygonMetrics(lats, lons, offsets, radius=None, centroid=True, typecode=FLOAT64):
+    """
+    Return area, perimeter and (optionally) centroid of each polygon.
+
+    Area is the sum of the spherical excesses of the edges (as LatLon.areaOf of the reference library):
+        E = 2 ⋅ atan( tan(Δλ/2) ⋅ (tan(φ1/2) + tan(φ2/2)) / (1 + tan(φ1/2) ⋅ tan(φ2/2)) )
+    corrected by 2π when the polygon encloses a pole. Perimeter is the sum of the haversine edge lengths.
+    Centroid is the direction of the area moment ∫ p dA = ½ Σ θ ⋅ n̂, summed over the edges, θ being
+    the edge angular length and n̂ the unit normal to its great circle.
+
+    Arguments:
+        lats, lons -- {sequence} -- Latitudes/longitudes of all vertices in degrees.
+        offsets -- {sequence} -- Start offsets of each polygon, followed by the total number of vertices.
+        radius -- {int | float} -- (Mean) radius of earth (defaults to EARTH_RADIUS in kilometres).
+        centroid -- {bool} -- Whether to compute centroids (default: True).
+        typecode -- {string} -- Storage type of the results, FLOAT64 ('d') or FLOAT32 ('f').
+    Return:
+        {dictionary} -- Dictionary of arrays: area (square units of radius), perimeter (units of radius),
+                        and centroidLat, centroidLon in degrees if asked (nan for degenerate polygons).
+
+    Example:
+        > m = polygonMetrics([0, 1, 1, 0], [0, 0, 1, 1], [0, 4])
+        > m["area"][0]      # 12364.0 (km²)
+    """
+
+    _check_typecode(typecode)
+    _check_lengths(lats, lons)
+
+    if radius is None:
+        radius = EARTH_RADIUS
+    else:
+        radius = float(radius)
+
+    count = len(offsets) - 1
+    if count < 0:
+        raise ValueError('offsets must hold at least one value')
+    areas = _zeros(typecode, count)
+    perimeters = _zeros(typecode, count)
+    centroid_lats = _zeros(typecode, count if centroid else 0)
+    centroid_lons = _zeros(typecode, count if centroid else 0)
+
+    for k in range(count):
+        start = offsets[k]
+        end = offsets[k+1]
+        if end - start > 1 and lats[end-1] == lats[start] and lons[end-1] == lons[start]:
+            end -= 1
+        n = end - start
+        if n < 3:
+            if centroid:
+                centroid_lats[k] = nan
+                centroid_lons[k] = nan
+            continue
+
+        excess = 0.0
+        total_delta_lon = 0.0
+        perimeter = 0.0
+        mx = my = mz = 0.0
+
+        # per vertex terms of the first vertex, kept to close the polygon
+        lat0 = radians(lats[start])
+        lon0 = radians(lons[start])
+        tan0 = tan(lat0/2)
+        cos_lat0 = cos(lat0)
+        if centroid:
+            x0 = cos_lat0 * cos(lon0)
+            y0 = cos_lat0 * sin(lon0)
+            z0 = sin(lat0)
+            x2, y2, z2 = x0, y0, z0
+        lat2, lon2, tan2, cos_lat2 = lat0, lon0, tan0, cos_lat0
+
+        for i in range(1, n + 1):
+            lat1, lon1, tan1, cos_lat1 = lat2, lon2, tan2, cos_lat2
+            if i < n:
+                lat2 = radians(lats[start+i])
+                lon2 = radians(lons[start+i])
+                tan2 = tan(lat2/2)
+                cos_lat2 = cos(lat2)
+            else:
+                lat2, lon2, tan2, cos_lat2 = lat0, lon0, tan0, cos_lat0
+
+            # shortest longitude difference, across the anti-meridian if needed
+            delta_lon = (lon2 - lon1 + pi) % (2*pi) - pi
+            total_delta_lon += delta_lon
+            excess += 2 * atan(tan(delta_lon/2) * (tan1 + tan2) / (1 + tan1 * tan2))
+
+            delta_lat = lat2 - lat1
+            a = sin(delta_lat/2) * sin(delta_lat/2) + \
+                   cos_lat1 * cos_lat2 * \
+                   sin(delta_lon/2) * sin(delta_lon/2)
+            angle = 2 * atan2(sqrt(a), sqrt(1-a))
+            perimeter += angle
+
+            if centroid:
+                x1, y1, z1 = x2, y2, z2
+                if i < n:
+                    x2 = cos_lat2 * cos(lon2)
+                    y2 = cos_lat2 * sin(lon2)
+                    z2 = sin(lat2)
+                else:
+                    x2, y2, z2 = x0, y0, z0
+                nx = y1 * z2 - z1 * y2
+                ny = z1 * x2 - x1 * z2
+                nz = x1 * y2 - y1 * x2
+                norm = sqrt(nx*nx + ny*ny + nz*nz)
+                if norm > 0:
+                    mx += angle * nx / norm
+                    my += angle * ny / norm
+                    mz += angle * nz / norm
+
+        # the longitudes of a polygon enclosing a pole wind once around the earth axis
+        pole_enclosed = fabs(total_delta_lon) > pi
+        if pole_enclosed:
+            signed_excess = excess
+            excess = fabs(excess) - 2*pi
+        areas[k] = fabs(excess * radius * radius)
+        perimeters[k] = perimeter * radius
+
+        if centroid:
+            # excess is positive when the polygon is on the right of its edges (clockwise), except for a
+            # polygon enclosing a pole, where it takes the sign of the travel around the pole
+            if pole_enclosed:
+                clockwise = signed_excess < 0
+            else:
+                clockwise = excess > 0
+            if clockwise:
+                mx, my, mz = -mx, -my, -mz
+            if mx == 0 and my == 0 and mz == 0:
+                centroid_lats[k] = nan
+                centroid_lons[k] = nan
+            else:
+                centroid_lats[k] = degrees(atan2(mz, sqrt(mx*mx + my*my)))
+                centroid_lons[k] = degrees(atan2(my, mx))
+
+    result = {"area": areas, "perimeter": perimeters}
+    if centroid:
+        result["centroidLat"] = centroid_lats
+        result["centroidLon"] = centroid_lons
+    return result
+
+
+def polygonAreas(lats, lons, offsets, radius=None, typecode=FLOAT64):
+    """
+    Return the area of each polygon (see polygonMetrics).
+
+    Arguments:
+        lats, lons -- {sequence} -- Latitudes/longitudes of all vertices in degrees.
+        offsets -- {sequence} -- Start offsets of each polygon, followed by the total number of vertices.
+        radius -- {int | float} -- (Mean) radius of earth (defaults to EARTH_RADIUS in kilometres).
+        typecode -- {string} -- Storage type of the results, FLOAT64 ('d') or FLOAT32 ('f').
+    Return:
+        {array} -- Areas, in square units of radius.
+    """
+
+    return polygonMetrics(lats, lons, offsets, radius, False, typecode)["area"]
+
+
+def polygonPerimeters(lats, lons, offsets, radius=None, typecode=FLOAT64):
+    """
+    Return the perimeter of each polygon (see polygonMetrics).
+
+    Arguments:
+        lats, lons -- {sequence} -- Latitudes/longitudes of all vertices in degrees.
+        offsets -- {sequence} -- Start offsets of each polygon, followed by the total number of vertices.
+        radius -- {int | float} -- (Mean) radius of earth (defaults to EARTH_RADIUS in kilometres).
+        typecode -- {string} -- Storage type of the results, FLOAT64 ('d') or FLOAT32 ('f').
+    Return:
+        {array} -- Perimeters, in same units as radius.
+    """
+
+    return polygonMetrics(lats, lons, offsets, radius, False, typecode)["perimeter"]
+
+
+def polygonCentroids(lats, lons, offsets, typecode=FLOAT64):
+    """
+    Return the centroid of each polygon (see polygonMetrics).
+
+    Arguments:
+        lats, lons -- {sequence} -- Latitudes/longitudes of all vertices in degrees.
+        offsets -- {sequence} -- Start offsets of each polygon, followed by the total number of vertices.
+        typecode -- {string} -- Storage type of the results, FLOAT64 ('d') or FLOAT32 ('f').
+    Return:
+        {tuple} -- (lats, lons) arrays of centroids, in degrees.
+    """
+
+    metrics = polygonMetrics(lats, lons, offsets, None, True, typecode)
+    return metrics["centroidLat"], metrics["centroidLon"]
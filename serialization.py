@@ -0,0 +1,357 @@
+# -*- coding: utf-8 -*-
+
+"""
+Compact serialization of sequences of points.
+
+Three formats are available:
+    - Google encoded polyline strings (fixed-point deltas in printable ASCII), with configurable precision.
+    - Varint binary: fixed-point deltas, zigzag then LEB128 varint encoded (1 to 3 bytes per coordinate
+      for typical tracks).
+    - Packed: raw little-endian float64 or float32 (lat, lon) pairs.
+
+Encoders accept any iterable of LatLon objects or of (lat, lon) pairs - use zip(lats, lons) for arrays.
+Streaming encoders (iterEncode*) yield chunks as they go, and streaming decoders (iterDecode*) consume
+any iterable of chunks (eg a file read by blocks) and yield (lat, lon) pairs, so that large inputs are
+never held in intermediate lists.
+"""
+
+from array import array
+from math import floor
+import struct
+import sys
+
+from geodesy.latlon_spherical import LatLon
+from geodesy.latlon_batch import FLOAT64, FLOAT32, _check_typecode
+
+_PACKED_PAIR = {
+    FLOAT64: struct.Struct('<dd'),
+    FLOAT32: struct.Struct('<ff'),
+}
+
+
+def _coordinates(points):
+    for point in points:
+        if isinstance(point, LatLon):
+            yield point.lat, point.lon
+        else:
+            lat, lon = point
+            yield lat, lon
+
+
+def _fixed_point_deltas(points, precision):
+    factor = 10 ** precision
+    previous_lat = 0
+    previous_lon = 0
+    for lat, lon in _coordinates(points):
+        # round half up, as Math.round of the reference implementation
+        lat = int(floor(lat * factor + 0.5))
+        lon = int(floor(lon * factor + 0.5))
+        yield lat - previous_lat, lon - previous_lon
+        previous_lat = lat
+        previous_lon = lon
+
+
+def _check_precision(precision):
+    if not isinstance(precision, int) or precision < 0:
+        raise ValueError('precision must be a positive integer')
+
+
+def _to_arrays(pairs, typecode):
+    _check_typecode(typecode)
+    lats = array(typecode)
+    lons = array(typecode)
+    for lat, lon in pairs:
+        lats.append(lat)
+        lons.append(lon)
+    return lats, lons
+
+
+def _encode_polyline_value(value):
+    value = ~(value << 1) if value < 0 else value << 1
+    chars = []
+    while value >= 0x20:
+        chars.append(chr((0x20 | (value & 0x1f)) + 63))
+        value >>= 5
+    chars.append(chr(value + 63))
+    return ''.join(chars)
+
+
+def iterEncodePolyline(points, precision=5):
+    """
+    Encode points as a Google encoded polyline, yielding one string chunk per point.
+
+    Arguments:
+        points -- {iterable} -- LatLon points or (lat, lon) pairs.
+        precision -- {int} -- Number of decimals kept (default: 5, as Google maps; 6 for OSRM).
+    Return:
+        {generator} -- Encoded chunks, to be concatenated.
+    """
+
+    _check_precision(precision)
+    for delta_lat, delta_lon in _fixed_point_deltas(points, precision):
+        yield _encode_polyline_value(delta_lat) + _encode_polyline_value(delta_lon)
+
+
+def encodePolyline(points, precision=5):
+    """
+    Return points encoded as a Google encoded polyline string.
+
+    Arguments:
+        points -- {iterable} -- LatLon points or (lat, lon) pairs.
+        precision -- {int} -- Number of decimals kept (default: 5).
+    Return:
+        {string} -- Encoded polyline.
+
+    Example:
+        > encodePolyline([(38.5, -120.2), (40.7, -120.95), (43.252, -126.453)])
+        > _p~iF~ps|U_ulLnnqC_mqNvxq`@
+    """
+
+    return ''.join(iterEncodePolyline(points, precision))
+
+
+def iterDecodePolyline(chunks, precision=5):
+    """
+    Decode a Google encoded polyline given as an iterable of string chunks, yielding (lat, lon) pairs.
+    Chunks may be cut anywhere.
+
+    Arguments:
+        chunks -- {iterable} -- Chunks of the encoded polyline (a single string is also accepted).
+        precision -- {int} -- Number of decimals used for encoding (default: 5).
+    Return:
+        {generator} -- (lat, lon) pairs in degrees.
+    """
+
+    _check_precision(precision)
+    if isinstance(chunks, str):
+        chunks = (chunks,)
+
+    factor = 10 ** precision
+    coordinates = [0, 0]
+    index = 0
+    value = 0
+    shift = 0
+    for chunk in chunks:
+        for char in chunk:
+            byte = ord(char) - 63
+            if byte < 0 or byte > 0x3f:
+                raise ValueError('invalid character in encoded polyline: {!r}'.format(char))
+            value |= (byte & 0x1f) << shift
+            if byte & 0x20:
+                shift += 5
+                continue
+            coordinates[index] += ~(value >> 1) if value & 1 else value >> 1
+            value = 0
+            shift = 0
+            if index:
+                yield coordinates[0] / factor, coordinates[1] / factor
+            index ^= 1
+    if shift or index:
+        raise ValueError('truncated encoded polyline')
+
+
+def decodePolyline(encoded, precision=5, typecode=FLOAT64):
+    """
+    Decode a Google encoded polyline into latitudes and longitudes arrays.
+
+    Arguments:
+        encoded -- {string | iterable} -- Encoded polyline, or iterable of chunks of it.
+        precision -- {int} -- Number of decimals used for encoding (default: 5).
+        typecode -- {string} -- FLOAT64 ('d') or FLOAT32 ('f') (default: FLOAT64).
+    Return:
+        {tuple} -- (lats, lons) arrays, in degrees.
+    """
+
+    return _to_arrays(iterDecodePolyline(encoded, precision), typecode)
+
+
+def _encode_varint_value(value, out):
+    value = ~(value << 1) if value < 0 else value << 1
+    while value >= 0x80:
+        out.append(0x80 | (value & 0x7f))
+        value >>= 7
+    out.append(value)
+
+
+def iterEncodeVarint(points, precision=7, chunk_size=65536):
+    """
+    Encode points as fixed-point deltas, zigzag and varint encoded, yielding bytes chunks.
+
+    Arguments:
+        points -- {iterable} -- LatLon points or (lat, lon) pairs.
+        precision -- {int} -- Number of decimals kept (default: 7, ie ~1 cm).
+        chunk_size -- {int} -- Approximate size of yielded chunks, in bytes (default: 65536).
+    Return:
+        {generator} -- Encoded bytes chunks, to be concatenated.
+    """
+
+    _check_precision(precision)
+    out = bytearray()
+    for delta_lat, delta_lon in _fixed_point_deltas(points, precision):
+        _encode_varint_value(delta_lat, out)
+        _encode_varint_value(delta_lon, out)
+        if len(out) >= chunk_size:
+            yield bytes(out)
+            out.clear()
+    if out:
+        yield bytes(out)
+
+
+def encodeVarint(points, precision=7):
+    """
+    Return points encoded as fixed-point deltas, zigzag and varint encoded.
+
+    Arguments:
+        points -- {iterable} -- LatLon points or (lat, lon) pairs.
+        precision -- {int} -- Number of decimals kept (default: 7).
+    Return:
+        {bytes} -- Encoded points.
+    """
+
+    return b''.join(iterEncodeVarint(points, precision))
+
+
+def iterDecodeVarint(chunks, precision=7):
+    """
+    Decode varint encoded points given as an iterable of bytes chunks, yielding (lat, lon) pairs.
+    Chunks may be cut anywhere.
+
+    Arguments:
+        chunks -- {iterable} -- Chunks of encoded data (a single bytes object is also accepted).
+        precision -- {int} -- Number of decimals used for encoding (default: 7).
+    Return:
+        {generator} -- (lat, lon) pairs in degrees.
+    """
+
+    _check_precision(precision)
+    if isinstance(chunks, (bytes, bytearray, memoryview)):
+        chunks = (chunks,)
+
+    factor = 10 ** precision
+    coordinates = [0, 0]
+    index = 0
+    value = 0
+    shift = 0
+    for chunk in chunks:
+        for byte in bytes(chunk):
+            value |= (byte & 0x7f) << shift
+            if byte & 0x80:
+                shift += 7
+                continue
+            coordinates[index] += ~(value >> 1) if value & 1 else value >> 1
+            value = 0
+            shift = 0
+            if index:
+                yield coordinates[0] / factor, coordinates[1] / factor
+            index ^= 1
+    if shift or index:
+        raise ValueError('truncated varint data')
+
+
+def decodeVarint(data, precision=7, typecode=FLOAT64):
+    """
+    Decode varint encoded points into latitudes and longitudes arrays.
+
+    Arguments:
+        data -- {bytes | iterable} -- Encoded data, or iterable of chunks of it.
+        precision -- {int} -- Number of decimals used for encoding (default: 7).
+        typecode -- {string} -- FLOAT64 ('d') or FLOAT32 ('f') (default: FLOAT64).
+    Return:
+        {tuple} -- (lats, lons) arrays, in degrees.
+    """
+
+    return _to_arrays(iterDecodeVarint(data, precision), typecode)
+
+
+def iterPack(points, typecode=FLOAT64, chunk_size=65536):
+    """
+    Pack points as little-endian (lat, lon) float pairs, yielding bytes chunks.
+
+    Arguments:
+        points -- {iterable} -- LatLon points or (lat, lon) pairs.
+        typecode -- {string} -- FLOAT64 ('d', 16 bytes per point) or FLOAT32 ('f', 8 bytes per point).
+        chunk_size -- {int} -- Approximate size of yielded chunks, in bytes (default: 65536).
+    Return:
+        {generator} -- Packed bytes chunks, to be concatenated.
+    """
+
+    _check_typecode(typecode)
+
+    values = array(typecode)
+    max_values = max(2, chunk_size // values.itemsize)
+    for lat, lon in _coordinates(points):
+        values.append(lat)
+        values.append(lon)
+        if len(values) >= max_values:
+            if sys.byteorder != 'little':
+                values.byteswap()
+            yield values.tobytes()
+            values = array(typecode)
+    if values:
+        if sys.byteorder != 'little':
+            values.byteswap()
+        yield values.tobytes()
+
+
+def pack(points, typecode=FLOAT64):
+    """
+    Return points packed as little-endian (lat, lon) float pairs.
+
+    Arguments:
+        points -- {iterable} -- LatLon points or (lat, lon) pairs.
+        typecode -- {string} -- FLOAT64 ('d') or FLOAT32 ('f') (default: FLOAT64).
+    Return:
+        {bytes} -- Packed points.
+    """
+
+    return b''.join(iterPack(points, typecode))
+
+
+def iterUnpack(chunks, typecode=FLOAT64):
+    """
+    Unpack little-endian (lat, lon) float pairs given as an iterable of bytes chunks, yielding (lat, lon) pairs.
+    Chunks may be cut anywhere.
+
+    Arguments:
+        chunks -- {iterable} -- Chunks of packed data (a single bytes object is also accepted).
+        typecode -- {string} -- FLOAT64 ('d') or FLOAT32 ('f') (default: FLOAT64).
+    Return:
+        {generator} -- (lat, lon) pairs in degrees.
+    """
+
+    _check_typecode(typecode)
+    if isinstance(chunks, (bytes, bytearray, memoryview)):
+        chunks = (chunks,)
+
+    pair = _PACKED_PAIR[typecode]
+    pending = b''
+    for chunk in chunks:
+        if pending:
+            chunk = pending + bytes(chunk)
+        end = len(chunk) - len(chunk) % pair.size
+        yield from pair.iter_unpack(memoryview(chunk)[:end])
+        pending = bytes(chunk[end:])
+    if pending:
+        raise ValueError('truncated packed data')
+
+
+def unpack(data, typecode=FLOAT64):
+    """
+    Unpack little-endian (lat, lon) float pairs into latitudes and longitudes arrays.
+
+    Arguments:
+        data -- {bytes} -- Packed points.
+        typecode -- {string} -- FLOAT64 ('d') or FLOAT32 ('f') (default: FLOAT64).
+    Return:
+        {tuple} -- (lats, lons) arrays, in degrees, with the typecode they were packed with.
+    """
+
+    _check_typecode(typecode)
+
+    values = array(typecode)
+    if len(data) % (2 * values.itemsize):
+        raise ValueError('truncated packed data')
+    values.frombytes(data)
+    if sys.byteorder != 'little':
+        values.byteswap()
+    return values[0::2], values[1::2]
@@ -0,0 +1,373 @@
+# -*- coding: utf-8 -*-
+
+"""
+Asyncio TCP service exposing the LatLon operations, with micro-batching of concurrent requests.
+
+Protocol: newline-delimited JSON. Each request line is an object with an 'id' (echoed back), an 'op'
+and its arguments; each response line holds the 'id' and either a 'result' or an 'error'.
+Responses of a connection may come back in a different order than requests.
+
+    {"id": 1, "op": "distance", "lat1": 52.205, "lon1": 0.119, "lat2": 48.857, "lon2": 2.351}
+    {"id": 1, "result": 404.2792...}
+
+Operations:
+    distance, bearing, finalBearing -- lat1, lon1, lat2, lon2 (and radius for distance)
+    inverse -- lat1, lon1, lat2, lon2, radius: {"distance", "initialBearing", "finalBearing"}
+    destination -- lat, lon, distance, bearing, radius: {"lat", "lon"}
+    metrics -- no argument: see ServiceMetrics.snapshot
+
+Request lines are limited to MAX_LINE bytes: a longer line is skipped, and answered with an error
+(and a null 'id').
+
+Requests arriving within a small time window are grouped by operation (and radius), and computed
+with a single latlon_batch call. Pending requests are held in a bounded queue: when it is full,
+connections stop being read until it drains, so that clients are slowed down by TCP flow control.
+
+Example:
+    > python -m geodesy.service --port 8765
+"""
+
+import asyncio
+from array import array
+from collections import deque
+import json
+from math import isfinite
+import time
+
+from geodesy import latlon_batch
+
+# Maximum length of a request line, in bytes
+MAX_LINE = 65536
+
+
+def _pairs(requests):
+    lats1 = [float(r["lat1"]) for r in requests]
+    lons1 = [float(r["lon1"]) for r in requests]
+    lats2 = [float(r["lat2"]) for r in requests]
+    lons2 = [float(r["lon2"]) for r in requests]
+    return lats1, lons1, lats2, lons2
+
+
+def _distance(requests, radius):
+    return list(latlon_batch.distances(*_pairs(requests), radius=radius))
+
+
+def _bearing(requests, radius):
+    return list(latlon_batch.bearings(*_pairs(requests)))
+
+
+def _final_bearing(requests, radius):
+    return list(latlon_batch.finalBearings(*_pairs(requests)))
+
+
+def _inverse(requests, radius):
+    inv = latlon_batch.inverse(*_pairs(requests), radius=radius)
+    return [{"distance": d, "initialBearing": b1, "finalBearing": b2}
+            for d, b1, b2 in zip(inv["distance"], inv["initialBearing"], inv["finalBearing"])]
+
+
+def _destination(requests, radius):
+    # distances travelled in one unit of time, the points being updated in place
+    lats = array('d', [float(r["lat"]) for r in requests])
+    lons = array('d', [float(r["lon"]) for r in requests])
+    distances = [float(r["distance"]) for r in requests]
+    bearings = [float(r["bearing"]) for r in requests]
+    latlon_batch.propagate(lats, lons, distances, bearings, 1, radius=radius)
+    return [{"lat": lat, "lon": lon} for lat, lon in zip(lats, lons)]
+
+
+OPERATIONS = {
+    "distance": _distance,
+    "bearing": _bearing,
+    "finalBearing": _final_bearing,
+    "inverse": _inverse,
+    "destination": _destination,
+}
+
+
+class ServiceMetrics(object):
+    """
+    Batch size and queue latency metrics of a MicroBatcher.
+
+    Queue latency is the time between a request being queued and its batch being computed;
+    percentiles are computed over the last 'samples' requests.
+    """
+
+    def __init__(self, samples=10000):
+        self.requests = 0
+        self.batches = 0
+        self.max_batch_size = 0
+        self.latencies = deque(maxlen=samples)
+
+    def record(self, batch_size, latencies):
+        self.requests += batch_size
+        self.batches += 1
+        self.max_batch_size = max(self.max_batch_size, batch_size)
+        self.latencies.extend(latencies)
+
+    def snapshot(self):
+        """
+        Return current metrics.
+
+        Return:
+            {dictionary} -- requests, batches, meanBatchSize, maxBatchSize, and queue latencies
+                            (latencyMean, latencyP50, latencyP99, latencyMax) in seconds.
+        """
+
+        latencies = sorted(self.latencies)
+        n = len(latencies)
+        return {
+            "requests": self.requests,
+            "batches": self.batches,
+            "meanBatchSize": self.requests / self.batches if self.batches else 0,
+            "maxBatchSize": self.max_batch_size,
+            "latencyMean": sum(latencies) / n if n else 0,
+            "latencyP50": latencies[int(0.5 * (n-1))] if n else 0,
+            "latencyP99": latencies[int(0.99 * (n-1))] if n else 0,
+            "latencyMax": latencies[-1] if n else 0,
+        }
+
+
+class MicroBatcher(object):
+    """
+    Group concurrent requests arriving within a time window into batch calls.
+    """
+
+    def __init__(self, window=0.002, max_batch=4096, max_pending=65536):
+        """
+        Arguments:
+            window -- {float} -- Time to wait for more requests once one is queued, in seconds (default: 2 ms).
+            max_batch -- {int} -- Maximum number of requests computed at once (default: 4096).
+            max_pending -- {int} -- Maximum number of queued requests before submitters wait (default: 65536).
+        """
+
+        self.window = window
+        self.max_batch = max_batch
+        self.metrics = ServiceMetrics()
+        self._queue = asyncio.Queue(max_pending)
+        self._task = None
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._run())
+
+    async def close(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def enqueue(self, request):
+        """
+        Queue a request, waiting while the queue is full.
+
+        Arguments:
+            request -- {dictionary} -- Request with its 'op' and arguments.
+        Return:
+            {asyncio.Future} -- Future of the request result.
+        """
+
+        op = request.get("op")
+        if not isinstance(op, str) or op not in OPERATIONS:
+            raise ValueError('unknown operation {!r}'.format(op))
+        # the radius is part of the batch key: it must be hashable, and valid for the whole batch
+        radius = request.get("radius")
+        if radius is not None:
+            try:
+                radius = float(radius)
+            except (TypeError, ValueError):
+                raise ValueError('radius must be a number')
+            if not (isfinite(radius) and radius > 0):
+                raise ValueError('radius must be positive and finite')
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put(((op, radius), request, future, time.perf_counter()))
+        return future
+
+    async def submit(self, request):
+        """
+        Queue a request and return its result.
+        """
+
+        return await (await self.enqueue(request))
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            items = [await self._queue.get()]
+            deadline = loop.time() + self.window
+            while len(items) < self.max_batch:
+                if self._queue.empty():
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        items.append(await asyncio.wait_for(self._queue.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+                else:
+                    items.append(self._queue.get_nowait())
+            try:
+                self._compute(items)
+            except Exception as e:
+                # never let the batcher die: fail the requests left unanswered
+                for item in items:
+                    if not item[2].done():
+                        item[2].set_exception(ValueError('internal error: {}'.format(e)))
+
+    def _compute(self, items):
+        start = time.perf_counter()
+        groups = {}
+        for item in items:
+            groups.setdefault(item[0], []).append(item)
+
+        for (op, radius), group in groups.items():
+            group = [item for item in group if not item[2].cancelled()]
+            if not group:
+                continue
+            requests = [item[1] for item in group]
+            try:
+                results = OPERATIONS[op](requests, radius)
+            except Exception:
+                # a bad request fails the batch: compute requests one by one to isolate it
+                results = None
+            for k, (key, request, future, queued) in enumerate(group):
+                if results is not None:
+                    future.set_result(results[k])
+                    continue
+                try:
+                    future.set_result(OPERATIONS[op]([request], radius)[0])
+                except Exception as e:
+                    future.set_exception(ValueError('invalid request: {}'.format(e)))
+        self.metrics.record(len(items), [start - item[3] for item in items])
+
+
+class GeodesyServer(object):
+    """
+    TCP server of newline-delimited JSON requests, computed through a MicroBatcher.
+
+    Example:
+        > server = GeodesyServer('127.0.0.1', 0)
+        > await server.start()
+        > port = server.port
+    """
+
+    def __init__(self, host='127.0.0.1', port=8765, window=0.002, max_batch=4096, max_pending=65536):
+        self.host = host
+        self.port = port
+        self.batcher = MicroBatcher(window, max_batch, max_pending)
+        self._server = None
+
+    async def start(self):
+        self.batcher.start()
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port, limit=MAX_LINE)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        await self.batcher.close()
+
+    async def serve_forever(self):
+        await self.start()
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.close()
+
+    async def _handle_connection(self, reader, writer):
+        pending = set()
+        try:
+            while True:
+                try:
+                    line = await reader.readuntil(b'\n')
+                except asyncio.IncompleteReadError as e:
+                    # end of stream, possibly after a last line without newline
+                    line = e.partial
+                except asyncio.LimitOverrunError:
+                    await self._skipLine(reader)
+                    self._respond(writer, None, error='request line longer than {} bytes'.format(MAX_LINE))
+                    continue
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                request = None
+                try:
+                    request = json.loads(line)
+                    request_id = request.get("id")
+                    if request.get("op") == "metrics":
+                        self._respond(writer, request_id, result=self.batcher.metrics.snapshot())
+                        continue
+                    # waits while the queue is full, so that this connection is not read any further
+                    future = await self.batcher.enqueue(request)
+                except (ValueError, AttributeError) as e:
+                    self._respond(writer, None if not isinstance(request, dict) else request.get("id"),
+                                  error=str(e))
+                    continue
+                task = asyncio.ensure_future(self._reply(writer, request_id, future))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+            if pending:
+                await asyncio.gather(*pending)
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            for task in pending:
+                task.cancel()
+            writer.close()
+
+    async def _skipLine(self, reader):
+        # discard the rest of a line longer than the stream limit, up to its newline or the end of stream
+        while True:
+            try:
+                await reader.readuntil(b'\n')
+                return
+            except asyncio.LimitOverrunError as e:
+                await reader.readexactly(e.consumed)
+            except asyncio.IncompleteReadError:
+                return
+
+    async def _reply(self, writer, request_id, future):
+        try:
+            result = await future
+        except ValueError as e:
+            self._respond(writer, request_id, error=str(e))
+        else:
+            self._respond(writer, request_id, result=result)
+        await writer.drain()
+
+    def _respond(self, writer, request_id, result=None, error=None):
+        response = {"id": request_id}
+        if error is None:
+            response["result"] = result
+        else:
+            response["error"] = error
+        writer.write(json.dumps(response).encode('utf-8') + b'\n')
+
+
+async def serve(host='127.0.0.1', port=8765, window=0.002, max_batch=4096, max_pending=65536):
+    """
+    Run a GeodesyServer until cancelled.
+    """
+
+    server = GeodesyServer(host, port, window, max_batch, max_pending)
+    await server.serve_forever()
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Geodesy micro-batching TCP service')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--window', type=float, default=0.002, help='batching window in seconds')
+    parser.add_argument('--max-batch', type=int, default=4096)
+    parser.add_argument('--max-pending', type=int, default=65536)
+    args = parser.parse_args()
+    asyncio.run(serve(args.host, args.port, args.window, args.max_batch, args.max_pending))
@@ -0,0 +1,290 @@
+# -*- coding: utf-8 -*-
+
+"""
+Online statistics over streams of positions: geographic mean, dispersion, bounding extent and
+distance travelled, updated in O(1) per point (amortised for sliding windows).
+
+The mean is the direction of the sum of the unit vectors of the points; unit vectors are accumulated
+relative to the first point of the accumulator, so that the dispersion of tight clusters does not suffer
+from cancellation. Distance travelled is the sum of the haversine distances between consecutive points,
+reusing the cosine of latitude of the previous point.
+"""
+
+from collections import deque
+from math import radians, degrees, sin, cos, atan2, sqrt, nan
+
+from geodesy.latlon_spherical import LatLon, EARTH_RADIUS
+
+
+class PositionStats(object):
+    """
+    Incremental statistics of a stream of positions, optionally over a sliding window of the last points.
+
+    Example:
+        > stats = PositionStats()
+        > for lat, lon in positions:
+        >     stats.add(lat, lon)
+        > stats.mean().toString(), stats.distance
+    """
+
+    def __init__(self, window=None, radius=None):
+        """
+        Arguments:
+            window -- {int} -- If given, statistics only cover the last 'window' points.
+            radius -- {int | float} -- (Mean) radius of earth (defaults to EARTH_RADIUS in kilometres).
+        """
+
+        if window is not None and window < 1:
+            raise ValueError('window must be positive')
+        if radius is None:
+            radius = EARTH_RADIUS
+        else:
+            radius = float(radius)
+
+        self.window = window
+        self.radius = radius
+        self.count = 0
+        self.distance = 0.0
+        # reference unit vector, sums of unit vectors relative to it and of their squared norms
+        self._reference = None
+        self._x = 0.0
+        self._y = 0.0
+        self._z = 0.0
+        self._squares = 0.0
+        self._min_lat = None
+        self._max_lat = None
+        self._min_lon = None
+        self._max_lon = None
+        self._first = None
+        self._last = None
+        if window is not None:
+            # points (x, y, z, distance from previous point) of the window, and monotonic
+            # deques of (index, value) for the extent
+            self._points = deque()
+            self._index = 0
+            self._extremes = [deque() for _ in range(4)]
+
+    def add(self, lat, lon):
+        """
+        Add a position.
+
+        Arguments:
+            lat -- {float} -- Latitude in degrees.
+            lon -- {float} -- Longitude in degrees.
+        """
+
+        lat_rad = radians(lat)
+        lon_rad = radians(lon)
+        cos_lat = cos(lat_rad)
+        x = cos_lat * cos(lon_rad)
+        y = cos_lat * sin(lon_rad)
+        z = sin(lat_rad)
+
+        step = 0.0
+        if self._last is not None:
+            previous_lat, previous_lon, previous_cos_lat = self._last
+            delta_lat = lat_rad - previous_lat
+            delta_lon = lon_rad - previous_lon
+            a = sin(delta_lat/2) * sin(delta_lat/2) + \
+                   previous_cos_lat * cos_lat * \
+                   sin(delta_lon/2) * sin(delta_lon/2)
+            step = self.radius * 2 * atan2(sqrt(a), sqrt(1-a))
+            self.distance += step
+        else:
+            self._first = (lat_rad, lon_rad, cos_lat)
+        self._last = (lat_rad, lon_rad, cos_lat)
+
+        if self._reference is None:
+            self._reference = (x, y, z)
+        self.count += 1
+        self._accumulate(x, y, z, 1)
+
+        if self.window is None:
+            if self._min_lat is None:
+                self._min_lat = self._max_lat = lat
+                self._min_lon = self._max_lon = lon
+            else:
+                self._min_lat = min(self._min_lat, lat)
+                self._max_lat = max(self._max_lat, lat)
+                self._min_lon = min(self._min_lon, lon)
+                self._max_lon = max(self._max_lon, lon)
+            return
+
+        index = self._index
+        self._index += 1
+        self._points.append((x, y, z, step))
+        for extremes, value, sign in zip(self._extremes, (lat, lat, lon, lon), (1, -1, 1, -1)):
+            # minimum (sign 1) or maximum (sign -1) of the window is at the head of the deque
+            while extremes and sign * extremes[-1][1] >= sign * value:
+                extremes.pop()
+            extremes.append((index, value))
+
+        if len(self._points) > self.window:
+            self._evict()
+
+    def _accumulate(self, x, y, z, sign):
+        x -= self._reference[0]
+        y -= self._reference[1]
+        z -= self._reference[2]
+        self._x += sign * x
+        self._y += sign * y
+        self._z += sign * z
+        self._squares += sign * (x*x + y*y + z*z)
+
+    def _rebase(self, reference):
+        # move the sums relative to a new reference r from the current one r':
+        #   Σ (p − r) = Σ (p − r') + n ⋅ (r' − r)
+        #   Σ |p − r|² = Σ |p − r'|² + 2 (r' − r) ⋅ Σ (p − r') + n ⋅ |r' − r|²
+        n = self.count
+        dx = self._reference[0] - reference[0]
+        dy = self._reference[1] - reference[1]
+        dz = self._reference[2] - reference[2]
+        self._squares += 2 * (dx * self._x + dy * self._y + dz * self._z) + n * (dx*dx + dy*dy + dz*dz)
+        self._x += n * dx
+        self._y += n * dy
+        self._z += n * dz
+        self._reference = reference
+
+    def _evict(self):
+        x, y, z, _ = self._points.popleft()
+        self.count -= 1
+        self._accumulate(x, y, z, -1)
+        # the distance from the evicted point to the next one leaves the window
+        next_x, next_y, next_z, step = self._points[0]
+        self.distance -= step
+        self._points[0] = (next_x, next_y, next_z, 0.0)
+        # keep the reference within the window, as the positions may drift far from it
+        if self._index % self.window == 0:
+            self._rebase((next_x, next_y, next_z))
+        oldest = self._index - len(self._points)
+        for extremes in self._extremes:
+            if extremes[0][0] < oldest:
+                extremes.popleft()
+
+    def extend(self, lats, lons):
+        """
+        Add positions from latitudes and longitudes sequences.
+        """
+
+        for lat, lon in zip(lats, lons):
+            self.add(lat, lon)
+
+    def mean(self):
+        """
+        Return the geographic mean of the positions (direction of the sum of their unit vectors).
+
+        Return:
+            {LatLon | None} -- Mean position, or None if there is no position (or they cancel out).
+        """
+
+        if self.count == 0:
+            return None
+        x, y, z = self._sum()
+        if x == 0 and y == 0 and z == 0:
+            return None
+        return LatLon(degrees(atan2(z, sqrt(x*x + y*y))), degrees(atan2(y, x)))
+
+    def _sum(self):
+        # sum of the unit vectors
+        x0, y0, z0 = self._reference
+        return self._x + self.count * x0, self._y + self.count * y0, self._z + self.count * z0
+
+    def resultantLength(self):
+        """
+        Return the mean resultant length |Σ p| / n of the unit vectors: 1 when all positions are
+        the same, near 0 when they are spread around the globe.
+        """
+
+        if self.count == 0:
+            return nan
+        x, y, z = self._sum()
+        return min(1.0, sqrt(x*x + y*y + z*z) / self.count)
+
+    def dispersion(self):
+        """
+        Return the dispersion of the positions around their mean, as a distance: R ⋅ √(1 − R̄²), R̄ being
+        the mean resultant length, ie the root mean square of the (chord) distances from the unit vectors
+        to their mean vector. For close positions, this is the root mean square of their distances to
+        the mean.
+
+        Return:
+            {float} -- Dispersion, in same units as radius.
+        """
+
+        if self.count == 0:
+            return nan
+        # variance of the unit vectors relative to the reference one, free of cancellation for tight clusters
+        n = self.count
+        variance = self._squares / n - (self._x*self._x + self._y*self._y + self._z*self._z) / (n*n)
+        return self.radius * sqrt(max(0.0, variance))
+
+    def bounds(self):
+        """
+        Return the bounding extent of the positions (longitudes taken as given, without wrapping
+        across the anti-meridian).
+
+        Return:
+            {tuple | None} -- (min lat, min lon, max lat, max lon) in degrees, or None if there is no position.
+        """
+
+        if self.count == 0:
+            return None
+        if self.window is None:
+            return self._min_lat, self._min_lon, self._max_lat, self._max_lon
+        min_lats, max_lats, min_lons, max_lons = self._extremes
+        return min_lats[0][1], min_lons[0][1], max_lats[0][1], max_lons[0][1]
+
+    def merge(self, other):
+        """
+        Merge the statistics of another accumulator, whose positions follow those of 'self' point (the
+        distance between the last position of 'self' and the first position of other is added).
+        Windowed accumulators cannot be merged.
+
+        Arguments:
+            other -- {PositionStats} -- Accumulator to merge.
+        Return:
+            {PositionStats} -- 'self', updated.
+
+        Example:
+            > total = PositionStats()
+            > for partial in worker_results:   # in stream order
+            >     total.merge(partial)
+        """
+
+        if not isinstance(other, PositionStats):
+            raise TypeError('other is not PositionStats object')
+        if self.window is not None or other.window is not None:
+            raise ValueError('windowed statistics cannot be merged')
+        if other.radius != self.radius:
+            raise ValueError('statistics use different radius')
+        if other.count == 0:
+            return self
+        if self.count == 0:
+            self._first = other._first
+            self._reference = other._reference
+            self._min_lat, self._min_lon = other._min_lat, other._min_lon
+            self._max_lat, self._max_lon = other._max_lat, other._max_lon
+        else:
+            previous_lat, previous_lon, previous_cos_lat = self._last
+            lat, lon, cos_lat = other._first
+            delta_lat = lat - previous_lat
+            delta_lon = lon - previous_lon
+            a = sin(delta_lat/2) * sin(delta_lat/2) + \
+                   previous_cos_lat * cos_lat * \
+                   sin(delta_lon/2) * sin(delta_lon/2)
+            self.distance += self.radius * 2 * atan2(sqrt(a), sqrt(1-a))
+            self._min_lat = min(self._min_lat, other._min_lat)
+            self._max_lat = max(self._max_lat, other._max_lat)
+            self._min_lon = min(self._min_lon, other._min_lon)
+            self._max_lon = max(self._max_lon, other._max_lon)
+
+        self._rebase(other._reference)
+        self._x += other._x
+        self._y += other._y
+        self._z += other._z
+        self._squares += other._squares
+
+        self._last = other._last
+        self.count += other.count
+        self.distance += other.distance
+        return self
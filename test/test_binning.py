@@ -0,0 +1,99 @@
+import random
+import unittest
+from math import pi
+from geodesy.binning import LatLonGrid, EqualAreaGrid, DensityGrid
+
+
+class GridTestCase(unittest.TestCase):
+    def test_latLonGrid(self):
+        grid = LatLonGrid(180, 360)
+        self.assertEqual(len(grid), 64800)
+        self.assertEqual(grid.cellIndex(48.857, 2.351), 138 * 360 + 182)
+        self.assertEqual(grid.cellIndex(-90, -180), 0)
+        self.assertEqual(grid.cellIndex(90, 180), 179 * 360)
+        self.assertEqual(grid.cellIndex(0, 540), grid.cellIndex(0, 180))
+        self.assertEqual(grid.cellBounds(138 * 360 + 182), (48, 2, 49, 3))
+        self.assertIsNone(grid.cellIndex(91, 0))
+        total = sum(grid.cellArea(row * 360) * 360 for row in range(180))
+        self.assertAlmostEqual(total / (4 * pi * 6371.009 ** 2), 1)
+
+    def test_regional(self):
+        # grid across the anti-meridian
+        grid = LatLonGrid(10, 20, south=-10, west=170, north=10, east=190)
+        self.assertEqual(grid.cellIndex(0.5, 179.5), 5 * 20 + 9)
+        self.assertEqual(grid.cellIndex(0.5, -179.5), 5 * 20 + 10)
+        self.assertIsNone(grid.cellIndex(0, 0))
+        self.assertIsNone(grid.cellIndex(-11, 175))
+        self.assertEqual(list(grid.indices([0.5, 0, 0], [179.5, 0, -170])), [109, -1, 119])
+        with self.assertRaises(ValueError):
+            LatLonGrid(10, 10, south=10, north=0)
+        with self.assertRaises(ValueError):
+            LatLonGrid(0, 10)
+
+    def test_equalAreaGrid(self):
+        grid = EqualAreaGrid(100, 200)
+        areas = [grid.cellArea(row * 200) for row in range(100)]
+        self.assertAlmostEqual(min(areas) / max(areas), 1)
+        self.assertAlmostEqual(areas[0] * len(grid) / (4 * pi * 6371.009 ** 2), 1)
+        self.assertEqual(grid.cellBounds(50 * 200)[0], 0)
+        rnd = random.Random(8)
+        for _ in range(200):
+            lat, lon = rnd.uniform(-90, 90), rnd.uniform(-180, 180)
+            south, west, north, east = grid.cellBounds(grid.cellIndex(lat, lon))
+            self.assertTrue(south - 1e-9 <= lat <= north + 1e-9)
+            self.assertTrue(west <= lon <= east)
+        self.assertNotEqual(grid, LatLonGrid(100, 200))
+        self.assertEqual(grid, EqualAreaGrid(100, 200))
+
+
+class DensityGridTestCase(unittest.TestCase):
+    def setUp(self):
+        rnd = random.Random(9)
+        self.lats = [rnd.uniform(-60, 60) for _ in range(3000)]
+        self.lons = [rnd.uniform(-180, 180) for _ in range(3000)]
+        self.weights = [rnd.uniform(0, 2) for _ in range(3000)]
+
+    def test_add(self):
+        grid = LatLonGrid(18, 36, south=-45)
+        density = DensityGrid(grid)
+        binned = density.add(self.lats, self.lons, self.weights)
+        inside = [k for k, lat in enumerate(self.lats) if lat >= -45]
+        self.assertEqual(binned, len(inside))
+        self.assertEqual(density.outside, 3000 - len(inside))
+        self.assertEqual(sum(density.counts), binned)
+        self.assertAlmostEqual(sum(density.weights), sum(self.weights[k] for k in inside))
+        k = inside[0]
+        index = grid.cellIndex(self.lats[k], self.lons[k])
+        cell = [m for m in inside if grid.cellIndex(self.lats[m], self.lons[m]) == index]
+        self.assertEqual(density.counts[index], len(cell))
+        self.assertAlmostEqual(density.weights[index], sum(self.weights[m] for m in cell))
+        self.assertAlmostEqual(density.densities()[index], len(cell) / grid.cellArea(index))
+        with self.assertRaises(ValueError):
+            density.add([1], [2], [1, 2])
+
+    def test_merge(self):
+        grid = EqualAreaGrid(20, 40)
+        expected = DensityGrid(grid)
+        expected.add(self.lats, self.lons, self.weights)
+        merged = DensityGrid(grid)
+        for start in range(0, 3000, 700):
+            partial = DensityGrid(EqualAreaGrid(20, 40))
+            partial.add(self.lats[start:start+700], self.lons[start:start+700], self.weights[start:start+700])
+            merged.merge(partial)
+        self.assertEqual(merged.counts, expected.counts)
+        for a, b in zip(merged.weights, expected.weights):
+            self.assertAlmostEqual(a, b)
+        with self.assertRaises(ValueError):
+            merged.merge(DensityGrid(LatLonGrid(20, 40)))
+        with self.assertRaises(TypeError):
+            DensityGrid(None)
+
+    def test_unweighted(self):
+        density = DensityGrid(LatLonGrid(1, 1))
+        density.add(self.lats, self.lons)
+        self.assertEqual(list(density.counts), [3000])
+        self.assertEqual(list(density.weights), [3000])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+import random
+import unittest
+from geodesy.latlon_spherical import LatLon
+from geodesy.join import distanceJoin
+
+
+def brute_force(lats1, lons1, lats2, lons2, distance, radius=None):
+    points2 = [LatLon(lat, lon) for lat, lon in zip(lats2, lons2)]
+    pairs = {}
+    for i, (lat, lon) in enumerate(zip(lats1, lons1)):
+        p = LatLon(lat, lon)
+        for j, q in enumerate(points2):
+            d = p.distanceTo(q, radius)
+            if d <= distance:
+                pairs[(i, j)] = d
+    return pairs
+
+
+def join(*args, **kwargs):
+    pairs = {}
+    for i, j, d in distanceJoin(*args, **kwargs):
+        for k in range(len(i)):
+            pairs[(i[k], j[k])] = d[k]
+    return pairs
+
+
+class DistanceJoinTestCase(unittest.TestCase):
+    def assertJoinEqual(self, pairs, expected):
+        self.assertEqual(set(pairs), set(expected))
+        for key, d in expected.items():
+            self.assertAlmostEqual(pairs[key], d, places=6)
+
+    def test_random(self):
+        rnd = random.Random(5)
+        lats1 = [rnd.uniform(-90, 90) for _ in range(300)]
+        lons1 = [rnd.uniform(-180, 180) for _ in range(300)]
+        lats2 = [rnd.uniform(-90, 90) for _ in range(300)]
+        lons2 = [rnd.uniform(-180, 180) for _ in range(300)]
+        for distance in (0, 300, 1500, 7000, 25000):
+            expected = brute_force(lats1, lons1, lats2, lons2, distance)
+            self.assertJoinEqual(join(lats1, lons1, lats2, lons2, distance), expected)
+
+    def test_antimeridian_and_poles(self):
+        rnd = random.Random(6)
+        # clusters around the anti-meridian and the poles
+        lats1 = [rnd.uniform(-5, 5) for _ in range(100)] + [rnd.uniform(85, 90) for _ in range(100)]
+        lons1 = [rnd.choice((-1, 1)) * rnd.uniform(175, 180) for _ in range(100)] + \
+            [rnd.uniform(-180, 180) for _ in range(100)]
+        lats2 = [rnd.uniform(-5, 5) for _ in range(100)] + [rnd.uniform(85, 90) for _ in range(100)] + [90, -90]
+        lons2 = [rnd.choice((-1, 1)) * rnd.uniform(175, 180) for _ in range(100)] + \
+            [rnd.uniform(-180, 180) for _ in range(100)] + [0, 180]
+        for distance in (50, 200, 600):
+            expected = brute_force(lats1, lons1, lats2, lons2, distance)
+            self.assertTrue(any(lons1[i] * lons2[j] < 0 for i, j in expected))
+            self.assertJoinEqual(join(lats1, lons1, lats2, lons2, distance), expected)
+
+    def test_chunks(self):
+        rnd = random.Random(7)
+        lats = [rnd.uniform(45, 46) for _ in range(200)]
+        lons = [rnd.uniform(5, 6) for _ in range(200)]
+        chunks = list(distanceJoin(lats, lons, lats, lons, 20, chunk_size=100))
+        self.assertTrue(len(chunks) > 1)
+        self.assertTrue(all(len(i) == len(j) == len(d) <= 100 for i, j, d in chunks))
+        indices = [i for chunk in chunks for i in chunk[0]]
+        self.assertEqual(indices, sorted(indices))
+        self.assertJoinEqual(join(lats, lons, lats, lons, 20, chunk_size=100),
+                             brute_force(lats, lons, lats, lons, 20))
+
+    def test_radius(self):
+        lats = [52.205, 48.857]
+        lons = [0.119, 2.351]
+        pairs = join(lats, lons, lats, lons, 252, radius=3959)
+        self.assertAlmostEqual(pairs[(0, 1)], 251.2, places=1)
+        self.assertEqual(len(pairs), 4)
+        self.assertEqual(len(join(lats, lons, lats, lons, 250, radius=3959)), 2)
+
+    def test_errors(self):
+        self.assertEqual(list(distanceJoin([], [], [1], [2], 10)), [])
+        with self.assertRaises(ValueError):
+            distanceJoin([1], [2], [1], [2], -1)
+        with self.assertRaises(ValueError):
+            distanceJoin([1], [2, 3], [1], [2], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+import random
+import unittest
+from array import array
+from geodesy.latlon_spherical import LatLon
+from geodesy.latlon_array import LatLonArray
+from geodesy import latlon_batch
+
+
+class LatLonArrayTestCase(unittest.TestCase):
+    def setUp(self):
+        rnd = random.Random(3)
+        self.lats = [rnd.uniform(-89, 89) for _ in range(500)]
+        self.lons = [rnd.uniform(-180, 180) for _ in range(500)]
+        self.points = LatLonArray(self.lats, self.lons)
+
+    def test_sequence(self):
+        points = self.points
+        self.assertEqual(len(points), 500)
+        self.assertEqual(points[3], (self.lats[3], self.lons[3]))
+        self.assertEqual(points[-1], (self.lats[-1], self.lons[-1]))
+        self.assertEqual(list(points), list(zip(self.lats, self.lons)))
+        self.assertEqual(list(points[10:20]), list(zip(self.lats[10:20], self.lons[10:20])))
+        self.assertEqual(list(points[::-7]), list(zip(self.lats[::-7], self.lons[::-7])))
+        self.assertEqual(list(points.lats), self.lats)
+        self.assertEqual(list(points.lons), self.lons)
+        with self.assertRaises(IndexError):
+            points[500]
+
+        points.append(1.5, 2.5)
+        self.assertEqual(points[500], (1.5, 2.5))
+        self.assertEqual(points.latLon(500).lat, 1.5)
+        with self.assertRaises(ValueError):
+            points.extend([1, 2], [3])
+
+    def test_buffer(self):
+        points = self.points[:50]
+        view = points.memoryview()
+        self.assertEqual(view.nbytes, 50 * 16)
+        self.assertEqual(LatLonArray.fromBuffer(points.tobytes()), points)
+        self.assertEqual(LatLonArray.fromBuffer(view), points)
+        with self.assertRaises(ValueError):
+            LatLonArray.fromBuffer(array('d', [1, 2, 3]).tobytes())
+
+        # lats / lons views are usable by the batch functions, and write through
+        distances = latlon_batch.distances(points.lats[:-1], points.lons[:-1], points.lats[1:], points.lons[1:])
+        self.assertAlmostEqual(sum(distances), points.pathLength(), places=6)
+        points.lats[0] = 10.0
+        self.assertEqual(points[0][0], 10.0)
+
+        points32 = LatLonArray(self.lats, self.lons, typecode='f')
+        self.assertEqual(points32.memoryview().nbytes, 500 * 8)
+        self.assertAlmostEqual(points32[7][0], self.lats[7], places=4)
+
+    def test_views_lock_size(self):
+        points = self.points[:10]
+        lats = points.lats
+        with self.assertRaises(BufferError):
+            points.append(5, 6)
+        with self.assertRaises(BufferError):
+            points.extend([5], [6])
+        lats.release()
+        points.append(5, 6)
+        with points.memoryview() as view:
+            self.assertEqual(view[-1], 6)
+        points.append(7, 8)
+        self.assertEqual(len(points), 12)
+
+    def test_fromLatLons(self):
+        latlons = [LatLon(lat, lon) for lat, lon in zip(self.lats, self.lons)]
+        self.assertEqual(LatLonArray.fromLatLons(latlons), self.points)
+        self.assertEqual(self.points.toLatLons()[5].lon, self.lons[5])
+        with self.assertRaises(TypeError):
+            LatLonArray.fromLatLons([(1, 2)])
+
+    def test_pathLength(self):
+        latlons = self.points.toLatLons()
+        expected = sum(latlons[i].distanceTo(latlons[i+1]) for i in range(len(latlons) - 1))
+        self.assertAlmostEqual(self.points.pathLength(), expected, places=6)
+        self.assertAlmostEqual(self.points.pathLength(3959) / expected, 3959 / 6371.009)
+        self.assertEqual(LatLonArray([1], [2]).pathLength(), 0.0)
+
+    def test_nearest(self):
+        latlons = self.points.toLatLons()
+        rnd = random.Random(4)
+        for _ in range(50):
+            target = LatLon(rnd.uniform(-90, 90), rnd.uniform(-180, 180))
+            distances = [target.distanceTo(p) for p in latlons]
+            index, distance = self.points.nearest(target.lat, target.lon)
+            self.assertAlmostEqual(distance, min(distances), places=6)
+            self.assertEqual(distances[index], min(distances))
+        self.assertEqual(self.points.nearest(self.lats[9], self.lons[9]), (9, 0.0))
+        self.assertIsNone(LatLonArray().nearest(0, 0))
+
+    def test_bounds(self):
+        self.assertEqual(self.points.bounds(), (min(self.lats), min(self.lons), max(self.lats), max(self.lons)))
+        self.assertIsNone(LatLonArray().bounds())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,240 @@
+import io
+import random
+import unittest
+from array import array
+from geodesy.latlon_spherical import LatLon
+from geodesy import latlon_batch
+
+
+def random_points(n, seed=1):
+    rnd = random.Random(seed)
+    lats = array('d', (rnd.uniform(-90, 90) for _ in range(n)))
+    lons = array('d', (rnd.uniform(-180, 180) for _ in range(n)))
+    return lats, lons
+
+
+class LatLonBatchTestCase(unittest.TestCase):
+    def setUp(self):
+        self.lats1, self.lons1 = random_points(2000, 1)
+        self.lats2, self.lons2 = random_points(2000, 2)
+        self.points1 = latlon_batch.toLatLons(self.lats1, self.lons1)
+        self.points2 = latlon_batch.toLatLons(self.lats2, self.lons2)
+
+    def test_distances_match_latlon(self):
+        d = latlon_batch.distances(self.lats1, self.lons1, self.lats2, self.lons2)
+        expected = [p1.distanceTo(p2) for p1, p2 in zip(self.points1, self.points2)]
+        self.assertEqual(list(d), expected)
+
+    def test_bearings_match_latlon(self):
+        b = latlon_batch.bearings(self.lats1, self.lons1, self.lats2, self.lons2)
+        expected = [p1.bearingTo(p2) for p1, p2 in zip(self.points1, self.points2)]
+        self.assertEqual(list(b), expected)
+
+    def test_final_bearings_match_latlon(self):
+        b = latlon_batch.finalBearings(self.lats1, self.lons1, self.lats2, self.lons2)
+        expected = [p1.finalBearingTo(p2) for p1, p2 in zip(self.points1, self.points2)]
+        self.assertEqual(list(b), expected)
+
+    def test_inverse_matches_latlon(self):
+        inv = latlon_batch.inverse(self.lats1, self.lons1, self.lats2, self.lons2, midpoint=True)
+        for i, (p1, p2) in enumerate(zip(self.points1, self.points2)):
+            self.assertEqual(inv["distance"][i], p1.distanceTo(p2))
+            self.assertEqual(inv["initialBearing"][i], p1.bearingTo(p2))
+            self.assertEqual(inv["finalBearing"][i], p1.finalBearingTo(p2))
+            mid = p1.midpointTo(p2)
+            self.assertEqual(inv["midpointLat"][i], mid.lat)
+            self.assertEqual(inv["midpointLon"][i], mid.lon)
+
+    def test_range_rings_match_destination_point(self):
+        centres = [LatLon(51.4778, -0.0015), LatLon(-89.5, 179.9), LatLon(0, 0)]
+        lats, lons = latlon_batch.fromLatLons(centres)
+        ring_lats, ring_lons, offsets = latlon_batch.rangeRings(lats, lons, [5, 100, 2000], vertices=36)
+        self.assertEqual(list(offsets), list(range(0, 9*36+1, 36)))
+        for i, centre in enumerate(centres):
+            for j, distance in enumerate([5, 100, 2000]):
+                start = offsets[i*3 + j]
+                for v in range(36):
+                    p = centre.destinationPoint(distance, v * 10)
+                    self.assertAlmostEqual(ring_lats[start+v], p.lat, places=9)
+                    lon_error = abs(ring_lons[start+v] - p.lon)
+                    self.assertAlmostEqual(min(lon_error, 360 - lon_error), 0, places=9)
+
+    def test_range_rings_adaptive(self):
+        ring_lats, ring_lons, offsets = latlon_batch.rangeRings([45], [5], [1, 10, 100], max_error=0.001)
+        counts = [offsets[k+1] - offsets[k] for k in range(3)]
+        self.assertEqual(counts, [latlon_batch.ringVertexCount(d, 0.001) for d in [1, 10, 100]])
+        self.assertTrue(counts[0] < counts[1] < counts[2])
+        # chord midpoints stay within max_error of the circle
+        centre = LatLon(45, 5)
+        for v in range(counts[2]):
+            p1 = LatLon(ring_lats[offsets[2]+v], ring_lons[offsets[2]+v])
+            w = offsets[2] + (v+1) % counts[2]
+            p2 = LatLon(ring_lats[w], ring_lons[w])
+            self.assertLess(100 - centre.distanceTo(p1.midpointTo(p2)), 0.001)
+
+    def test_propagate_matches_destination_point(self):
+        rnd = random.Random(3)
+        speeds = array('d', (rnd.uniform(0, 900) for _ in range(2000)))
+        headings = array('d', (rnd.uniform(0, 360) for _ in range(2000)))
+        lats, lons = array('d', self.lats1), array('d', self.lons1)
+        final_headings = array('d', bytes(8 * 2000))
+        latlon_batch.propagate(lats, lons, speeds, headings, 0.5, final_headings=final_headings)
+        for i, p in enumerate(self.points1):
+            q = p.destinationPoint(speeds[i] * 0.5, headings[i])
+            self.assertEqual((lats[i], lons[i]), (q.lat, q.lon))
+            final_error = abs(final_headings[i] - p.finalBearingTo(q))
+            self.assertAlmostEqual(min(final_error, 360 - final_error), 0, places=6)
+
+    def test_propagate_rhumb_matches_rhumb_destination_point(self):
+        lats, lons = array('d', self.lats1), array('d', self.lons1)
+        final_headings = [0.0] * 2000
+        latlon_batch.propagate(lats, lons, 1000, 116.7, 0.25, mode='rhumb', radius=6371,
+                               final_headings=final_headings)
+        for i, p in enumerate(self.points1):
+            q = p.rhumbDestinationPoint(250, 116.7, radius=6371)
+            self.assertEqual((lats[i], lons[i]), (q.lat, q.lon))
+        self.assertEqual(set(final_headings), {116.7})
+        # east-west rhumb line along a parallel
+        lats, lons = array('d', [45.0]), array('d', [179.0])
+        latlon_batch.propagate(lats, lons, [100], [90], 1, mode='rhumb')
+        self.assertEqual(lats[0], 45.0)
+        self.assertAlmostEqual(lons[0], LatLon(45, 179).rhumbDestinationPoint(100, 90).lon)
+        self.assertLess(lons[0], -179)
+        # from the south pole, where the rhumb line longitude is undefined
+        lats, lons = array('d', [-90.0]), array('d', [10.0])
+        latlon_batch.propagate(lats, lons, 100, 0, 1, mode='rhumb')
+        self.assertAlmostEqual(lats[0], -90 + 100 / 6371.009 * 180 / 3.141592653589793)
+        self.assertEqual(lons[0], 10.0)
+
+    def test_propagate_in_place_steps(self):
+        # headings updated in place follow the great circle, as a single longer step
+        lats, lons = array('f', [51.4778]), array('f', [-0.0015])
+        headings = array('d', [300.7])
+        step_lats, step_lons = array('d', [51.4778]), array('d', [-0.0015])
+        for _ in range(100):
+            latlon_batch.propagate(step_lats, step_lons, 77.94, headings, 1, final_headings=headings)
+        p = LatLon(51.4778, -0.0015).destinationPoint(7794, 300.7)
+        self.assertAlmostEqual(step_lats[0], p.lat, places=9)
+        self.assertAlmostEqual(step_lons[0], p.lon, places=9)
+        # float32 storage, and strided memoryviews
+        latlon_batch.propagate(lats, lons, 7794, 300.7, 1)
+        self.assertAlmostEqual(lats[0], p.lat, places=4)
+        view = memoryview(array('d', [51.4778, -0.0015, 0, 0]))
+        latlon_batch.propagate(view[0::2], view[1::2], 7794, 300.7, 1)
+        self.assertEqual((view[0], view[1]), (p.lat, p.lon))
+        with self.assertRaises(ValueError):
+            latlon_batch.propagate(lats, lons, [1, 2], 0, 1)
+        with self.assertRaises(ValueError):
+            latlon_batch.propagate(lats, lons, 1, 0, 1, mode='loxodrome')
+
+    def test_ring_vertex_count(self):
+        self.assertEqual(latlon_batch.ringVertexCount(0.001, 1), latlon_batch.MIN_RING_VERTICES)
+        self.assertEqual(latlon_batch.ringVertexCount(1000, 1e-9), latlon_batch.MAX_RING_VERTICES)
+        with self.assertRaises(ValueError):
+            latlon_batch.ringVertexCount(10, 0)
+
+    def test_route_crossings_parallel(self):
+        c = latlon_batch.routeCrossings([0, 60], [0, 30], parallels=[30])
+        expected = LatLon.crossingParallels(LatLon(0, 0), LatLon(60, 30), 30)
+        self.assertEqual(len(c["lat"]), 1)
+        self.assertEqual(c["lat"][0], 30)
+        self.assertAlmostEqual(c["lon"][0], expected["lon1"], places=9)
+        self.assertEqual(c["segment"][0], 0)
+        self.assertEqual(c["kind"][0], 0)
+
+    def test_route_crossings_antimeridian(self):
+        c = latlon_batch.routeCrossings([10, 10], [170, -170], meridians=[180, 0, -175])
+        self.assertEqual(list(c["line"]), [0, 2])
+        self.assertEqual(list(c["lon"]), [180, -175])
+        self.assertEqual(list(c["kind"]), [1, 1])
+
+    def test_route_crossings_along_route(self):
+        rnd = random.Random(4)
+        route = [LatLon(40, -5)]
+        for _ in range(50):
+            route.append(route[-1].destinationPoint(rnd.uniform(10, 300), rnd.uniform(0, 360)))
+        lats, lons = latlon_batch.fromLatLons(route)
+        parallels = [38 + 0.5 * k for k in range(10)]
+        meridians = [-8 + 0.5 * k for k in range(10)]
+        c = latlon_batch.routeCrossings(lats, lons, parallels, meridians)
+        self.assertGreater(len(c["lat"]), 0)
+
+        positions = [c["segment"][i] + c["fraction"][i] for i in range(len(c["lat"]))]
+        self.assertEqual(positions, sorted(positions))
+        for i in range(len(c["lat"])):
+            k = c["segment"][i]
+            p = LatLon(c["lat"][i], c["lon"][i])
+            # crossing is on the segment, at the given fraction
+            d = route[k].distanceTo(route[k+1])
+            self.assertAlmostEqual(route[k].distanceTo(p), c["fraction"][i] * d, places=6)
+            self.assertAlmostEqual(p.distanceTo(route[k+1]), (1 - c["fraction"][i]) * d, places=6)
+            if c["kind"][i] == 0:
+                self.assertEqual(c["lat"][i], parallels[c["line"][i]])
+            else:
+                self.assertEqual(c["lon"][i], meridians[c["line"][i]])
+
+        # every change of latitude band is reported
+        for k in range(len(route) - 1):
+            for lat in parallels:
+                if (route[k].lat - lat) * (route[k+1].lat - lat) < 0:
+                    self.assertTrue(any(c["segment"][i] == k and c["kind"][i] == 0 and c["lat"][i] == lat
+                                        for i in range(len(c["lat"]))))
+
+    def test_from_latlons(self):
+        lats, lons = latlon_batch.fromLatLons([LatLon(52.205, 0.119), LatLon(48.857, 2.351)])
+        self.assertEqual(list(lats), [52.205, 48.857])
+        self.assertEqual(list(lons), [0.119, 2.351])
+
+    def test_length_mismatch(self):
+        with self.assertRaises(ValueError):
+            latlon_batch.distances([0, 1], [0, 1], [0], [0])
+
+    def test_float32_distance_error_bound(self):
+        lats1 = latlon_batch.toArray(self.lats1, latlon_batch.FLOAT32)
+        lons1 = latlon_batch.toArray(self.lons1, latlon_batch.FLOAT32)
+        lats2 = latlon_batch.toArray(self.lats2, latlon_batch.FLOAT32)
+        lons2 = latlon_batch.toArray(self.lons2, latlon_batch.FLOAT32)
+        d = latlon_batch.distances(lats1, lons1, lats2, lons2)
+        max_error = max(abs(d[i] - p1.distanceTo(p2))
+                        for i, (p1, p2) in enumerate(zip(self.points1, self.points2)))
+        self.assertLess(max_error, 1.9e-3)     # < 1.9 m
+
+        # float32 results add less than 1 m
+        d32 = latlon_batch.distances(lats1, lons1, lats2, lons2, typecode=latlon_batch.FLOAT32)
+        max_error = max(abs(d32[i] - p1.distanceTo(p2))
+                        for i, (p1, p2) in enumerate(zip(self.points1, self.points2)))
+        self.assertLess(max_error, 2.9e-3)
+
+    def test_float32_bearing_error_bound(self):
+        lats1 = latlon_batch.toArray(self.lats1, latlon_batch.FLOAT32)
+        lons1 = latlon_batch.toArray(self.lons1, latlon_batch.FLOAT32)
+        # destinations between 10 km and 100 km away
+        rnd = random.Random(3)
+        points2 = [p.destinationPoint(rnd.uniform(10, 100), rnd.uniform(0, 360)) for p in self.points1]
+        lats2, lons2 = latlon_batch.fromLatLons(points2, latlon_batch.FLOAT32)
+        b = latlon_batch.bearings(lats1, lons1, lats2, lons2)
+        max_error = 0
+        for i, (p1, p2) in enumerate(zip(self.points1, points2)):
+            error = abs(b[i] - p1.bearingTo(p2))
+            max_error = max(max_error, min(error, 360 - error))
+        self.assertLess(max_error, 0.011)
+
+    def test_dump_load(self):
+        for typecode in (latlon_batch.FLOAT64, latlon_batch.FLOAT32):
+            lats = latlon_batch.toArray(self.lats1, typecode)
+            lons = latlon_batch.toArray(self.lons1, typecode)
+            f = io.BytesIO()
+            latlon_batch.dump(f, lats, lons)
+            self.assertEqual(len(f.getvalue()), 16 + 2 * len(lats) * lats.itemsize)
+            f.seek(0)
+            lats_read, lons_read = latlon_batch.load(f)
+            self.assertEqual(lats_read, lats)
+            self.assertEqual(lons_read, lons)
+
+    def test_load_bad_magic(self):
+        with self.assertRaises(ValueError):
+            latlon_batch.load(io.BytesIO(b'XXXX' + bytes(12)))
+
+
+if __name__ == '__main__':
+    unittest.main()
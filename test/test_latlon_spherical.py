@@ -31,6 +31,60 @@ class GeodesicsTestCase(unittest.TestCase):
         b = self.cambg.finalBearingTo(self.paris)
         self.assertEqual("{:.1f}".format(b), "157.9")
 
+    def test_inverse(self):
+        inv = self.cambg.inverse(self.paris, midpoint=True)
+        self.assertEqual(inv["distance"], self.cambg.distanceTo(self.paris))
+        self.assertEqual(inv["initialBearing"], self.cambg.bearingTo(self.paris))
+        self.assertEqual(inv["finalBearing"], self.cambg.finalBearingTo(self.paris))
+        self.assertEqual(inv["midpoint"].toString('d'), '50.5363°N, 1.2746°E')
+
+    def test_inverse_miles(self):
+        inv = self.cambg.inverse(self.paris, 3959)
+        self.assertEqual("{:.1f}".format(inv["distance"]), "251.2")
+        self.assertNotIn("midpoint", inv)
+
+    def test_prepared(self):
+        site = self.cambg.prepare()
+        points = [self.paris, self.london, self.dover, self.calais, self.origin, LatLon(-90, 0), LatLon(-52.205, -179.881)]
+        self.assertEqual(site.distanceTo(self.paris), self.cambg.distanceTo(self.paris))
+        self.assertEqual(site.distanceTo(points), [self.cambg.distanceTo(p) for p in points])
+        self.assertEqual(site.bearingTo(iter(points)), [self.cambg.bearingTo(p) for p in points])
+        self.assertEqual(site.crossTrackDistanceTo(points, self.dover),
+                         [p.crossTrackDistanceTo(self.cambg, self.dover) for p in points])
+        p = site.destinationPoint(7794, 300.7)
+        q = self.cambg.destinationPoint(7794, 300.7)
+        self.assertEqual((p.lat, p.lon), (q.lat, q.lon))
+        self.assertEqual([p.lon for p in site.destinationPoint([100, 7794], [10, 300.7])],
+                         [self.cambg.destinationPoint(100, 10).lon, q.lon])
+        # scalar distance or bearing broadcast against the other argument
+        ring = site.destinationPoint(10, range(360))
+        self.assertEqual(len(ring), 360)
+        self.assertEqual((ring[45].lat, ring[45].lon),
+                         (self.cambg.destinationPoint(10, 45).lat, self.cambg.destinationPoint(10, 45).lon))
+        self.assertEqual([p.lat for p in site.destinationPoint([100, 7794], 300.7)],
+                         [self.cambg.destinationPoint(100, 300.7).lat, q.lat])
+        with self.assertRaises(TypeError):
+            site.distanceTo([(48.857, 2.351)])
+        with self.assertRaises(TypeError):
+            LatLon(0, 0).prepare().crossTrackDistanceTo(self.paris, (1, 2))
+
+    def test_prepared_arrays(self):
+        site = self.cambg.prepare(3959)
+        lats = [p.lat for p in (self.paris, self.london, self.origin)]
+        lons = [p.lon for p in (self.paris, self.london, self.origin)]
+        self.assertEqual("{:.1f}".format(site.distances(lats, lons)[0]), "251.2")
+        self.assertEqual(list(site.bearings(lats, lons)), [self.cambg.bearingTo(LatLon(*c)) for c in zip(lats, lons)])
+        self.assertEqual(list(site.crossTrackDistances(lats, lons, self.dover)),
+                         [LatLon(*c).crossTrackDistanceTo(self.cambg, self.dover, 3959) for c in zip(lats, lons)])
+        dest_lats, dest_lons = site.destinationPoints([100, 200], [90, 180])
+        p = self.cambg.destinationPoint(200, 180, 3959)
+        self.assertEqual((dest_lats[1], dest_lons[1]), (p.lat, p.lon))
+        dest_lats, dest_lons = site.destinationPoints(200, [0, 90, 180])
+        self.assertEqual((len(dest_lats), dest_lats[2], dest_lons[2]), (3, p.lat, p.lon))
+        dest_lats, dest_lons = site.destinationPoints([100, 200], 180)
+        self.assertEqual((dest_lats[1], dest_lons[1]), (p.lat, p.lon))
+        self.assertEqual(len(site.destinationPoints(200, 180)[0]), 1)
+
     def test_midpoint_to(self):
         p = self.cambg.midpointTo(self.paris)
         self.assertEqual(p.toString('d'), '50.5363°N, 1.2746°E')
@@ -90,11 +144,11 @@ class GeodesicsTestCase(unittest.TestCase):
         distance = 40.31    # In kilometres
         bearing = 116.7     # In degrees
         p = self.dover.rhumbDestinationPoint(distance, bearing)
-        self.assertEqual(p.toString('d'), '50.9641°N, 1.8540°E')
+        self.assertEqual(p.toString('d'), '50.9641°N, 1.8531°E')
         
     def test_rhumb_midpoint_to(self):
         p = self.dover.rhumbMidpointTo(self.calais)
-        self.assertEqual(p.toString('d'), '51.0455°N, 1.5955°E')
+        self.assertEqual(p.toString('d'), '51.0455°N, 1.5957°E')
 
         
 if __name__ == '__main__':
@@ -0,0 +1,74 @@
+import random
+import unittest
+from math import radians, degrees, log, tan, atan2, pi
+from geodesy.latlon_spherical import LatLon
+from geodesy.mercator import project, unproject, toPixels, fromPixels, MercatorTable, MAX_LATITUDE, \
+    WEB_MERCATOR_RADIUS
+
+
+class MercatorTestCase(unittest.TestCase):
+    def setUp(self):
+        rnd = random.Random(10)
+        self.lats = [rnd.uniform(-MAX_LATITUDE, MAX_LATITUDE) for _ in range(2000)]
+        self.lons = [rnd.uniform(-180, 180) for _ in range(2000)]
+
+    def test_project(self):
+        xs, ys = project([48.857, 0, 90, -90], [2.351, 180, 0, 0])
+        self.assertAlmostEqual(xs[0], 261712.12, places=2)
+        self.assertAlmostEqual(ys[0], WEB_MERCATOR_RADIUS * log(tan(pi/4 + radians(48.857)/2)), places=6)
+        self.assertAlmostEqual(xs[1], WEB_MERCATOR_RADIUS * pi)
+        # clamped latitudes: the world is square
+        self.assertAlmostEqual(ys[2], WEB_MERCATOR_RADIUS * pi, places=6)
+        self.assertAlmostEqual(ys[3], -WEB_MERCATOR_RADIUS * pi, places=6)
+
+    def test_unproject(self):
+        lats, lons = unproject(*project(self.lats, self.lons))
+        for lat, lon, lat2, lon2 in zip(self.lats, self.lons, lats, lons):
+            self.assertAlmostEqual(lat, lat2, places=9)
+            self.assertAlmostEqual(lon, lon2, places=9)
+        lats, lons = unproject(*project(self.lats, self.lons, radius=1), radius=1)
+        self.assertAlmostEqual(lats[0], self.lats[0], places=9)
+
+    def test_rhumb_bearing(self):
+        # a rhumb line is a straight line on the Mercator projection
+        p1, p2 = LatLon(51.127, 1.338), LatLon(50.964, 1.853)
+        xs, ys = project([p1.lat, p2.lat], [p1.lon, p2.lon], radius=1)
+        bearing = (degrees(atan2(xs[1] - xs[0], ys[1] - ys[0])) + 360) % 360
+        self.assertAlmostEqual(bearing, p1.rhumbBearingTo(p2), places=9)
+
+    def test_pixels(self):
+        xs, ys = toPixels([48.857, MAX_LATITUDE, -MAX_LATITUDE], [2.351, -180, 180], 10)
+        self.assertEqual((int(xs[0] // 256), int(ys[0] // 256)), (518, 352))
+        self.assertAlmostEqual(xs[1], 0)
+        self.assertAlmostEqual(ys[1], 0, places=6)
+        self.assertAlmostEqual(xs[2], 256 * 1024)
+        self.assertAlmostEqual(ys[2], 256 * 1024, places=6)
+        xs, ys = toPixels(self.lats, self.lons, 15, tile_size=512)
+        lats, lons = fromPixels(xs, ys, 15, tile_size=512)
+        for lat, lon, lat2, lon2 in zip(self.lats, self.lons, lats, lons):
+            self.assertAlmostEqual(lat, lat2, places=9)
+            self.assertAlmostEqual(lon, lon2, places=9)
+        with self.assertRaises(ValueError):
+            toPixels([0], [0], -1)
+
+    def test_table(self):
+        table = MercatorTable(1e-8)
+        self.assertLessEqual(table.max_error, 1e-8)
+        errors = [abs(table.projectedLatitude(lat) - log(tan(pi/4 + radians(lat)/2))) for lat in self.lats]
+        self.assertLessEqual(max(errors), table.max_error)
+        self.assertAlmostEqual(table.projectedLatitude(90), pi, places=7)
+
+        # pixel error at zoom 20: tile_size ⋅ 2^20 / 2π ⋅ max_error
+        exact = toPixels(self.lats, self.lons, 20)
+        interpolated = toPixels(self.lats, self.lons, 20, table=table)
+        bound = 256 * 2**20 / (2*pi) * table.max_error + 1e-6
+        self.assertEqual(exact[0], interpolated[0])
+        self.assertLessEqual(max(abs(a - b) for a, b in zip(exact[1], interpolated[1])), bound)
+        with self.assertRaises(ValueError):
+            MercatorTable(1e-20)
+        with self.assertRaises(TypeError):
+            project([0], [0], table=1e-9)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+import asyncio
+import io
+import unittest
+from math import isnan
+from geodesy import dms
+from geodesy import nmea
+
+GGA = b'$GPGGA,123519,4807.038,N,01131.000,E,1,08,0.9,545.4,M,46.9,M,,*47\r\n'
+
+
+def sentence(body):
+    return b'$' + body + b'*' + '{:02X}'.format(nmea.checksum(body)).encode('ascii') + b'\r\n'
+
+
+RMC = sentence(b'GPRMC,123519,A,4807.038,N,01131.000,W,022.4,084.4,230394,003.1,W')
+
+
+class NMEATestCase(unittest.TestCase):
+    def test_parse_coordinate(self):
+        self.assertAlmostEqual(nmea.parseCoordinate('4807.038', 'N'), 48.1173)
+        self.assertAlmostEqual(nmea.parseCoordinate(b'01131.000', b'W'), -11.516666666666667)
+        self.assertAlmostEqual(nmea.parseCoordinate('4807.038', 'S'), dms.parseDMS("48°07.038'S"))
+
+    def test_parse_coordinate_invalid(self):
+        with self.assertRaises(ValueError):
+            nmea.parseCoordinate('4807.038', 'X')
+
+    def test_gga(self):
+        parser = nmea.NMEAParser()
+        parser.feed(GGA)
+        batch = parser.flush()
+        self.assertEqual(len(batch), 1)
+        self.assertAlmostEqual(batch.lats[0], 48.1173)
+        self.assertAlmostEqual(batch.lons[0], 11.516666666666667)
+        self.assertEqual(batch.times[0], 12*3600 + 35*60 + 19)
+        self.assertTrue(isnan(batch.speeds[0]))
+        self.assertEqual(batch.types, [b'GGA'])
+
+    def test_rmc(self):
+        parser = nmea.NMEAParser()
+        parser.feed(RMC)
+        batch = parser.flush()
+        self.assertAlmostEqual(batch.lons[0], -11.516666666666667)
+        self.assertEqual(batch.speeds[0], 22.4)
+        self.assertEqual(batch.toLatLons()[0].toString('d'), '48.1173°N, 11.5167°W')
+
+    def test_checksum(self):
+        self.assertEqual(nmea.checksum(GGA[1:-5]), 0x47)
+        body = b'GPGSV,3,1,11,03,03,111,00,04,15,270,00,06,01,010,00,13,06,292,00' * 3
+        expected = 0
+        for byte in body:
+            expected ^= byte
+        self.assertEqual(nmea.checksum(body), expected)
+        self.assertEqual(nmea.checksum(body[:128]), nmea.checksum(body[:64]) ^ nmea.checksum(body[64:128]))
+
+    def test_checksum_error(self):
+        parser = nmea.NMEAParser()
+        parser.feed(GGA.replace(b'*47', b'*48') + RMC)
+        self.assertEqual(len(parser.flush()), 1)
+        self.assertEqual(parser.checksum_errors, 1)
+        # hex digits of either case; invalid digits are a checksum error
+        body = b'GPRMC,123519,A,4807.038,N,01131.000,W,,084.4,230394,003.1,W'
+        parser.feed(b'$' + body + b'*' + '{:02x}'.format(nmea.checksum(body)).encode('ascii') + b'\r\n')
+        parser.feed(GGA.replace(b'*47', b'*G7'))
+        batch = parser.flush()
+        self.assertEqual((len(batch), parser.checksum_errors), (1, 2))
+        self.assertTrue(isnan(batch.speeds[0]))
+
+    def test_skipped(self):
+        parser = nmea.NMEAParser()
+        parser.feed(sentence(b'GPGSA,A,3,04,05,,09,12,,,24,,,,,2.5,1.3,2.1'))
+        parser.feed(sentence(b'GPRMC,123519,V,,,,,,,230394,,'))
+        parser.feed(sentence(b'GNGGA,123520,4807.038,N,01131.000,E,0,00,,,M,,M,,'))
+        self.assertEqual(len(parser.flush()), 0)
+        self.assertEqual(parser.skipped, 3)
+
+    def test_chunks(self):
+        data = (GGA + RMC) * 50
+        parser = nmea.NMEAParser()
+        for i in range(0, len(data), 7):
+            parser.feed(data[i:i+7])
+        batch = parser.flush()
+        self.assertEqual(len(batch), 100)
+        self.assertEqual(parser.checksum_errors, 0)
+
+    def test_iter_parse(self):
+        data = io.BytesIO((GGA + RMC) * 100 + GGA.rstrip())
+        batches = list(nmea.iterParse(data, batch_size=50, chunk_size=1000))
+        self.assertEqual(sum(len(batch) for batch in batches), 201)
+        self.assertTrue(all(len(batch) >= 50 for batch in batches[:-1]))
+
+    def test_aiter_parse_socket(self):
+        async def serve(reader, writer):
+            for _ in range(100):
+                writer.write(GGA + RMC)
+                await writer.drain()
+            writer.close()
+
+        async def run():
+            server = await asyncio.start_server(serve, '127.0.0.1', 0)
+            port = server.sockets[0].getsockname()[1]
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            batches = [batch async for batch in nmea.aiterParse(reader, batch_size=64)]
+            writer.close()
+            server.close()
+            await server.wait_closed()
+            return batches
+
+        batches = asyncio.run(run())
+        self.assertEqual(sum(len(batch) for batch in batches), 200)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+import unittest
+from math import radians, sin, pi
+from geodesy.latlon_spherical import LatLon, EARTH_RADIUS
+from geodesy import latlon_batch
+from geodesy import polygon
+
+
+class PolygonTestCase(unittest.TestCase):
+    def test_area_square(self):
+        areas = polygon.polygonAreas([0, 1, 1, 0], [0, 0, 1, 1], [0, 4])
+        self.assertEqual("{:.1f}".format(areas[0]), "12364.0")
+
+    def test_area_polar_cap(self):
+        # spherical cap above 80°N, both orientations, and around the south pole
+        lons = list(range(0, 360, 1))
+        expected = 2 * pi * EARTH_RADIUS**2 * (1 - sin(radians(80)))
+        for lats, cap_lons in (([80] * 360, lons), ([80] * 360, lons[::-1]), ([-80] * 360, lons)):
+            m = polygon.polygonMetrics(lats, cap_lons, [0, 360])
+            self.assertAlmostEqual(m["area"][0] / expected, 1, places=3)
+            self.assertAlmostEqual(abs(m["centroidLat"][0]), 90)
+            self.assertEqual(m["centroidLat"][0] > 0, lats[0] > 0)
+
+    def test_area_and_perimeter_of_range_ring(self):
+        ring_lats, ring_lons, offsets = latlon_batch.rangeRings([45, -30], [179.9, 10], [100], vertices=720)
+        m = polygon.polygonMetrics(ring_lats, ring_lons, offsets)
+        angle = 100 / EARTH_RADIUS
+        expected_area = 2 * pi * EARTH_RADIUS**2 * (1 - (1 - angle**2 / 2 + angle**4 / 24))
+        for k in range(2):
+            self.assertAlmostEqual(m["area"][k] / expected_area, 1, places=4)
+            self.assertAlmostEqual(m["perimeter"][k] / (2 * pi * EARTH_RADIUS * sin(angle)), 1, places=4)
+        self.assertAlmostEqual(m["centroidLat"][0], 45, places=6)
+        self.assertAlmostEqual(m["centroidLon"][0], 179.9, places=6)
+        self.assertAlmostEqual(m["centroidLat"][1], -30, places=6)
+        self.assertAlmostEqual(m["centroidLon"][1], 10, places=6)
+
+    def test_perimeter(self):
+        points = [LatLon(51.5, -0.1), LatLon(48.9, 2.4), LatLon(45.8, 4.8), LatLon(50.8, 4.4)]
+        expected = sum(points[i].distanceTo(points[(i+1) % 4]) for i in range(4))
+        lats, lons = latlon_batch.fromLatLons(points)
+        self.assertAlmostEqual(polygon.polygonPerimeters(lats, lons, [0, 4])[0], expected, places=9)
+
+    def test_orientation_and_closing(self):
+        lats = [-1, -1, 1, 1]
+        lons = [-1, 1, 1, -1]
+        m = polygon.polygonMetrics(lats + lats[::-1] + lats + lats[:1], lons + lons[::-1] + lons + lons[:1],
+                                   [0, 4, 8, 13])
+        for k in range(3):
+            self.assertAlmostEqual(m["area"][k], m["area"][0])
+            self.assertAlmostEqual(m["perimeter"][k], m["perimeter"][0])
+            self.assertAlmostEqual(m["centroidLat"][k], 0)
+            self.assertAlmostEqual(m["centroidLon"][k], 0)
+
+    def test_centroids_ragged_batch(self):
+        lats = [0, 0, 2, 10, 10, 20, 20]
+        lons = [0, 2, 0, 10, 20, 20, 10]
+        c_lats, c_lons = polygon.polygonCentroids(lats, lons, [0, 3, 7])
+        self.assertAlmostEqual(c_lats[0], 2/3, places=2)
+        self.assertAlmostEqual(c_lons[0], 2/3, places=2)
+        self.assertTrue(15 < c_lats[1] < 15.1)     # edges bow towards the pole
+        self.assertAlmostEqual(c_lons[1], 15)
+
+    def test_degenerate(self):
+        m = polygon.polygonMetrics([0, 1], [0, 1], [0, 2, 2])
+        self.assertEqual(list(m["area"]), [0, 0])
+        self.assertNotEqual(m["centroidLat"][0], m["centroidLat"][0])     # nan
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+import io
+import random
+import unittest
+from array import array
+from functools import partial
+from geodesy.latlon_spherical import LatLon
+from geodesy import serialization
+
+
+class SerializationTestCase(unittest.TestCase):
+    def setUp(self):
+        rnd = random.Random(1)
+        self.track = [(rnd.uniform(-90, 90), rnd.uniform(-180, 180)) for _ in range(500)]
+
+    def assertTrackAlmostEqual(self, lats, lons, track, places):
+        self.assertEqual(len(lats), len(track))
+        for lat, lon, (expected_lat, expected_lon) in zip(lats, lons, track):
+            self.assertAlmostEqual(lat, expected_lat, places=places)
+            self.assertAlmostEqual(lon, expected_lon, places=places)
+
+    def test_encode_polyline(self):
+        # Reference example of the Google encoded polyline algorithm
+        encoded = serialization.encodePolyline([(38.5, -120.2), (40.7, -120.95), (43.252, -126.453)])
+        self.assertEqual(encoded, '_p~iF~ps|U_ulLnnqC_mqNvxq`@')
+
+    def test_decode_polyline(self):
+        lats, lons = serialization.decodePolyline('_p~iF~ps|U_ulLnnqC_mqNvxq`@')
+        self.assertEqual(list(lats), [38.5, 40.7, 43.252])
+        self.assertEqual(list(lons), [-120.2, -120.95, -126.453])
+
+    def test_polyline_latlon_precision6(self):
+        points = [LatLon(lat, lon) for lat, lon in self.track]
+        encoded = serialization.encodePolyline(points, 6)
+        lats, lons = serialization.decodePolyline(encoded, 6)
+        self.assertTrackAlmostEqual(lats, lons, self.track, 6)
+
+    def test_polyline_streaming_chunks(self):
+        encoded = serialization.encodePolyline(self.track)
+        chunks = (encoded[i:i+7] for i in range(0, len(encoded), 7))
+        decoded = list(serialization.iterDecodePolyline(chunks))
+        self.assertEqual(decoded, list(serialization.iterDecodePolyline(encoded)))
+        self.assertEqual(len(decoded), len(self.track))
+
+    def test_polyline_truncated(self):
+        with self.assertRaises(ValueError):
+            serialization.decodePolyline('_p~iF~ps|U_ulL')
+
+    def test_varint(self):
+        data = serialization.encodeVarint(self.track)
+        lats, lons = serialization.decodeVarint(data)
+        self.assertTrackAlmostEqual(lats, lons, self.track, 7)
+
+    def test_varint_streaming_file(self):
+        f = io.BytesIO()
+        for chunk in serialization.iterEncodeVarint(self.track, 5, chunk_size=64):
+            f.write(chunk)
+        f.seek(0)
+        decoded = list(serialization.iterDecodeVarint(iter(partial(f.read, 13), b''), 5))
+        lats = [lat for lat, lon in decoded]
+        lons = [lon for lat, lon in decoded]
+        self.assertTrackAlmostEqual(lats, lons, self.track, 5)
+
+    def test_varint_compact(self):
+        # 1 m steps along a track fit in 2 bytes per coordinate at 1e-5° precision
+        track = [(45 + i * 1e-5, 5 - i * 1e-5) for i in range(100)]
+        self.assertLess(len(serialization.encodeVarint(track, 5)), 4 * 100 + 8)
+
+    def test_pack_unpack(self):
+        for typecode in ('d', 'f'):
+            data = serialization.pack(self.track, typecode)
+            self.assertEqual(len(data), len(self.track) * 2 * array(typecode).itemsize)
+            lats, lons = serialization.unpack(data, typecode)
+            self.assertTrackAlmostEqual(lats, lons, self.track, 4)
+
+    def test_pack_streaming_chunks(self):
+        chunks = list(serialization.iterPack(self.track, chunk_size=100))
+        self.assertGreater(len(chunks), 1)
+        data = b''.join(chunks)
+        pieces = (data[i:i+11] for i in range(0, len(data), 11))
+        self.assertEqual(list(serialization.iterUnpack(pieces)), self.track)
+
+    def test_unpack_truncated(self):
+        with self.assertRaises(ValueError):
+            serialization.unpack(bytes(20))
+
+
+if __name__ == '__main__':
+    unittest.main()
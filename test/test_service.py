@@ -0,0 +1,124 @@
+import asyncio
+import json
+import unittest
+from geodesy.latlon_spherical import LatLon
+from geodesy import service
+
+
+class ServiceTestCase(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.server = service.GeodesyServer('127.0.0.1', 0, window=0.01)
+        await self.server.start()
+        self.reader, self.writer = await asyncio.open_connection('127.0.0.1', self.server.port)
+
+    async def asyncTearDown(self):
+        self.writer.close()
+        await self.server.close()
+
+    async def request(self, requests):
+        for request in requests:
+            self.writer.write(json.dumps(request).encode('utf-8') + b'\n')
+        await self.writer.drain()
+        responses = {}
+        for _ in requests:
+            response = json.loads(await self.reader.readline())
+            responses[response["id"]] = response
+        return responses
+
+    async def test_operations(self):
+        cambg = LatLon(52.205, 0.119)
+        paris = LatLon(48.857, 2.351)
+        pair = {"lat1": 52.205, "lon1": 0.119, "lat2": 48.857, "lon2": 2.351}
+        responses = await self.request([
+            dict(pair, id=1, op="distance"),
+            dict(pair, id=2, op="bearing"),
+            dict(pair, id=3, op="finalBearing"),
+            dict(pair, id=4, op="inverse", radius=3959),
+            {"id": 5, "op": "destination", "lat": 52.205, "lon": 0.119, "distance": 10, "bearing": 45},
+        ])
+        self.assertEqual(responses[1]["result"], cambg.distanceTo(paris))
+        self.assertEqual(responses[2]["result"], cambg.bearingTo(paris))
+        self.assertEqual(responses[3]["result"], cambg.finalBearingTo(paris))
+        self.assertEqual(responses[4]["result"]["distance"], cambg.distanceTo(paris, 3959))
+        p = cambg.destinationPoint(10, 45)
+        self.assertEqual(responses[5]["result"], {"lat": p.lat, "lon": p.lon})
+
+    async def test_micro_batching(self):
+        requests = [{"id": k, "op": "distance", "lat1": 0, "lon1": 0, "lat2": k / 100, "lon2": 0}
+                    for k in range(200)]
+        responses = await self.request(requests)
+        for k in range(200):
+            self.assertAlmostEqual(responses[k]["result"], LatLon(0, 0).distanceTo(LatLon(k / 100, 0)))
+        metrics = (await self.request([{"id": "m", "op": "metrics"}]))["m"]["result"]
+        self.assertEqual(metrics["requests"], 200)
+        self.assertLess(metrics["batches"], 200)
+        self.assertGreater(metrics["maxBatchSize"], 1)
+        self.assertGreaterEqual(metrics["latencyMax"], metrics["latencyP50"])
+
+    async def test_errors(self):
+        responses = await self.request([
+            {"id": 1, "op": "unknown"},
+            {"id": 2, "op": "distance", "lat1": 0},
+            {"id": 3, "op": "distance", "lat1": 0, "lon1": 0, "lat2": 1, "lon2": 0},
+        ])
+        self.assertIn("error", responses[1])
+        self.assertIn("error", responses[2])
+        self.assertAlmostEqual(responses[3]["result"], LatLon(0, 0).distanceTo(LatLon(1, 0)))
+        self.writer.write(b'not json\n')
+        response = json.loads(await self.reader.readline())
+        self.assertIsNone(response["id"])
+        self.assertIn("error", response)
+
+    async def test_destination_batch(self):
+        requests = [{"id": k, "op": "destination", "lat": k - 50, "lon": 3.6 * k - 180, "distance": 100 * k,
+                     "bearing": 7 * k, "radius": 3959} for k in range(100)]
+        responses = await self.request(requests)
+        for k in range(100):
+            p = LatLon(k - 50, 3.6 * k - 180).destinationPoint(100 * k, 7 * k, 3959)
+            self.assertEqual(responses[k]["result"], {"lat": p.lat, "lon": p.lon})
+
+    async def test_bad_requests(self):
+        pair = {"lat1": 0, "lon1": 0, "lat2": 1, "lon2": 0}
+        responses = await self.request([
+            dict(pair, id=1, op="distance", radius=[1]),
+            {"id": 2, "op": "destination", "lat": 0, "lon": 0, "distance": 10, "bearing": 0, "radius": 0},
+            dict(pair, id=3, op="inverse", radius="nan"),
+            {"id": 4, "op": "destination", "lat": 0, "lon": 0, "distance": [10], "bearing": None},
+            {"id": 5, "op": ["distance"]},
+            {"id": 6, "op": {"distance": 1}},
+        ])
+        for k in range(1, 7):
+            self.assertIn("error", responses[k])
+        # the batcher, and the connection, survive bad requests
+        responses = await self.request([dict(pair, id=7, op="distance")])
+        self.assertAlmostEqual(responses[7]["result"], LatLon(0, 0).distanceTo(LatLon(1, 0)))
+
+    async def test_long_lines(self):
+        pair = {"lat1": 0, "lon1": 0, "lat2": 1, "lon2": 0}
+        for size in (70000, 1000000):
+            request = dict(pair, id=size, op="distance", padding="x" * size)
+            self.writer.write(json.dumps(request).encode('utf-8') + b'\n')
+        for _ in range(2):
+            response = json.loads(await self.reader.readline())
+            self.assertIsNone(response["id"])
+            self.assertIn("error", response)
+        # the connection is still served
+        responses = await self.request([dict(pair, id=1, op="distance")])
+        self.assertAlmostEqual(responses[1]["result"], LatLon(0, 0).distanceTo(LatLon(1, 0)))
+
+    async def test_backpressure(self):
+        batcher = service.MicroBatcher(window=0, max_batch=10, max_pending=5)
+        request = {"op": "bearing", "lat1": 0, "lon1": 0, "lat2": 1, "lon2": 1}
+        futures = [await batcher.enqueue(request) for _ in range(5)]
+        # queue is full and not consumed: next submission waits
+        with self.assertRaises(asyncio.TimeoutError):
+            await asyncio.wait_for(batcher.enqueue(request), 0.05)
+        batcher.start()
+        results = await asyncio.gather(*futures)
+        self.assertEqual(results, [LatLon(0, 0).bearingTo(LatLon(1, 1))] * 5)
+        self.assertEqual(await batcher.submit(request), results[0])
+        await batcher.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
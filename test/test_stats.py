@@ -0,0 +1,84 @@
+import random
+import unittest
+from geodesy.latlon_spherical import LatLon
+from geodesy.stats import PositionStats
+
+
+class PositionStatsTestCase(unittest.TestCase):
+    def setUp(self):
+        rnd = random.Random(1)
+        self.track = [LatLon(45, 5)]
+        for _ in range(200):
+            self.track.append(self.track[-1].destinationPoint(rnd.uniform(0, 5), rnd.uniform(0, 360)))
+
+    def assertStatsEqual(self, stats, points):
+        self.assertEqual(stats.count, len(points))
+        distance = sum(points[i].distanceTo(points[i+1]) for i in range(len(points) - 1))
+        self.assertAlmostEqual(stats.distance, distance, places=6)
+        self.assertEqual(stats.bounds(), (min(p.lat for p in points), min(p.lon for p in points),
+                                          max(p.lat for p in points), max(p.lon for p in points)))
+        expected = PositionStats()
+        for p in points:
+            expected.add(p.lat, p.lon)
+        self.assertAlmostEqual(stats.mean().lat, expected.mean().lat, places=9)
+        self.assertAlmostEqual(stats.mean().lon, expected.mean().lon, places=9)
+        self.assertAlmostEqual(stats.dispersion(), expected.dispersion(), places=9)
+
+    def test_statistics(self):
+        stats = PositionStats()
+        for p in self.track:
+            stats.add(p.lat, p.lon)
+        self.assertStatsEqual(stats, self.track)
+        mean = stats.mean()
+        rms = (sum(mean.distanceTo(p)**2 for p in self.track) / len(self.track)) ** 0.5
+        self.assertAlmostEqual(stats.dispersion() / rms, 1, places=3)
+
+    def test_mean_two_points(self):
+        stats = PositionStats()
+        stats.extend([52.205, 48.857], [0.119, 2.351])
+        mid = LatLon(52.205, 0.119).midpointTo(LatLon(48.857, 2.351))
+        self.assertAlmostEqual(stats.mean().lat, mid.lat)
+        self.assertAlmostEqual(stats.mean().lon, mid.lon)
+
+    def test_empty(self):
+        stats = PositionStats()
+        self.assertIsNone(stats.mean())
+        self.assertIsNone(stats.bounds())
+        self.assertEqual(stats.distance, 0)
+
+    def test_single_point_dispersion(self):
+        stats = PositionStats()
+        stats.add(10, 10)
+        self.assertEqual(stats.dispersion(), 0)
+
+    def test_tight_cluster_dispersion(self):
+        # two points 1 m apart: 0.5 m from their mean
+        p = LatLon(45, 5)
+        q = p.destinationPoint(0.001, 30)
+        stats = PositionStats()
+        stats.extend([p.lat, q.lat], [p.lon, q.lon])
+        self.assertAlmostEqual(stats.dispersion(), 0.0005, places=9)
+
+    def test_merge(self):
+        parts = [PositionStats() for _ in range(3)]
+        for k, p in enumerate(self.track):
+            parts[k * 3 // len(self.track)].add(p.lat, p.lon)
+        total = PositionStats()
+        for part in parts:
+            total.merge(part)
+        total.merge(PositionStats())
+        self.assertStatsEqual(total, self.track)
+
+    def test_sliding_window(self):
+        stats = PositionStats(window=20)
+        for k, p in enumerate(self.track):
+            stats.add(p.lat, p.lon)
+            self.assertStatsEqual(stats, self.track[max(0, k - 19):k + 1])
+
+    def test_merge_window(self):
+        with self.assertRaises(ValueError):
+            PositionStats(window=5).merge(PositionStats())
+
+
+if __name__ == '__main__':
+    unittest.main()
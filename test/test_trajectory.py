@@ -0,0 +1,107 @@
+import random
+import unittest
+from math import inf
+from geodesy.latlon_spherical import LatLon
+from geodesy import trajectory
+
+
+def random_track(rnd, n, lat, lon):
+    lats = []
+    lons = []
+    for _ in range(n):
+        lat += rnd.uniform(-0.05, 0.05)
+        lon += rnd.uniform(-0.05, 0.05)
+        lats.append(lat)
+        lons.append(lon)
+    return lats, lons
+
+
+def brute_force_hausdorff(track1, track2):
+    points1 = [LatLon(lat, lon) for lat, lon in zip(*track1)]
+    points2 = [LatLon(lat, lon) for lat, lon in zip(*track2)]
+    h12 = max(min(p1.distanceTo(p2) for p2 in points2) for p1 in points1)
+    h21 = max(min(p2.distanceTo(p1) for p1 in points1) for p2 in points2)
+    return max(h12, h21)
+
+
+def brute_force_frechet(track1, track2):
+    points1 = [LatLon(lat, lon) for lat, lon in zip(*track1)]
+    points2 = [LatLon(lat, lon) for lat, lon in zip(*track2)]
+    ca = [[0] * len(points2) for _ in points1]
+    for i, p1 in enumerate(points1):
+        for j, p2 in enumerate(points2):
+            d = p1.distanceTo(p2)
+            if i == 0 and j == 0:
+                ca[i][j] = d
+            elif i == 0:
+                ca[i][j] = max(ca[i][j-1], d)
+            elif j == 0:
+                ca[i][j] = max(ca[i-1][j], d)
+            else:
+                ca[i][j] = max(min(ca[i-1][j], ca[i-1][j-1], ca[i][j-1]), d)
+    return ca[-1][-1]
+
+
+class TrajectoryTestCase(unittest.TestCase):
+    def setUp(self):
+        rnd = random.Random(1)
+        self.tracks = [random_track(rnd, rnd.randint(1, 30), 45, 179.9) for _ in range(10)]
+
+    def test_hausdorff(self):
+        for track1 in self.tracks:
+            for track2 in self.tracks:
+                d = trajectory.hausdorffDistance(track1[0], track1[1], track2[0], track2[1])
+                self.assertAlmostEqual(d, brute_force_hausdorff(track1, track2), places=9)
+
+    def test_frechet(self):
+        for track1 in self.tracks:
+            for track2 in self.tracks:
+                d = trajectory.frechetDistance(track1[0], track1[1], track2[0], track2[1])
+                self.assertAlmostEqual(d, brute_force_frechet(track1, track2), places=9)
+
+    def test_frechet_not_less_than_hausdorff(self):
+        # Fréchet distance takes the order of points into account
+        lats = [0, 0, 0]
+        lons = [0, 1, 2]
+        self.assertAlmostEqual(trajectory.hausdorffDistance(lats, lons, lats, lons[::-1]), 0)
+        d = trajectory.frechetDistance(lats, lons, lats, lons[::-1])
+        self.assertAlmostEqual(d, LatLon(0, 0).distanceTo(LatLon(0, 2)))
+
+    def test_threshold(self):
+        track1, track2 = self.tracks[0], self.tracks[1]
+        d = trajectory.hausdorffDistance(track1[0], track1[1], track2[0], track2[1])
+        self.assertEqual(trajectory.hausdorffDistance(track1[0], track1[1], track2[0], track2[1],
+                                                      threshold=d * 0.99), inf)
+        self.assertAlmostEqual(trajectory.hausdorffDistance(track1[0], track1[1], track2[0], track2[1],
+                                                            threshold=d * 1.01), d)
+        d = trajectory.frechetDistance(track1[0], track1[1], track2[0], track2[1])
+        self.assertEqual(trajectory.frechetDistance(track1[0], track1[1], track2[0], track2[1],
+                                                    threshold=d * 0.99), inf)
+        self.assertAlmostEqual(trajectory.frechetDistance(track1[0], track1[1], track2[0], track2[1],
+                                                          threshold=d * 1.01), d)
+
+    def test_compare_tracks(self):
+        query = self.tracks[0]
+        for method, function in (('hausdorff', trajectory.hausdorffDistance),
+                                 ('frechet', trajectory.frechetDistance)):
+            expected = [function(query[0], query[1], lats, lons) for lats, lons in self.tracks]
+            threshold = sorted(expected)[5]
+            d = trajectory.compareTracks(query[0], query[1], self.tracks, method, threshold=threshold)
+            for k in range(len(self.tracks)):
+                if expected[k] <= threshold:
+                    self.assertAlmostEqual(d[k], expected[k])
+                else:
+                    self.assertEqual(d[k], inf)
+
+    def test_compare_tracks_pruned(self):
+        far = ([10, 10.1], [0, 0.1])
+        d = trajectory.compareTracks([0, 0.1], [0, 0.1], [far], threshold=100)
+        self.assertEqual(d[0], inf)
+
+    def test_empty_track(self):
+        with self.assertRaises(ValueError):
+            trajectory.hausdorffDistance([], [], [0], [0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+import unittest
+from geodesy.validation import generateCases, validate, formatReport, CHECKS
+
+
+class ValidationTestCase(unittest.TestCase):
+    def test_generateCases(self):
+        lats1, lons1, lats2, lons2 = generateCases(100, seed=1)
+        self.assertEqual(len(lats1), 100)
+        self.assertEqual(len(lons2), 100)
+        self.assertEqual((lats1[0], lats2[0]), (90, -90))
+        self.assertTrue(all(-90 <= lat <= 90 for lat in lats1 + lats2))
+        self.assertEqual(generateCases(100, seed=1), (lats1, lons1, lats2, lons2))
+        self.assertNotEqual(generateCases(100, seed=2)[0][-1], lats1[-1])
+
+    def test_validate(self):
+        reports = validate(300)
+        self.assertEqual(list(reports), list(CHECKS))
+        # exact fast paths
+        for name in ("latlon_batch.distances", "latlon_batch.bearings", "latlon_batch.inverse", "LatLon.inverse"):
+            self.assertEqual(reports[name]["maxError"], 0, name)
+        # float32 storage bound (see latlon_batch)
+        self.assertLess(reports["latlon_batch.distances(float32)"]["maxError"], 0.0019)
+        # encoders: 1e-5° and 1e-7° quantization
+        self.assertLess(reports["serialization.polyline"]["maxError"], 0.001)
+        self.assertLess(reports["serialization.varint"]["maxError"], 0.00001)
+        # same crossings as crossingParallels, pole and anti-meridian cases included
+        self.assertLess(reports["latlon_batch.routeCrossings"]["maxError"], 1e-6)
+        # interpolated Mercator table at zoom 20 (see MercatorTable)
+        self.assertLess(reports["mercator.toPixels(table)"]["maxError"], 0.05)
+        for name, report in reports.items():
+            if report["unit"] != 'px':
+                self.assertLess(report["maxError"], 0.002, name)
+            self.assertTrue(report["p50Error"] <= report["p99Error"] <= report["maxError"])
+            self.assertGreater(report["fastRate"], 0)
+        self.assertIsNone(reports["serialization.pack(float32)"]["referenceRate"])
+
+        text = formatReport(reports)
+        self.assertEqual(len(text.splitlines()), len(CHECKS) + 1)
+        self.assertIn("join.distanceJoin", text)
+
+    def test_checks(self):
+        reports = validate(100, checks=["latlon_batch.bearings"])
+        self.assertEqual(list(reports), ["latlon_batch.bearings"])
+        self.assertEqual(reports["latlon_batch.bearings"]["count"], 100)
+        with self.assertRaises(ValueError):
+            validate(100, checks=["unknown"])
+
+
+if __name__ == '__main__':
+    unittest.main()
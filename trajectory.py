@@ -0,0 +1,228 @@
+# -*- coding: utf-8 -*-
+
+"""
+Trajectory similarity measures on a spherical earth model: Hausdorff and discrete Fréchet distances,
+with the distance between points given by the haversine formula (as LatLon.distanceTo).
+
+Tracks are given as parallel sequences of latitudes and longitudes in degrees.
+Comparisons are carried out on the haversine term 'a' (monotonic with distance), each point being
+converted to radians and its latitude cosine computed only once per track; only the result is
+converted to a distance.
+
+When a threshold is given, a comparison is abandoned as soon as the result is known to exceed it,
+and float('inf') is returned.
+"""
+
+from array import array
+from math import radians, sin, cos, atan2, sqrt, pi, inf
+
+from geodesy.latlon_spherical import EARTH_RADIUS
+from geodesy.latlon_batch import _check_lengths
+
+
+class _Track(object):
+    # Per point terms of a track, computed once and reused for every comparison
+    def __init__(self, lats, lons):
+        if _check_lengths(lats, lons) == 0:
+            raise ValueError('track is empty')
+        self.lats = [radians(lat) for lat in lats]
+        self.lons = [radians(lon) for lon in lons]
+        self.cos_lats = [cos(lat) for lat in self.lats]
+        self.min_lat = min(self.lats)
+        self.max_lat = max(self.lats)
+
+
+def _haversine(track1, i, track2, j):
+    delta_lat = track2.lats[j] - track1.lats[i]
+    delta_lon = track2.lons[j] - track1.lons[i]
+    return sin(delta_lat/2) * sin(delta_lat/2) + \
+           track1.cos_lats[i] * track2.cos_lats[j] * \
+           sin(delta_lon/2) * sin(delta_lon/2)
+
+
+def _to_distance(a, radius):
+    return radius * 2 * atan2(sqrt(a), sqrt(1-a))
+
+
+def _to_haversine(distance, radius):
+    if distance is None:
+        return inf
+    angular_distance = float(distance) / radius
+    if angular_distance >= pi:
+        return inf
+    return sin(angular_distance/2) ** 2
+
+
+def _lower_bound(track1, track2):
+    # The northernmost (southernmost) point of a track is at least the difference of maximum (minimum)
+    # latitudes away from the other track, so both distances are at least that
+    angle = max(abs(track1.max_lat - track2.max_lat), abs(track1.min_lat - track2.min_lat))
+    return sin(min(angle, pi)/2) ** 2
+
+
+def _directed_hausdorff(track1, track2, a_max, a_threshold):
+    # Early break (Taha & Hanbury): scanning of track2 stops as soon as a point closer than the current
+    # maximum is found. Scanning starts at the previous nearest point, as tracks are sequential.
+    n = len(track2.lats)
+    nearest = 0
+    for i in range(len(track1.lats)):
+        a_min = inf
+        for k in range(n):
+            j = nearest + k
+            if j >= n:
+                j -= n
+            a = _haversine(track1, i, track2, j)
+            if a < a_min:
+                a_min = a
+                nearest_j = j
+                if a < a_max:
+                    break
+        nearest = nearest_j
+        if a_min > a_max:
+            a_max = a_min
+            if a_max > a_threshold:
+                return inf
+    return a_max
+
+
+def _hausdorff(track1, track2, a_threshold):
+    if _lower_bound(track1, track2) > a_threshold:
+        return inf
+    a_max = _directed_hausdorff(track1, track2, 0, a_threshold)
+    if a_max == inf:
+        return inf
+    return _directed_hausdorff(track2, track1, a_max, a_threshold)
+
+
+def _frechet(track1, track2, a_threshold):
+    n = len(track1.lats)
+    m = len(track2.lats)
+    if _lower_bound(track1, track2) > a_threshold or \
+            _haversine(track1, 0, track2, 0) > a_threshold or \
+            _haversine(track1, n-1, track2, m-1) > a_threshold:
+        return inf
+
+    # Coupling distances, one row at a time
+    row = [0.0] * m
+    a = 0.0
+    for j in range(m):
+        a = max(a, _haversine(track1, 0, track2, j))
+        row[j] = a
+    for i in range(1, n):
+        previous_diagonal = row[0]
+        row[0] = max(row[0], _haversine(track1, i, track2, 0))
+        row_min = row[0]
+        for j in range(1, m):
+            previous = row[j]
+            row[j] = max(min(previous, previous_diagonal, row[j-1]), _haversine(track1, i, track2, j))
+            previous_diagonal = previous
+            if row[j] < row_min:
+                row_min = row[j]
+        # every coupling goes through this row
+        if row_min > a_threshold:
+            return inf
+    return row[m-1]
+
+
+def hausdorffDistance(lats1, lons1, lats2, lons2, radius=None, threshold=None):
+    """
+    Return the (symmetric) Hausdorff distance between two tracks: the greatest distance from a point
+    of one track to the nearest point of the other track.
+
+    Arguments:
+        lats1, lons1 -- {sequence} -- Latitudes/longitudes of first track points in degrees.
+        lats2, lons2 -- {sequence} -- Latitudes/longitudes of second track points in degrees.
+        radius -- {int | float} -- (Mean) radius of earth (defaults to EARTH_RADIUS in kilometres).
+        threshold -- {int | float} -- If given, computation is abandoned (and inf returned) as soon as
+                                      the distance is known to exceed it.
+    Return:
+        {float} -- Hausdorff distance, in same units as radius (inf if over threshold).
+
+    Example:
+        > hausdorffDistance([0, 0], [0, 1], [0.1, 0.1], [0, 1])    # 11.1 (kms)
+    """
+
+    if radius is None:
+        radius = EARTH_RADIUS
+    else:
+        radius = float(radius)
+
+    a = _hausdorff(_Track(lats1, lons1), _Track(lats2, lons2), _to_haversine(threshold, radius))
+    return inf if a == inf else _to_distance(a, radius)
+
+
+def frechetDistance(lats1, lons1, lats2, lons2, radius=None, threshold=None):
+    """
+    Return the discrete Fréchet distance between two tracks: the smallest, over all monotonic couplings
+    of the points of both tracks, of the greatest distance between coupled points.
+
+    Arguments:
+        lats1, lons1 -- {sequence} -- Latitudes/longitudes of first track points in degrees.
+        lats2, lons2 -- {sequence} -- Latitudes/longitudes of second track points in degrees.
+        radius -- {int | float} -- (Mean) radius of earth (defaults to EARTH_RADIUS in kilometres).
+        threshold -- {int | float} -- If given, computation is abandoned (and inf returned) as soon as
+                                      the distance is known to exceed it.
+    Return:
+        {float} -- Discrete Fréchet distance, in same units as radius (inf if over threshold).
+
+    Reference:
+        T. Eiter, H. Mannila, Computing discrete Fréchet distance, 1994.
+    """
+
+    if radius is None:
+        radius = EARTH_RADIUS
+    else:
+        radius = float(radius)
+
+    a = _frechet(_Track(lats1, lons1), _Track(lats2, lons2), _to_haversine(threshold, radius))
+    return inf if a == inf else _to_distance(a, radius)
+
+
+def compareTracks(lats, lons, candidates, method='hausdorff', radius=None, threshold=None):
+    """
+    Return the distances from a query track to each of many candidate tracks.
+
+    The query track terms are computed once; candidates whose latitude extents alone put them further
+    than threshold are discarded without any point comparison.
+
+    Arguments:
+        lats, lons -- {sequence} -- Latitudes/longitudes of query track points in degrees.
+        candidates -- {iterable} -- Candidate tracks, as (lats, lons) pairs.
+        method -- {string} -- 'hausdorff' or 'frechet' (default: 'hausdorff').
+        radius -- {int | float} -- (Mean) radius of earth (defaults to EARTH_RADIUS in kilometres).
+        threshold -- {int | float} -- If given, distances over threshold are not computed (inf is returned).
+    Return:
+        {array} -- Distances to each candidate, in same units as radius (inf if over threshold).
+
+    Example:
+        > d = compareTracks(lats, lons, catalog, 'frechet', threshold=0.5)
+        > matches = [k for k in range(len(d)) if d[k] <= 0.5]
+    """
+
+    methods = {
+        'hausdorff': _hausdorff,
+        'frechet': _frechet,
+    }
+    if method not in methods:
+        raise ValueError("method must be 'hausdorff' or 'frechet'")
+    compare = methods[method]
+
+    if radius is None:
+        radius = EARTH_RADIUS
+    else:
+        radius = float(radius)
+
+    a_threshold = _to_haversine(threshold, radius)
+    query = _Track(lats, lons)
+    result = array('d')
+    for candidate_lats, candidate_lons in candidates:
+        # latitude extents are checked before computing the per point terms of the candidate
+        if a_threshold != inf and len(candidate_lats):
+            angle = max(abs(query.max_lat - radians(max(candidate_lats))),
+                        abs(query.min_lat - radians(min(candidate_lats))))
+            if sin(min(angle, pi)/2) ** 2 > a_threshold:
+                result.append(inf)
+                continue
+        a = compare(query, _Track(candidate_lats, candidate_lons), a_threshold)
+        result.append(inf if a == inf else _to_distance(a, radius))
+    return result
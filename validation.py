@@ -0,0 +1,502 @@
+# -*- coding: utf-8 -*-
+
+"""
+Differential validation of the fast paths (batch, float32, cached and streaming variants) against the
+scalar LatLon and dms functions they replace, reporting their errors and throughputs.
+
+Inputs are random pairs of points uniformly distributed on the sphere, preceded by adversarial pairs:
+poles, anti-meridian crossings, coincident and antipodal points, nearly coincident and nearly antipodal
+points, and east-west pairs along a parallel (the rhumb line case where Δψ = 0).
+
+Each check runs the reference (scalar methods, one call per item) and the fast path on the same inputs,
+and reports the distribution of their differences and both throughputs. For lossy encoders and round trips,
+the reference is the input itself: the error is the encoding error, and no reference throughput is reported.
+
+Example:
+    > python -m geodesy.validation -n 20000
+    > reports = validate(5000, checks=['latlon_batch.distances'])
+"""
+
+import random
+import time
+from array import array
+from math import radians, degrees, sin, asin, fabs, inf
+
+from geodesy.latlon_spherical import LatLon, EARTH_RADIUS
+from geodesy import latlon_batch
+from geodesy.latlon_batch import FLOAT64, FLOAT32
+from geodesy import dms
+from geodesy import nmea
+from geodesy import serialization
+from geodesy.latlon_array import LatLonArray
+from geodesy.join import distanceJoin
+from geodesy import mercator
+from geodesy.mercator import MercatorTable, MAX_LATITUDE
+
+
+def generateCases(n=10000, seed=0):
+    """
+    Return pairs of points: adversarial cases followed by random pairs uniformly distributed on the sphere.
+
+    Arguments:
+        n -- {int} -- Total number of pairs (at least the number of adversarial cases).
+        seed -- {int} -- Seed of the random generator.
+    Return:
+        {tuple} -- (lats1, lons1, lats2, lons2) lists, in degrees.
+    """
+
+    rnd = random.Random(seed)
+    cases = [
+        # poles
+        (90, 0, -90, 0), (90, 0, 90, 120), (-90, 45, -90, -45), (90, 0, 45, 10), (-90, 0, -45, -170),
+        (89.9999999, 0, 89.9999999, 180), (-89.9999999, 90, -89.9999999, -90), (90, 0, 0, 0),
+        # anti-meridian
+        (0, 179.9, 0, -179.9), (10, 180, -10, -180), (45, 179.99, 45.01, -179.99), (-30, -179.5, -31, 179.5),
+        (60, 180, 60, -180), (0, -180, 0, 180),
+        # coincident
+        (0, 0, 0, 0), (52.205, 0.119, 52.205, 0.119), (90, 0, 90, 0), (-33.9, 151.2, -33.9, 151.2),
+        # antipodal
+        (0, 0, 0, 180), (45, 10, -45, -170), (-60, 120, 60, -60), (0, 90, 0, -90),
+        # nearly coincident and nearly antipodal
+        (45, 5, 45 + 1e-9, 5 + 1e-9), (0, 0, 1e-12, 0), (45, 10, -45 + 1e-7, -170), (0, 0, 1e-7, 180),
+        # east-west along a parallel (rhumb line with Δψ = 0)
+        (0, 0, 0, 90), (45, -10, 45, 10), (-60, 170, -60, -170), (80, 0, 80, 179), (30, 0, 30, 1e-9),
+    ]
+    lats1, lons1, lats2, lons2 = (list(column) for column in zip(*cases))
+    while len(lats1) < n:
+        lats1.append(degrees(asin(rnd.uniform(-1, 1))))
+        lons1.append(rnd.uniform(-180, 180))
+        lats2.append(degrees(asin(rnd.uniform(-1, 1))))
+        lons2.append(rnd.uniform(-180, 180))
+    return lats1, lons1, lats2, lons2
+
+
+def _angle_error(a, b):
+    # difference of two angles in degrees, in [0, 180]
+    return fabs((a - b + 180) % 360 - 180)
+
+
+def _point_error(lat1, lon1, lat2, lon2):
+    # distance between two points, in kilometres
+    return LatLon(lat1, lon1).distanceTo(LatLon(lat2, lon2))
+
+
+def _points(cases):
+    lats1, lons1, lats2, lons2 = cases
+    return [LatLon(lat, lon) for lat, lon in zip(lats1, lons1)], [LatLon(lat, lon) for lat, lon in zip(lats2, lons2)]
+
+
+# Each check takes the cases and returns (unit, reference, fast, error): reference and fast are callables
+# without argument returning results as sequences of same length (reference may also be the expected results
+# themselves, or None for lossy encoders, the error being computed against the input points), and
+# error(reference_result, fast_result) the error of an item.
+# Items where the reference is undefined (None) are not compared.
+
+def _distances(cases, typecode=FLOAT64):
+    points1, points2 = _points(cases)
+    return ('km',
+            lambda: [p.distanceTo(q) for p, q in zip(points1, points2)],
+            lambda: latlon_batch.distances(*cases, typecode=typecode),
+            lambda a, b: fabs(a - b))
+
+
+def _distances_float32(cases):
+    # coordinates stored as float32 too
+    stored = [latlon_batch.toArray(column, FLOAT32) for column in cases]
+    unit, reference, _, error = _distances(cases)
+    return unit, reference, lambda: latlon_batch.distances(*stored, typecode=FLOAT32), error
+
+
+def _bearings(cases):
+    points1, points2 = _points(cases)
+    return ('deg',
+            lambda: [p.bearingTo(q) for p, q in zip(points1, points2)],
+            lambda: latlon_batch.bearings(*cases),
+            _angle_error)
+
+
+def _final_bearings(cases):
+    points1, points2 = _points(cases)
+    return ('deg',
+            lambda: [p.finalBearingTo(q) for p, q in zip(points1, points2)],
+            lambda: latlon_batch.finalBearings(*cases),
+            _angle_error)
+
+
+def _inverse_error(a, b):
+    # distance error, and bearing errors as displacements at the distance, in kilometres
+    distance, initial, final, lat, lon = a
+    return max(fabs(distance - b[0]),
+               radians(_angle_error(initial, b[1])) * distance,
+               radians(_angle_error(final, b[2])) * distance,
+               _point_error(lat, lon, b[3], b[4]))
+
+
+def _inverse_reference(points1, points2):
+    result = []
+    for p, q in zip(points1, points2):
+        m = p.midpointTo(q)
+        result.append((p.distanceTo(q), p.bearingTo(q), p.finalBearingTo(q), m.lat, m.lon))
+    return result
+
+
+def _batch_inverse(cases):
+    points1, points2 = _points(cases)
+
+    def fast():
+        inv = latlon_batch.inverse(*cases, midpoint=True)
+        return list(zip(inv["distance"], inv["initialBearing"], inv["finalBearing"],
+                        inv["midpointLat"], inv["midpointLon"]))
+
+    return 'km', lambda: _inverse_reference(points1, points2), fast, _inverse_error
+
+
+def _latlon_inverse(cases):
+    points1, points2 = _points(cases)
+
+    def fast():
+        result = []
+        for p, q in zip(points1, points2):
+            inv = p.inverse(q, midpoint=True)
+            result.append((inv["distance"], inv["initialBearing"], inv["finalBearing"],
+                           inv["midpoint"].lat, inv["midpoint"].lon))
+        return result
+
+    return 'km', lambda: _inverse_reference(points1, points2), fast, _inverse_error
+
+
+def _prepared(cases):
+    # distances and bearings from a few origins (poles, anti-meridian, ordinary points) to all second points
+    origins = [LatLon(90, 0), LatLon(-90, 0), LatLon(0, 180), LatLon(45, -179.999), LatLon(52.205, 0.119)]
+    points2 = _points(cases)[1]
+    lats2, lons2 = cases[2], cases[3]
+
+    def reference():
+        return [(o.distanceTo(p), o.bearingTo(p)) for o in origins for p in points2]
+
+    def fast():
+        result = []
+        for origin in origins:
+            site = origin.prepare()
+            result.extend(zip(site.distances(lats2, lons2), site.bearings(lats2, lons2)))
+        return result
+
+    # distance error, and bearing error as displacement at the distance
+    return 'km', reference, fast, lambda a, b: max(fabs(a[0] - b[0]), radians(_angle_error(a[1], b[1])) * a[0])
+
+
+def _range_rings(cases):
+    # 36 vertices at 10°, 100 km and 5000 km around the first points
+    centres = _points(cases)[0][:1000]
+    lats = [p.lat for p in centres]
+    lons = [p.lon for p in centres]
+
+    def fast():
+        ring_lats, ring_lons, _ = latlon_batch.rangeRings(lats, lons, [100, 5000], vertices=36)
+        return list(zip(ring_lats, ring_lons))
+
+    def reference():
+        return [(d.lat, d.lon) for p in centres for distance in (100, 5000)
+                for d in (p.destinationPoint(distance, 10 * k) for k in range(36))]
+
+    return 'km', reference, fast, lambda a, b: _point_error(a[0], a[1], b[0], b[1])
+
+
+def _propagate(mode):
+    def check(cases):
+        # travel the distance between the points of each pair, on the initial bearing from first to second
+        points1, points2 = _points(cases)
+        distances = list(latlon_batch.distances(*cases))
+        headings = list(latlon_batch.bearings(*cases))
+        lats = array('d', cases[0])
+        lons = array('d', cases[1])
+        if mode == 'rhumb':
+            destination = LatLon.rhumbDestinationPoint
+        else:
+            destination = LatLon.destinationPoint
+
+        def reference():
+            result = []
+            for p, d, h in zip(points1, distances, headings):
+                try:
+                    q = destination(p, d, h)
+                    result.append((q.lat, q.lon))
+                except (ValueError, ZeroDivisionError):
+                    # rhumb lines from or to a pole
+                    result.append(None)
+            return result
+
+        def fast():
+            lats[:] = array('d', cases[0])
+            lons[:] = array('d', cases[1])
+            latlon_batch.propagate(lats, lons, distances, headings, 1, mode)
+            return zip(lats, lons)
+
+        return 'km', reference, fast, lambda a, b: _point_error(a[0], a[1], b[0], b[1])
+    return check
+
+
+def _route_crossings(cases):
+    # crossings of each pair's segment with parallels through the pole, anti-meridian and random cases,
+    # per (segment, parallel): routeCrossings on a route through all the pairs (odd segments, joining
+    # the pairs, being ignored), against the crossingParallels longitudes lying within the segment
+    parallels = [-89.9999, -80.5, -30.5, -0.5, 5.0, 45.005, 55.5, 85.25, 89.9999]
+    points1, points2 = _points(cases)
+    route_lats = [lat for pair in zip(cases[0], cases[2]) for lat in pair]
+    route_lons = [lon for pair in zip(cases[1], cases[3]) for lon in pair]
+
+    def reference():
+        result = []
+        for p, q in zip(points1, points2):
+            length = p.distanceTo(q)
+            if sin(length / EARTH_RADIUS) < 1e-12:
+                # coincident or antipodal points: no unique great circle
+                result.extend([None] * len(parallels))
+                continue
+            for lat in parallels:
+                crossing = LatLon.crossingParallels(p, q, lat)
+                lons = []
+                if crossing is not None:
+                    for lon in {crossing["lon1"], crossing["lon2"]}:
+                        x = LatLon(lat, lon)
+                        if p.distanceTo(x) + x.distanceTo(q) - length <= 1e-6:
+                            lons.append(lon)
+                result.append((lat, lons))
+        return result
+
+    def fast():
+        crossings = latlon_batch.routeCrossings(route_lats, route_lons, parallels)
+        result = [[] for _ in range(len(points1) * len(parallels))]
+        for segment, line, lon in zip(crossings["segment"], crossings["line"], crossings["lon"]):
+            if segment % 2 == 0:
+                result[segment // 2 * len(parallels) + line].append(lon)
+        return result
+
+    def error(a, b):
+        # missing or extra crossing: infinite error
+        lat, lons = a
+        if len(lons) != len(b):
+            return inf
+        return max((min(_point_error(lat, x, lat, y) for x in lons) for y in b), default=0.0)
+
+    return 'km', reference, fast, error
+
+
+def _mercator_table(cases):
+    # pixel coordinates at zoom 20 interpolated from a MercatorTable, against the exact projection
+    table = MercatorTable()
+    lats = cases[0] + cases[2]
+    lons = cases[1] + cases[3]
+    return ('px',
+            lambda: zip(*mercator.toPixels(lats, lons, 20)),
+            lambda: zip(*mercator.toPixels(lats, lons, 20, table=table)),
+            lambda a, b: max(fabs(a[0] - b[0]), fabs(a[1] - b[1])))
+
+
+def _mercator_unproject(cases):
+    # projection round trip, within ±MAX_LATITUDE
+    lats = [max(-MAX_LATITUDE, min(MAX_LATITUDE, lat)) for lat in cases[0]]
+    lons = cases[1]
+
+    def fast():
+        return zip(*mercator.unproject(*mercator.project(lats, lons)))
+
+    return 'km', list(zip(lats, lons)), fast, lambda a, b: _point_error(a[0], a[1], b[0], b[1])
+
+
+def _encoding(encode, decode):
+    def check(cases):
+        pairs = list(zip(cases[0], cases[1]))
+
+        def fast():
+            lats, lons = decode(encode(pairs))
+            return list(zip(lats, lons))
+
+        return 'km', None, fast, lambda a, b: _point_error(a[0], a[1], b[0], b[1])
+    return check
+
+
+def _nmea_coordinates(cases):
+    # NMEA degrees and minutes text of the coordinates, parsed as DMS strings, and as GGA sentences
+    fields = []
+    for lat, lon in zip(cases[0], cases[1]):
+        lat_degrees, lat_minutes = divmod(round(abs(lat) * 600000), 600000)
+        lon_degrees, lon_minutes = divmod(round(abs(((lon + 180) % 360) - 180) * 600000), 600000)
+        fields.append(('%02d%07.4f' % (lat_degrees, lat_minutes / 10000), 'S' if lat < 0 else 'N',
+                       '%03d%07.4f' % (lon_degrees, lon_minutes / 10000), 'W' if lon < 0 else 'E'))
+    stream = []
+    for lat, lat_hemisphere, lon, lon_hemisphere in fields:
+        body = 'GPGGA,120000.00,%s,%s,%s,%s,1,08,0.9,100.0,M,46.9,M,,' % (lat, lat_hemisphere, lon, lon_hemisphere)
+        stream.append('$%s*%02X\r\n' % (body, nmea.checksum(body.encode('ascii'))))
+    stream = ''.join(stream).encode('ascii')
+
+    def reference():
+        return [(dms.parseDMS('%s %s %s' % (lat[:-7], lat[-7:], lat_hemisphere)),
+                 dms.parseDMS('%s %s %s' % (lon[:-7], lon[-7:], lon_hemisphere)))
+                for lat, lat_hemisphere, lon, lon_hemisphere in fields]
+
+    def fast():
+        parser = nmea.NMEAParser()
+        parser.feed(stream)
+        batch = parser.flush()
+        return list(zip(batch.lats, batch.lons))
+
+    return 'deg', reference, fast, lambda a, b: max(fabs(a[0] - b[0]), fabs(a[1] - b[1]))
+
+
+def _path_length(cases):
+    points = _points(cases)[0]
+    collection = LatLonArray(cases[0], cases[1])
+    return ('km',
+            lambda: [sum(points[i].distanceTo(points[i+1]) for i in range(len(points) - 1))],
+            lambda: [collection.pathLength()],
+            lambda a, b: fabs(a - b))
+
+
+def _nearest(cases):
+    points = _points(cases)[0]
+    queries = _points(cases)[1][:20]
+    collection = LatLonArray(cases[0], cases[1])
+    return ('km',
+            lambda: [min(q.distanceTo(p) for p in points) for q in queries],
+            lambda: [collection.nearest(q.lat, q.lon)[1] for q in queries],
+            lambda a, b: fabs(a - b))
+
+
+def _distance_join(cases):
+    # pairs within 1000 km between the first 500 points of each set; a missing pair is an infinite error
+    points1, points2 = (points[:500] for points in _points(cases))
+    lats1, lons1, lats2, lons2 = (column[:500] for column in cases)
+    distance = 1000
+
+    def reference():
+        return sorted((i, j, p.distanceTo(q)) for i, p in enumerate(points1) for j, q in enumerate(points2)
+                      if p.distanceTo(q) <= distance)
+
+    def fast():
+        return sorted(pair for i, j, d in distanceJoin(lats1, lons1, lats2, lons2, distance) for pair in zip(i, j, d))
+
+    def error(a, b):
+        return fabs(a[2] - b[2]) if a[:2] == b[:2] else inf
+
+    return 'km', reference, fast, error
+
+
+CHECKS = {
+    "latlon_batch.distances": _distances,
+    "latlon_batch.distances(float32)": _distances_float32,
+    "latlon_batch.bearings": _bearings,
+    "latlon_batch.finalBearings": _final_bearings,
+    "latlon_batch.inverse": _batch_inverse,
+    "LatLon.inverse": _latlon_inverse,
+    "PreparedLatLon": _prepared,
+    "latlon_batch.rangeRings": _range_rings,
+    "latlon_batch.propagate": _propagate('greatcircle'),
+    "latlon_batch.propagate(rhumb)": _propagate('rhumb'),
+    "latlon_batch.routeCrossings": _route_crossings,
+    "serialization.polyline": _encoding(serialization.encodePolyline, serialization.decodePolyline),
+    "serialization.varint": _encoding(serialization.encodeVarint, serialization.decodeVarint),
+    "serialization.pack(float32)": _encoding(lambda points: serialization.pack(points, FLOAT32),
+                                             lambda data: serialization.unpack(data, FLOAT32)),
+    "nmea.NMEAParser": _nmea_coordinates,
+    "latlon_array.pathLength": _path_length,
+    "latlon_array.nearest": _nearest,
+    "join.distanceJoin": _distance_join,
+    "mercator.toPixels(table)": _mercator_table,
+    "mercator.unproject": _mercator_unproject,
+}
+
+
+def _timed(function):
+    start = time.perf_counter()
+    result = function()
+    return list(result), time.perf_counter() - start
+
+
+def _percentile(values, fraction):
+    return values[int(fraction * (len(values) - 1))] if values else 0.0
+
+
+def validate(n=10000, seed=0, checks=None):
+    """
+    Run the checks of the fast paths against their references.
+
+    Arguments:
+        n -- {int} -- Number of pairs of points of the cases (see generateCases).
+        seed -- {int} -- Seed of the random generator.
+        checks -- {list} -- Names of the checks to run (default: all, see CHECKS).
+    Return:
+        {dictionary} -- Report of each check: unit, count, maxError, p50Error, p99Error, p999Error,
+                        fastRate and referenceRate (results per second, referenceRate being None for
+                        encoders), speedup.
+    """
+
+    if checks is None:
+        checks = list(CHECKS)
+    for name in checks:
+        if name not in CHECKS:
+            raise ValueError('unknown check {!r}'.format(name))
+
+    cases = generateCases(n, seed)
+    reports = {}
+    for name in checks:
+        unit, reference, fast, error = CHECKS[name](cases)
+        fast_result, fast_time = _timed(fast)
+        if reference is None:
+            reference_result, reference_time = list(zip(cases[0], cases[1])), None
+        elif not callable(reference):
+            reference_result, reference_time = list(reference), None
+        else:
+            reference_result, reference_time = _timed(reference)
+        if len(reference_result) != len(fast_result):
+            errors = [inf]
+        else:
+            errors = sorted(error(a, b) for a, b in zip(reference_result, fast_result) if a is not None)
+        count = len(fast_result)
+        fast_rate = count / fast_time if fast_time > 0 else inf
+        reference_rate = None
+        if reference_time is not None:
+            reference_rate = count / reference_time if reference_time > 0 else inf
+        reports[name] = {
+            "unit": unit,
+            "count": count,
+            "maxError": errors[-1] if errors else 0.0,
+            "p50Error": _percentile(errors, 0.5),
+            "p99Error": _percentile(errors, 0.99),
+            "p999Error": _percentile(errors, 0.999),
+            "fastRate": fast_rate,
+            "referenceRate": reference_rate,
+            "speedup": fast_rate / reference_rate if reference_rate else None,
+        }
+    return reports
+
+
+def formatReport(reports):
+    """
+    Format validation reports as a text table.
+    """
+
+    lines = ['%-34s %-4s %10s %10s %10s %12s %12s %8s' %
+             ('check', 'unit', 'max', 'p99', 'p50', 'fast/s', 'reference/s', 'speedup')]
+    for name, report in reports.items():
+        lines.append('%-34s %-4s %10.3g %10.3g %10.3g %12.0f %12s %8s' % (
+            name, report["unit"], report["maxError"], report["p99Error"], report["p50Error"], report["fastRate"],
+            '-' if report["referenceRate"] is None else '%.0f' % report["referenceRate"],
+            '-' if report["speedup"] is None else '%.2f' % report["speedup"]))
+    return '\n'.join(lines)
+
+
+if __name__ == '__main__':
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(description='Accuracy and speed of the geodesy fast paths')
+    parser.add_argument('-n', type=int, default=10000, help='number of pairs of points')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--check', action='append', choices=list(CHECKS), help='check to run (default: all)')
+    parser.add_argument('--max-error', type=float, help='exit with status 1 if an error exceeds this value (in the unit of each check)')
+    args = parser.parse_args()
+    reports = validate(args.n, args.seed, args.check)
+    print(formatReport(reports))
+    if args.max_error is not None and any(r["maxError"] > args.max_error for r in reports.values()):
+        sys.exit(1)